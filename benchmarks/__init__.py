@@ -0,0 +1,9 @@
+"""
+Benchmarks for the taxonomy / job pipeline.
+
+    synthetic.py   climate_jobs_v6-shaped corpus generator (10k / 100k / 1M rows)
+    run.py         micro and macro benchmarks, JSON results, baseline comparison
+
+Run from the repository root:
+    python3 -m benchmarks.run --sizes 10000,100000
+"""
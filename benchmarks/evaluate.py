@@ -0,0 +1,306 @@
+"""
+Gold-set evaluation: tagging quality and speed per matcher configuration.
+
+`climate_jobs_gold_set_v4.csv` holds hand-checked rows (`confidence_score`,
+`needs_review`, `skills_keywords`, `work_areas`). A row is used when its
+`needs_review` is false and its confidence is at least `--min-confidence`,
+and its url joins a job in climate_jobs_v6.json. That job's declared
+categories are the labels: sector, area, and innovation imperative (the
+leaf level job_category_paths extends them to). The text tagged is the job
+title, requirements, and the gold row's skills and work areas.
+
+Each configuration predicts taxonomy leaves from that text, and leaves roll
+up to areas and sectors:
+
+    substring   `keyword in text` for every keyword (the JS includes loop)
+    automaton   KeywordMatcher, word-boundary Aho-Corasick
+    fuzzy       FuzzyLookup.correct, then the automaton
+    bm25        BM25 over leaf documents (name, keywords, description); top leaves
+
+The report gives micro precision / recall / F1 per level, per-label scores
+for every sector, area and leaf, throughput, and p50 / p99 latency per job. With
+--baseline, an F1 drop beyond --quality-tolerance or a throughput drop beyond
+--tolerance fails the run, the same way benchmarks.run gates speed.
+
+Usage:
+    python3 -m benchmarks.evaluate
+    python3 -m benchmarks.evaluate --configs automaton,bm25 --save-baseline eval_baseline.json
+    python3 -m benchmarks.evaluate --baseline eval_baseline.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from benchmarks.run import environment
+from category_index import job_category_paths
+from metrics import Histogram
+from taxonomy import Imperative, load_taxonomy
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOLD_PATH = os.path.join(BASE_DIR, 'climate_jobs_gold_set_v4.csv')
+JOBS_PATH = os.path.join(BASE_DIR, 'climate_jobs_v6.json')
+
+EVAL_FORMAT = 1
+LEVELS = ('sector', 'area', 'leaf')
+DEFAULT_MIN_CONFIDENCE = 0.8
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_QUALITY_TOLERANCE = 0.02
+BM25_TOP_K = 3
+# BM25 keeps leaves scoring at least this fraction of the best leaf.
+BM25_MIN_RELATIVE = 0.5
+
+
+# ============================================================================
+# Gold set
+# ============================================================================
+
+def _truthy(value):
+    return str(value).strip().lower() in ('true', '1', 'yes')
+
+
+def load_gold(taxonomy, gold_path=GOLD_PATH, jobs_path=JOBS_PATH, min_confidence=DEFAULT_MIN_CONFIDENCE):
+    """([(text, {level: set of paths})], skipped counts)."""
+    from job_ingest import iter_jobs
+
+    jobs = {job.get('url'): job for job in iter_jobs(jobs_path) if job.get('url')}
+    examples, skipped = [], {'needs_review': 0, 'low_confidence': 0, 'unjoined': 0, 'unlabelled': 0}
+    with open(gold_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if _truthy(row.get('needs_review')):
+                skipped['needs_review'] += 1
+                continue
+            try:
+                confidence = float(row.get('confidence_score') or 0)
+            except ValueError:
+                confidence = 0.0
+            if confidence < min_confidence:
+                skipped['low_confidence'] += 1
+                continue
+            job = jobs.get(row.get('url'))
+            if job is None:
+                skipped['unjoined'] += 1
+                continue
+            labels = node_levels(taxonomy.node(path) for path in job_category_paths(taxonomy, job))
+            if not labels['sector']:
+                skipped['unlabelled'] += 1
+                continue
+            text = ' '.join(part for part in (
+                row.get('title') or job.get('title'), job.get('requirements_and_qualifications'),
+                row.get('skills_keywords'), row.get('work_areas'),
+            ) if part)
+            examples.append((text, labels))
+    return examples, skipped
+
+
+def node_levels(nodes):
+    """{level: set of paths} for nodes and their ancestors; only imperatives count at the leaf level."""
+    levels = {level: set() for level in LEVELS}
+    for node in nodes:
+        if node is None:
+            continue
+        levels['sector'].add(node.sector.path)
+        area = node.opportunity_area
+        if area is not None:
+            levels['area'].add(area.path)
+        if isinstance(node, Imperative):
+            levels['leaf'].add(node.path)
+    return levels
+
+
+# ============================================================================
+# Matcher configurations
+# ============================================================================
+
+def substring_tagger(taxonomy):
+    keywords = [(keyword.lower(), leaves) for keyword, leaves in taxonomy.keyword_index.items()]
+
+    def tag(text):
+        lowered = text.lower()
+        found = {}
+        for keyword, leaves in keywords:
+            if keyword in lowered:
+                for leaf in leaves:
+                    found[leaf.id] = leaf
+        return found.values()
+    return tag
+
+
+def automaton_tagger(taxonomy):
+    from keyword_matcher import KeywordMatcher
+    return KeywordMatcher(taxonomy).matched_nodes
+
+
+def fuzzy_tagger(taxonomy):
+    from fuzzy_lookup import FuzzyLookup
+    from keyword_matcher import KeywordMatcher
+    fuzzy = FuzzyLookup.from_sources(taxonomy)
+    matcher = KeywordMatcher(taxonomy)
+
+    def tag(text):
+        corrected, corrections = fuzzy.correct(text)
+        return matcher.matched_nodes(corrected if corrections else text)
+    return tag
+
+
+def bm25_tagger(taxonomy, k=BM25_TOP_K, min_relative=BM25_MIN_RELATIVE):
+    from bm25_search import BM25Index
+    leaves = list(taxonomy.leaves)
+    weights = {'name': (3.0, 0.5), 'keywords': (2.0, 0.75), 'description': (0.5, 0.75)}
+    index = BM25Index(weights)
+    index.build({'name': leaf.name, 'keywords': ' '.join(leaf.keywords), 'description': leaf.description}
+                for leaf in leaves)
+
+    def tag(text):
+        top = index.search(text, k)
+        if not top:
+            return []
+        floor = top[0][1] * min_relative
+        return [leaves[leaf_id] for leaf_id, score in top if score >= floor]
+    return tag
+
+
+CONFIGS = {
+    'substring': substring_tagger,
+    'automaton': automaton_tagger,
+    'fuzzy': fuzzy_tagger,
+    'bm25': bm25_tagger,
+}
+
+
+# ============================================================================
+# Scoring
+# ============================================================================
+
+def _prf(tp, fp, fn):
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {'precision': round(precision, 4), 'recall': round(recall, 4), 'f1': round(f1, 4),
+            'tp': tp, 'fp': fp, 'fn': fn}
+
+
+def score(predictions, examples, per_label_levels=LEVELS):
+    """Micro P/R/F1 per level, plus per-label scores for `per_label_levels`."""
+    report = {}
+    for level in LEVELS:
+        totals = [0, 0, 0]
+        labels = {}
+        for predicted, (_, gold) in zip(predictions, examples):
+            predicted, expected = predicted[level], gold[level]
+            for path in predicted | expected:
+                counts = labels.setdefault(path, [0, 0, 0])
+                index = 0 if path in predicted and path in expected else 1 if path in predicted else 2
+                counts[index] += 1
+                totals[index] += 1
+        report[level] = _prf(*totals)
+        if level in per_label_levels:
+            report[level]['labels'] = {path: _prf(*counts) for path, counts in sorted(labels.items())}
+    return report
+
+
+def evaluate(name, tagger, taxonomy, examples, repeat=DEFAULT_REPEAT):
+    texts = [text for text, _ in examples]
+    predictions = [node_levels(tagger(text)) for text in texts]  # also warms caches
+
+    histogram = Histogram()
+    clock = time.perf_counter_ns
+    started = clock()
+    for _ in range(repeat):
+        for text in texts:
+            before = clock()
+            tagger(text)
+            histogram.record(clock() - before)
+    elapsed = (clock() - started) / 1e9
+
+    return {
+        'config': name,
+        'examples': len(examples),
+        'jobs_per_sec': round(len(texts) * repeat / elapsed, 1) if elapsed else None,
+        'p50_us': round(histogram.percentile(0.5) / 1000, 2),
+        'p99_us': round(histogram.percentile(0.99) / 1000, 2),
+        'quality': score(predictions, examples),
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, quality_tolerance=DEFAULT_QUALITY_TOLERANCE):
+    """Rows of (config, metric, before, after, status); status is 'ok', 'regressed', 'improved' or 'new'."""
+    rows = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            rows.append((name, '-', None, None, 'new'))
+            continue
+        for level in LEVELS:
+            old, new = before['quality'][level]['f1'], result['quality'][level]['f1']
+            status = 'regressed' if new < old - quality_tolerance else 'improved' if new > old + quality_tolerance \
+                else 'ok'
+            rows.append((name, f'{level} f1', old, new, status))
+        old, new = before['jobs_per_sec'], result['jobs_per_sec']
+        ratio = new / old if old else 1.0
+        status = 'regressed' if ratio < 1 - tolerance else 'improved' if ratio > 1 + tolerance else 'ok'
+        rows.append((name, 'jobs/s', old, new, status))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Evaluate taxonomy matchers against the gold set.')
+    parser.add_argument('--gold', default=GOLD_PATH)
+    parser.add_argument('--jobs', default=JOBS_PATH)
+    parser.add_argument('--configs', default=','.join(CONFIGS), help=f'comma-separated subset of {list(CONFIGS)}')
+    parser.add_argument('--min-confidence', type=float, default=DEFAULT_MIN_CONFIDENCE)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='timed passes over the gold set')
+    parser.add_argument('-o', '--output', default='eval_results.json')
+    parser.add_argument('--baseline', default=None, help='compare against this results file')
+    parser.add_argument('--save-baseline', default=None, help='also write the results here')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='allowed throughput drop')
+    parser.add_argument('--quality-tolerance', type=float, default=DEFAULT_QUALITY_TOLERANCE,
+                        help='allowed absolute F1 drop per level')
+    args = parser.parse_args(argv)
+
+    taxonomy = load_taxonomy()
+    examples, skipped = load_gold(taxonomy, args.gold, args.jobs, args.min_confidence)
+    print(f'🎯 {len(examples)} gold examples (skipped {skipped})', file=sys.stderr)
+
+    results = {}
+    for name in filter(None, args.configs.split(',')):
+        if name not in CONFIGS:
+            parser.error(f'unknown config {name!r}; expected one of {list(CONFIGS)}')
+        result = evaluate(name, CONFIGS[name](taxonomy), taxonomy, examples, args.repeat)
+        results[name] = result
+        quality = '  '.join(
+            f"{level} P {result['quality'][level]['precision']:.2f} R {result['quality'][level]['recall']:.2f} "
+            f"F1 {result['quality'][level]['f1']:.2f}" for level in LEVELS)
+        print(f"   {name:10} {result['jobs_per_sec']:>10,.0f} jobs/s  p50 {result['p50_us']:>8.1f} µs  "
+              f"p99 {result['p99_us']:>8.1f} µs   {quality}", file=sys.stderr)
+
+    document = {'format': EVAL_FORMAT, 'environment': environment(), 'examples': len(examples),
+                'skipped': skipped, 'results': results}
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f'✅ Wrote {path}', file=sys.stderr)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline.get('results', {}), args.tolerance, args.quality_tolerance)
+    icons = {'ok': '✅', 'improved': '🚀', 'regressed': '❌', 'new': '🆕'}
+    print(f'\n🔍 Compared with {args.baseline}', file=sys.stderr)
+    for name, metric, before, after, status in rows:
+        detail = '' if before is None else f'{before} -> {after}'
+        print(f'   {icons[status]} {name:10} {metric:10} {detail}', file=sys.stderr)
+    regressions = [row for row in rows if row[4] == 'regressed']
+    if regressions:
+        print(f'⚠️  {len(regressions)} regression(s)', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,534 @@
+"""
+Micro and macro benchmarks with JSON output and baseline comparison.
+
+Micro benchmarks time fixed-size operations: importing FULL_TAXONOMY,
+building the Taxonomy and keyword automaton, loading the snapshot,
+matching job text and retrieving chat context. Macro benchmarks run once
+per synthetic corpus size: enrichment, category / major / BM25 index builds
+and searches.
+
+Every benchmark reports min / median / mean / stdev over `--repeat` runs
+after `--warmup` untimed runs. With `--baseline`, each median is compared
+with the stored one. A median counts as slower (❌) only when it is both
+more than `--tolerance` above the baseline and at least `--min-delta-ms`
+slower in absolute terms, so scheduler noise on sub-millisecond micro
+benchmarks does not fail the gate. A baseline benchmark that did not run
+(deleted or renamed) is reported as missing. Either one makes the process
+exit 1.
+
+benchmarks/baseline.json is the committed reference (--sizes 10000, seed 0;
+its `environment` block records the host). Timings only compare on similar
+hardware, so a CI runner should first save its own baseline from the main
+branch with --save-baseline, then gate branches with --baseline against it.
+Refresh the committed file whenever an intended speed change lands.
+Back-to-back runs of one tree on a shared single-CPU host differ by up to
+about 1.5x, hence the ±50% default. A dedicated runner can pass a tighter
+--tolerance.
+
+Usage:
+    python3 -m benchmarks.run --sizes 10000 -o bench_results.json
+    python3 -m benchmarks.run --sizes 10000 --save-baseline benchmarks/baseline.json
+    python3 -m benchmarks.run --sizes 10000 --baseline benchmarks/baseline.json
+    python3 -m benchmarks.run --filter bm25 --sizes 100000,1000000
+"""
+
+import argparse
+import gc
+import importlib
+import importlib.util
+import json
+import os
+import platform
+import py_compile
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.synthetic import CorpusGenerator
+from taxonomy import Taxonomy, load_taxonomy
+
+DEFAULT_SIZES = (10000,)
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+DEFAULT_TOLERANCE = 0.5
+DEFAULT_MIN_DELTA = 0.001  # seconds; smaller median changes are never a regression
+RESULTS_FORMAT = 1
+
+CHAT_QUERIES = (
+    'How do heat pumps and smart thermostats cut building emissions?',
+    'What jobs exist in direct air capture?',
+    'I studied chemical engineering, where can I work on green hydrogen?',
+    'battery recycling and critical minerals',
+    'Tell me about offshore wind careers',
+    'regenerative agriculture and soil carbon',
+    'low carbon cement and steel manufacturing',
+    'EV charging infrastructure software roles',
+)
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+BENCHMARKS = []
+TOLERANCES = {}  # benchmark name -> relative tolerance, for ones noisier than DEFAULT_TOLERANCE
+
+
+def benchmark(name, kind='micro', tolerance=None):
+    """Register `setup(ctx, size)` returning (fn, items): fn is timed, items sets the throughput unit.
+
+    Macro benchmarks run once per corpus size; micro ones once with size None.
+    `tolerance` widens the regression gate for this benchmark only.
+    """
+    def register(setup):
+        BENCHMARKS.append((name, kind, setup))
+        if tolerance is not None:
+            TOLERANCES[name] = tolerance
+        return setup
+    return register
+
+
+class Context:
+    """Shared state: the taxonomy and generated corpora (built once per size)."""
+
+    def __init__(self, seed=0):
+        self.taxonomy = load_taxonomy()
+        self.generator = CorpusGenerator(self.taxonomy, seed)
+        self._corpora = {}
+        self._cache = {}
+        self._tempdirs = []
+
+    def jobs(self, size):
+        if size not in self._corpora:
+            self._corpora[size] = list(self.generator.jobs(size))
+        return self._corpora[size]
+
+    def cached(self, key, build):
+        """Build-once helper for indexes that search benchmarks depend on."""
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def tempdir(self):
+        """A scratch directory removed by `close` once every benchmark has run."""
+        tempdir = tempfile.TemporaryDirectory(prefix='ecotax-bench-')
+        self._tempdirs.append(tempdir)
+        return tempdir.name
+
+    def close(self):
+        for tempdir in self._tempdirs:
+            tempdir.cleanup()
+        self._tempdirs.clear()
+
+    def area_paths(self):
+        return [area.sector.name + ' > ' + area.name for area, _, _ in self.generator.areas]
+
+
+# ============================================================================
+# Micro benchmarks
+# ============================================================================
+
+@benchmark('taxonomy.import')
+def bench_import(ctx, size):
+    # Time the import from bytecode: compile it up front, since PYTHONDONTWRITEBYTECODE
+    # (or a read-only checkout) would otherwise recompile the source on every run.
+    spec = importlib.util.find_spec('FULL_TAXONOMY')
+    py_compile.compile(spec.origin, cfile=spec.cached, doraise=True)
+
+    def run():
+        sys.modules.pop('FULL_TAXONOMY', None)
+        importlib.import_module('FULL_TAXONOMY')
+    return run, 1
+
+
+@benchmark('taxonomy.build')
+def bench_build(ctx, size):
+    raw = ctx.taxonomy.raw
+    return (lambda: Taxonomy(raw)), 1
+
+
+@benchmark('taxonomy.snapshot_load')
+def bench_snapshot(ctx, size):
+    from taxonomy_snapshot import build_snapshot, load_snapshot
+    path = os.path.join(ctx.tempdir(), 'taxonomy.snapshot')
+    build_snapshot(path)
+    return (lambda: load_snapshot(path)), 1
+
+
+@benchmark('matcher.build')
+def bench_matcher_build(ctx, size):
+    from keyword_matcher import KeywordMatcher
+    return (lambda: KeywordMatcher(ctx.taxonomy)), 1
+
+
+@benchmark('matcher.match_1k')
+def bench_match(ctx, size):
+    from enrich_jobs import job_text
+    from keyword_matcher import KeywordMatcher
+    matcher = KeywordMatcher(ctx.taxonomy)
+    texts = [job_text(job) for job in ctx.jobs(1000)]
+
+    def run():
+        for text in texts:
+            matcher.matched_keywords(text)
+    return run, len(texts)
+
+
+@benchmark('context.retrieve_cold')
+def bench_context_cold(ctx, size):
+    from context_retrieval import ContextRetriever
+    retriever = ContextRetriever(ctx.taxonomy, check_interval=float('inf'))
+
+    def run():
+        retriever.cache.clear()
+        for query in CHAT_QUERIES:
+            retriever.retrieve(query)
+    return run, len(CHAT_QUERIES)
+
+
+@benchmark('context.retrieve_warm')
+def bench_context_warm(ctx, size):
+    from context_retrieval import ContextRetriever
+    retriever = ContextRetriever(ctx.taxonomy, check_interval=float('inf'))
+    for query in CHAT_QUERIES:
+        retriever.retrieve(query)
+
+    def run():
+        for query in CHAT_QUERIES:
+            retriever.retrieve(query)
+    return run, len(CHAT_QUERIES)
+
+
+@benchmark('prompt.pack')
+def bench_prompt_pack(ctx, size):
+    from context_retrieval import ContextRetriever
+    from prompt_packer import PromptPacker
+    retriever = ContextRetriever(ctx.taxonomy, check_interval=float('inf'))
+    packer = PromptPacker(ctx.taxonomy)
+    bundles = [retriever.retrieve(query) for query in CHAT_QUERIES]
+
+    def run():
+        for bundle in bundles:
+            packer.pack(bundle)
+    return run, len(bundles)
+
+
+@benchmark('router.route')
+def bench_router_route(ctx, size):
+    from query_router import QueryRouter
+    router = QueryRouter(ctx.taxonomy)
+
+    def run():
+        for query in CHAT_QUERIES:
+            router.route(query)
+    return run, len(CHAT_QUERIES)
+
+
+@benchmark('fuzzy.lookup')
+def bench_fuzzy_lookup(ctx, size):
+    from fuzzy_lookup import FuzzyLookup
+    fuzzy = FuzzyLookup.from_sources(ctx.taxonomy)
+    typos = ('perovskit', 'geotermal', 'electrolyser', 'hydorgen', 'cemnet', 'sollar', 'decarbonisation')
+
+    def run():
+        for typo in typos:
+            fuzzy.lookup(typo)
+    return run, len(typos)
+
+
+# ============================================================================
+# Macro benchmarks (per corpus size)
+# ============================================================================
+
+@benchmark('enrich.sequential', kind='macro')
+def bench_enrich(ctx, size):
+    from enrich_jobs import Enricher
+    enricher = Enricher(ctx.taxonomy)
+    jobs = ctx.jobs(size)
+
+    def run():
+        for job in jobs:
+            enricher.enrich(job)
+    return run, size
+
+
+@benchmark('category_index.build', kind='macro')
+def bench_category_build(ctx, size):
+    from category_index import CategoryIndex
+    jobs = ctx.jobs(size)
+    return (lambda: CategoryIndex.from_jobs(jobs, ctx.taxonomy)), size
+
+
+@benchmark('category_index.search', kind='macro')
+def bench_category_search(ctx, size):
+    from category_index import CategoryIndex
+    index = ctx.cached(('category', size), lambda: CategoryIndex.from_jobs(ctx.jobs(size), ctx.taxonomy))
+    paths = ctx.area_paths()
+
+    def run():
+        for path in paths:
+            index.search(path)
+    return run, len(paths)
+
+
+@benchmark('major_index.build', kind='macro')
+def bench_major_build(ctx, size):
+    from major_index import MajorIndex, load_majors
+    majors = load_majors()
+    jobs = ctx.jobs(size)
+    return (lambda: MajorIndex(majors, ctx.taxonomy).build(jobs)), size
+
+
+@benchmark('major_index.lookup', kind='macro')
+def bench_major_lookup(ctx, size):
+    from major_index import MajorIndex, load_majors
+    index = ctx.cached(('major', size), lambda: MajorIndex(load_majors(), ctx.taxonomy).build(ctx.jobs(size)))
+    names = [spelling for major in index.majors for spelling in (major.name, major.code) if spelling]
+
+    def run():
+        for name in names:
+            index.jobs_for(name)
+    return run, len(names)
+
+
+@benchmark('bm25.build', kind='macro')
+def bench_bm25_build(ctx, size):
+    from bm25_search import BM25Index
+    jobs = ctx.jobs(size)
+    return (lambda: BM25Index.from_jobs(jobs)), size
+
+
+# Allocation-heavy scoring over every posting: back-to-back runs vary up to 1.5x.
+@benchmark('bm25.search', kind='macro', tolerance=1.0)
+def bench_bm25_search(ctx, size):
+    from bm25_search import BM25Index
+    index = ctx.cached(('bm25', size), lambda: BM25Index.from_jobs(ctx.jobs(size)))
+
+    def run():
+        for query in CHAT_QUERIES:
+            index.search(query)
+    return run, len(CHAT_QUERIES)
+
+
+@benchmark('facets.build', kind='macro')
+def bench_facets_build(ctx, size):
+    from facet_index import FacetIndex
+    jobs = ctx.jobs(size)
+    return (lambda: FacetIndex.from_jobs(jobs, ctx.taxonomy)), size
+
+
+@benchmark('facets.counts', kind='macro')
+def bench_facets_counts(ctx, size):
+    from facet_index import FacetIndex
+    facets = ctx.cached(('facets', size), lambda: FacetIndex.from_jobs(ctx.jobs(size), ctx.taxonomy))
+    filters = ({}, {'experience_level': ['Entry-Level']}, {'node': ctx.area_paths()[:2], 'salary_type': ['yearly']})
+
+    def run():
+        for selected in filters:
+            facets.counts(selected)
+    return run, len(filters)
+
+
+@benchmark('location.build', kind='macro')
+def bench_location_build(ctx, size):
+    from location_index import LocationIndex
+    jobs = ctx.jobs(size)
+    return (lambda: LocationIndex.from_jobs(jobs)), size
+
+
+@benchmark('location.near', kind='macro')
+def bench_location_near(ctx, size):
+    from location_index import LocationIndex
+    index = ctx.cached(('location', size), lambda: LocationIndex.from_jobs(ctx.jobs(size)))
+    places = ('Denver', 'San Francisco Bay Area', 'Houston', 'Boston')
+
+    def run():
+        for place in places:
+            index.near_place(place, radius_km=80)
+    return run, len(places)
+
+
+def _job_store(ctx, size):
+    from job_store import write_store
+    path = os.path.join(ctx.tempdir(), 'job_store')
+    write_store(ctx.jobs(size), path, ctx.taxonomy)
+    return path
+
+
+@benchmark('store.open', kind='macro')
+def bench_store_open(ctx, size):
+    from job_store import JobStore
+    path = ctx.cached(('store', size), lambda: _job_store(ctx, size))
+    return (lambda: JobStore.open(path)), 1
+
+
+@benchmark('store.where', kind='macro')
+def bench_store_where(ctx, size):
+    from job_store import JobStore
+    store = JobStore.open(ctx.cached(('store', size), lambda: _job_store(ctx, size)))
+    companies = [store.value('company', i) for i in range(0, len(store), max(1, len(store) // 8))]
+
+    def run():
+        for company in companies:
+            store.where('company', company)
+    return run, len(companies)
+
+
+# ============================================================================
+# Runner
+# ============================================================================
+
+def measure(fn, repeat=DEFAULT_REPEAT, warmup=DEFAULT_WARMUP):
+    """Wall-clock seconds for `repeat` runs after `warmup` untimed ones (GC paused while timing)."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+    return timings
+
+
+def summarize(timings, items):
+    median = statistics.median(timings)
+    return {
+        'repeat': len(timings),
+        'items': items,
+        'min': min(timings),
+        'median': median,
+        'mean': statistics.fmean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'items_per_sec': items / median if median else None,
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, warmup=DEFAULT_WARMUP,
+                   name_filter=None, seed=0, log=None):
+    """Run every registered benchmark; returns {result name: summary}."""
+    ctx = Context(seed)
+    results = {}
+    try:
+        for name, kind, setup in BENCHMARKS:
+            if name_filter and name_filter not in name:
+                continue
+            for size in (sizes if kind == 'macro' else (None,)):
+                key = name if size is None else f'{name}[{size}]'
+                fn, items = setup(ctx, size)
+                repeats = repeat if size is None or size < 1000000 else max(1, repeat // 5)
+                results[key] = {'kind': kind, 'size': size, **summarize(measure(fn, repeats, warmup), items)}
+                if log:
+                    log(key, results[key])
+    finally:
+        ctx.close()
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, min_delta=DEFAULT_MIN_DELTA):
+    """Rows of (name, baseline median, median, ratio, status).
+
+    status is 'ok', 'faster', 'slower', 'new' (not in the baseline) or
+    'missing' (in the baseline but not in `results`). A change counts only
+    when it exceeds both the relative tolerance (`tolerance`, or the
+    benchmark's own TOLERANCES entry if larger) and `min_delta` seconds.
+    """
+    rows = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            rows.append((name, None, result['median'], None, 'new'))
+            continue
+        after = result['median']
+        ratio = after / before['median'] if before['median'] else float('inf')
+        allowed = max(tolerance, TOLERANCES.get(name.split('[')[0], 0.0))
+        status = 'ok'
+        if abs(after - before['median']) >= min_delta:
+            status = 'slower' if ratio > 1 + allowed else 'faster' if ratio < 1 - allowed else 'ok'
+        rows.append((name, before['median'], after, ratio, status))
+    for name, before in baseline.items():
+        if name not in results:
+            rows.append((name, before['median'], None, None, 'missing'))
+    return rows
+
+
+def selected(baseline, sizes, name_filter=None):
+    """Baseline entries this run was asked to produce (same --sizes and --filter)."""
+    return {name: result for name, result in baseline.items()
+            if (not name_filter or name_filter in name.split('[')[0])
+            and result.get('size') in (None, *sizes)}
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _print_result(name, result):
+    rate = f"{result['items_per_sec']:,.0f}/s" if result['items_per_sec'] else '-'
+    print(f"   {name:40} median {result['median'] * 1000:10.3f} ms  "
+          f"(±{result['stdev'] * 1000:.3f})  {rate}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark taxonomy loading, matching, enrichment and search.')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma-separated synthetic corpus sizes for macro benchmarks')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument('--filter', default=None, help='only run benchmarks whose name contains this')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='bench_results.json')
+    parser.add_argument('--baseline', default=None, help='compare against this results file')
+    parser.add_argument('--save-baseline', default=None, help='also write the results here')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA * 1000,
+                        help='ignore median changes smaller than this many milliseconds')
+    args = parser.parse_args(argv)
+
+    sizes = tuple(int(size) for size in args.sizes.split(',') if size)
+    print(f'⏱️  Running benchmarks (sizes {sizes}, repeat {args.repeat})...', file=sys.stderr)
+    results = run_benchmarks(sizes, args.repeat, args.warmup, args.filter, args.seed, log=_print_result)
+
+    document = {'format': RESULTS_FORMAT, 'environment': environment(), 'seed': args.seed, 'results': results}
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f'✅ Wrote {path}', file=sys.stderr)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    expected = selected(baseline.get('results', {}), sizes, args.filter)
+    rows = compare(results, expected, args.tolerance, args.min_delta_ms / 1000)
+    icons = {'ok': '✅', 'faster': '🚀', 'slower': '❌', 'new': '🆕', 'missing': '❓'}
+    print(f"\n🔍 Compared with {args.baseline} (tolerance ±{args.tolerance:.0%}, "
+          f"min delta {args.min_delta_ms:g} ms)", file=sys.stderr)
+    for name, before, after, ratio, status in rows:
+        change = f'{ratio:6.2f}x' if ratio is not None else f'{status:>7}'
+        before_ms = f'{before * 1000:10.3f}' if before is not None else ' ' * 10
+        after_ms = f'{after * 1000:10.3f}' if after is not None else ' ' * 10
+        print(f'{icons[status]} {name:40} {before_ms} -> {after_ms} ms  {change}', file=sys.stderr)
+    regressions = [row[0] for row in rows if row[4] == 'slower']
+    missing = [row[0] for row in rows if row[4] == 'missing']
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+    if missing:
+        print(f"\n❓ {len(missing)} baseline benchmark(s) did not run: {', '.join(missing)}", file=sys.stderr)
+    return 1 if regressions or missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Local stand-in for gemini generateContent, plus a response-cache replay.
+
+The stub answers POST .../generateContent after a fixed (optionally
+jittered) delay, with the same response shape as Gemini, echoing the
+prompt's "User Question:" line. The replay sends paraphrased questions
+about taxonomy areas through QueryRouter + ContextRetriever -> PromptPacker
+-> ResponseCache -> GeminiClient(stub). It reports hit rate, latency saved,
+and "wrong" near hits: answers reused across different topics or intents.
+
+Usage:
+    python3 -m benchmarks.stub_llm --latency 0.8 --topics 30
+    python3 -m benchmarks.stub_llm --serve --port 8765   # just the stub
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_LATENCY = 0.5
+
+# Paraphrases of the questions the chat gets about one area; {area} is its name.
+TEMPLATES = (
+    'What jobs are there in {area}?',
+    'what jobs are there in {area}',
+    'Show me jobs in {area}',
+    'Which {area} jobs are available?',
+    'Tell me about careers in {area}',
+    'How do I get a career in {area}?',
+    'What is {area}?',
+    'Explain {area} to me',
+)
+
+_QUESTION = re.compile(r'User Question:\s*(.*)')
+
+
+class StubLLMServer:
+    """ThreadingHTTPServer answering generateContent requests after `latency` seconds."""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=DEFAULT_LATENCY, jitter=0.0, seed=0):
+        rng = random.Random(seed)
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                prompt = payload['contents'][0]['parts'][0]['text']
+                found = _QUESTION.search(prompt)
+                with lock:
+                    delay = latency + (rng.uniform(-jitter, jitter) if jitter else 0.0)
+                    server.requests += 1
+                time.sleep(max(0.0, delay))
+                answer = f"Answer to: {found.group(1).strip() if found else prompt[:80]}"
+                body = json.dumps({'candidates': [{'content': {'parts': [{'text': answer}], 'role': 'model'}}]})
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(body.encode('utf-8'))
+
+            def log_message(self, *args):
+                pass
+
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.url = f'http://{host}:{self.httpd.server_address[1]}/v1/models/stub:generateContent'
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def paraphrase_workload(taxonomy, topics, rounds, seed):
+    """[(question, topic)] with every template for `topics` areas, shuffled, repeated `rounds` times."""
+    rng = random.Random(seed)
+    areas = [node for node in taxonomy.nodes if node.kind == 'opportunity_area']
+    rng.shuffle(areas)
+    base = [(template.format(area=area.name), area.path) for area in areas[:topics] for template in TEMPLATES]
+    workload = []
+    for _ in range(rounds):
+        batch = list(base)
+        rng.shuffle(batch)
+        workload.extend(batch)
+    return workload
+
+
+def replay(url, topics, rounds, threshold, seed, packer_budget):
+    from context_retrieval import ContextRetriever
+    from prompt_packer import PromptPacker
+    from query_router import QueryRouter
+    from response_cache import GeminiClient, ResponseCache, bundle_nodes
+
+    retriever = ContextRetriever(check_interval=float('inf'))
+    packer = PromptPacker(retriever.taxonomy)
+    router = QueryRouter(retriever.taxonomy)
+    cache = ResponseCache(threshold=threshold)
+    client = GeminiClient(url, api_key='')
+    workload = paraphrase_workload(retriever.taxonomy, topics, rounds, seed)
+    topic_of = dict(workload)
+
+    intent_of = {}
+    wrong, latencies = 0, []
+    for question, topic in workload:
+        started = time.perf_counter()
+        route = router.route(question)
+        intent_of[question] = route.intent
+        bundle = retriever.retrieve(question)
+        packed = packer.pack(bundle, budget=packer_budget)
+        prompt = f'{packed.text}\n\nUser Question: {question}\n'
+        text, how = cache.get_or_call(question, bundle_nodes(bundle), packed.text,
+                                      lambda: client.generate(prompt), route.intent)
+        latencies.append(time.perf_counter() - started)
+        answered = text.removeprefix('Answer to: ')
+        if how == 'near' and (topic_of.get(answered) != topic or intent_of.get(answered) != route.intent):
+            wrong += 1
+    latencies.sort()
+    return {
+        'requests': len(workload),
+        'distinct_questions': len(topic_of),
+        **cache.stats.as_dict(),
+        'wrong_near_hits': wrong,
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2),
+        'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Stub LLM server and response-cache replay.')
+    parser.add_argument('--latency', type=float, default=DEFAULT_LATENCY, help='stub response delay (s)')
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--serve', action='store_true', help='only run the stub until interrupted')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--topics', type=int, default=20, help='opportunity areas asked about')
+    parser.add_argument('--rounds', type=int, default=2, help='times the workload repeats')
+    parser.add_argument('--threshold', type=float, default=None, help='near-match cosine threshold')
+    parser.add_argument('--budget', type=int, default=800, help='prompt context token budget')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    stub = StubLLMServer(port=args.port, latency=args.latency, jitter=args.jitter, seed=args.seed)
+    if args.serve:
+        print(f'🔌 Stub LLM at {stub.url}', file=sys.stderr)
+        try:
+            stub.httpd.serve_forever()
+        except KeyboardInterrupt:
+            stub.stop()
+        return
+
+    from response_cache import DEFAULT_THRESHOLD
+
+    threshold = DEFAULT_THRESHOLD if args.threshold is None else args.threshold
+    with stub:
+        result = replay(stub.url, args.topics, args.rounds, threshold, args.seed, args.budget)
+    result['stub_requests'] = stub.requests
+    print(json.dumps(result, indent=2))
+    print(f"🎯 hit rate {result['hit_ratio']:.0%}, {result['saved_seconds']:.1f}s of LLM time saved, "
+          f"{result['wrong_near_hits']} cross-topic or cross-intent near hits", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
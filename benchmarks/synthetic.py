@@ -0,0 +1,137 @@
+"""
+Synthetic job corpus in the climate_jobs_v6.json schema.
+
+Titles, skills, requirements and categories are drawn from CLIMATE_TAXONOMY
+keywords and paths, and majors from the majors ontology. Matching, indexing
+and search therefore do realistic work at any size. Output is fully
+determined by (n, seed).
+
+Usage:
+    python3 -m benchmarks.synthetic 100000 -o jobs-100k.jsonl
+"""
+
+import argparse
+import json
+import random
+import sys
+
+from taxonomy import PATH_SEP, OpportunityArea, load_taxonomy
+
+ROLES = ('Engineer', 'Scientist', 'Analyst', 'Technician', 'Manager', 'Specialist', 'Developer', 'Operator')
+LEVELS = (
+    ('Internship', 'Intern, '),
+    ('Entry-Level', ''),
+    ('Associate', 'Associate '),
+    ('Senior', 'Senior '),
+    ('Lead/Principal', 'Principal '),
+    ('Executive', 'Director of '),
+)
+COMPANY_STEMS = ('Volt', 'Terra', 'Carbon', 'Grid', 'Solar', 'Hydro', 'Blue', 'Green', 'Arc', 'Ion', 'Tidal', 'Ember')
+COMPANY_SUFFIXES = ('Works', 'Labs', 'Energy', 'Systems', 'Dynamics', 'Power', 'Materials', 'Robotics')
+LOCATIONS = (
+    'San Francisco, CA', 'Oakland, CA', 'Los Angeles, CA', 'Seattle, WA', 'Boston, MA', 'Austin, TX',
+    'Houston, TX', 'Denver, CO', 'New York, NY', 'Chicago, IL', 'Remote', 'Berlin, Germany',
+)
+SOURCES = ('Greenhouse API', 'Ashby API', 'Lever API')
+FILLER = (
+    'Strong written and verbal communication skills.',
+    'Comfortable working in a fast-paced startup environment.',
+    'Ability to travel up to 20% of the time.',
+    'Experience collaborating with cross-functional teams.',
+    'Bachelor\'s degree in a relevant field or equivalent experience.',
+)
+FALLBACK_MAJORS = ('Mechanical Engineering', 'Electrical Engineering', 'Chemical Engineering',
+                   'Environmental Science', 'Computer Science')
+
+
+class CorpusGenerator:
+    """Builds the vocabulary once; `jobs(n)` yields n jobs."""
+
+    def __init__(self, taxonomy=None, seed=0):
+        self.taxonomy = taxonomy or load_taxonomy()
+        self.seed = seed
+        self.areas = []
+        for node in self.taxonomy.nodes:
+            if isinstance(node, OpportunityArea):
+                leaves = self.taxonomy.children(node)
+                keywords = sorted({k for leaf in leaves for k in leaf.keywords})
+                if keywords:
+                    self.areas.append((node, leaves, keywords))
+        self.companies = [stem + suffix for stem in COMPANY_STEMS for suffix in COMPANY_SUFFIXES]
+        try:
+            from major_index import load_majors
+            self.majors = [major.name for major in load_majors()]
+        except OSError:
+            self.majors = list(FALLBACK_MAJORS)
+
+    def job(self, rng, job_id):
+        area, leaves, keywords = rng.choice(self.areas)
+        extra = rng.choice(self.areas) if rng.random() < 0.25 else None
+        areas = [area] + ([extra[0]] if extra and extra[0] is not area else [])
+        skills = rng.sample(keywords, min(len(keywords), rng.randint(3, 7)))
+        level, prefix = rng.choice(LEVELS)
+        company = rng.choice(self.companies)
+        salary_type = 'hourly' if level == 'Internship' or rng.random() < 0.1 else 'yearly'
+        low = rng.randint(18, 45) if salary_type == 'hourly' else rng.randrange(60000, 220000, 5000)
+        high = low + (rng.randint(2, 15) if salary_type == 'hourly' else rng.randrange(10000, 60000, 5000))
+        imperatives = [leaf.name for leaf in rng.sample(leaves, min(len(leaves), rng.randint(1, 2)))]
+
+        return {
+            'title': f'{prefix}{skills[0].title()} {rng.choice(ROLES)}',
+            'company': company,
+            'location': rng.choice(LOCATIONS),
+            'experience_level': level,
+            'url': f'https://jobs.example.com/{company.lower()}/{job_id:08d}',
+            'requirements_and_qualifications': (
+                f"Experience with {', '.join(skills[:-1])} and {skills[-1]}. "
+                + ' '.join(rng.sample(FILLER, 2))
+            ),
+            'climate_sectors': sorted({a.sector.name for a in areas}),
+            'climate_opportunity_areas': [a.name for a in areas],
+            'climate_innovation_imperatives': imperatives,
+            'applicable_majors': rng.sample(self.majors, min(len(self.majors), rng.randint(1, 4))),
+            'salary_min': low if rng.random() < 0.8 else None,
+            'salary_max': high,
+            'salary_type': salary_type,
+            'company_description': f'{company} builds {area.name.lower()} technology.',
+            'skills': skills,
+            'due_date': None,
+            'source': rng.choice(SOURCES),
+            'scraped_at': f'2026-02-{rng.randint(1, 28):02d}T12:00:00',
+            'climate_categories': [a.sector.name + PATH_SEP + a.name for a in areas],
+            'skills_keywords': ', '.join(skills),
+            'work_areas': ', '.join(a.name for a in areas),
+        }
+
+    def jobs(self, n):
+        rng = random.Random(self.seed)
+        for job_id in range(n):
+            yield self.job(rng, job_id)
+
+
+def generate_jobs(n, seed=0, taxonomy=None):
+    return CorpusGenerator(taxonomy, seed).jobs(n)
+
+
+def write_corpus(n, path, seed=0):
+    """Stream n jobs to a JSONL file (job_ingest.iter_jobs reads it back)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for job in generate_jobs(n, seed):
+            f.write(json.dumps(job, ensure_ascii=False))
+            f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic climate job corpus (JSONL).')
+    parser.add_argument('n', type=int, nargs='?', default=10000)
+    parser.add_argument('-o', '--output', default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    path = args.output or f'synthetic_jobs_{args.n}.jsonl'
+    write_corpus(args.n, path, args.seed)
+    print(f'✅ Wrote {args.n} synthetic jobs to {path}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+BM25F full-text retrieval over jobs, with a boosted taxonomy-names field.
+
+`searchJobs` in server.js adds +1 when any query word longer than three
+characters appears anywhere in one concatenated string, then keeps 10. Here
+each job field is tokenized once into an inverted index with precomputed,
+length-normalized BM25F term weights. A query walks only the posting lists of
+its own terms and keeps the best k with a heap.
+
+The `taxonomy` field holds the CLIMATE_TAXONOMY names a job is tagged with
+(sector_name, area_name, subject_name, cluster_name, moonshot name), so a
+query that names a sector, area or technology ranks jobs tagged with it first.
+
+Usage:
+    index = BM25Index.from_jobs(jobs)
+    index.search("grid scale battery storage engineer", k=10)   # [(job_id, score), ...]
+"""
+
+import heapq
+import math
+import re
+from array import array
+
+from metrics import timed
+from taxonomy import PATH_SEP, load_taxonomy
+
+K1 = 1.2
+
+# field -> (weight, length-normalization b)
+FIELD_WEIGHTS = {
+    'title': (3.0, 0.75),
+    'taxonomy': (2.5, 0.5),
+    'skills': (2.0, 0.75),
+    'work_areas': (1.5, 0.5),
+    'company': (1.0, 0.3),
+    'requirements': (0.7, 0.75),
+}
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or our that the their this to
+with will you your we me my i jobs job roles role positions position find show looking want any
+""".split())
+
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+
+def tokenize(text):
+    return [token for token in _TOKEN.findall((text or '').lower()) if token not in STOPWORDS]
+
+
+def _join(value):
+    if isinstance(value, (list, tuple)):
+        return ' '.join(str(v) for v in value)
+    return value or ''
+
+
+def taxonomy_names(job, taxonomy=None):
+    """Taxonomy names a job is tagged with, from its categories and enrichment block.
+
+    Category paths that resolve to a CLIMATE_TAXONOMY node contribute the
+    canonical names of that node and its ancestors.
+    """
+    taxonomy = taxonomy or load_taxonomy()
+    names = []
+    for path in job.get('climate_categories') or ():
+        node = taxonomy.node(path)
+        if node is None:
+            names.extend(path.split(PATH_SEP))
+            continue
+        names.append(node.name)
+        names.extend(ancestor.name for ancestor in node.ancestors())
+    names.extend(job.get('climate_innovation_imperatives') or ())
+    block = job.get('taxonomy') or {}
+    for key in ('sectors', 'opportunity_areas', 'innovation_imperatives', 'moonshots', 'tech_categories'):
+        names.extend(block.get(key) or ())
+    return ' '.join(dict.fromkeys(names))
+
+
+def job_fields(job):
+    return {
+        'title': job.get('title'),
+        'taxonomy': taxonomy_names(job),
+        'skills': job.get('skills_keywords') or _join(job.get('skills')),
+        'work_areas': job.get('work_areas') or _join(job.get('climate_opportunity_areas')),
+        'company': job.get('company'),
+        'requirements': job.get('requirements_and_qualifications'),
+    }
+
+
+class BM25Index:
+    """Inverted index of BM25F pseudo-term-frequencies.
+
+    Per (term, job) the index stores the BM25F-saturated term weight, so
+    query-time scoring is `idf(term) * weight` summed over query terms.
+    """
+
+    def __init__(self, field_weights=None, k1=K1):
+        self.field_weights = field_weights or FIELD_WEIGHTS
+        self.k1 = k1
+        self.n_docs = 0
+        self.postings = {}   # term -> (array of job ids, array of weights)
+        self.idf = {}
+
+    @classmethod
+    def from_jobs(cls, jobs, field_weights=None, k1=K1, fields=job_fields):
+        index = cls(field_weights, k1)
+        index.build(fields(job) for job in jobs)
+        return index
+
+    def build(self, documents):
+        """Index an iterable of {field: text} dicts; job ids are their positions."""
+        docs = []
+        totals = dict.fromkeys(self.field_weights, 0)
+        for fields in documents:
+            counts = {}
+            for field in self.field_weights:
+                tokens = tokenize(fields.get(field))
+                totals[field] += len(tokens)
+                counts[field] = (len(tokens), _term_counts(tokens))
+            docs.append(counts)
+
+        self.n_docs = len(docs)
+        average = {field: (total / self.n_docs if self.n_docs else 0.0) or 1.0 for field, total in totals.items()}
+
+        raw = {}
+        for job_id, counts in enumerate(docs):
+            pseudo = {}
+            for field, (length, terms) in counts.items():
+                weight, b = self.field_weights[field]
+                norm = 1 - b + b * length / average[field]
+                for term, tf in terms.items():
+                    pseudo[term] = pseudo.get(term, 0.0) + weight * tf / norm
+            for term, tf in pseudo.items():
+                ids, weights = raw.setdefault(term, (array('I'), array('f')))
+                ids.append(job_id)
+                weights.append(tf / (self.k1 + tf) * (self.k1 + 1))
+
+        self.postings = raw
+        self.idf = {
+            term: math.log(1 + (self.n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+            for term, (ids, _) in raw.items()
+        }
+        return self
+
+    def scores(self, query):
+        """Accumulated scores for every job hit by a query term (term-at-a-time)."""
+        accumulator = {}
+        for term in dict.fromkeys(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            idf = self.idf[term]
+            get = accumulator.get
+            for job_id, weight in zip(*posting):
+                accumulator[job_id] = get(job_id, 0.0) + idf * weight
+        return accumulator
+
+    @timed('bm25.search')
+    def search(self, query, k=10):
+        """Top-k (job_id, score), best first; ties keep corpus order."""
+        accumulator = self.scores(query)
+        top = heapq.nsmallest(k, accumulator.items(), key=lambda item: (-item[1], item[0]))
+        return [(job_id, score) for job_id, score in top]
+
+
+def _term_counts(tokens):
+    counts = {}
+    for token in tokens:
+        counts[token] = counts.get(token, 0) + 1
+    return counts
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    from job_ingest import iter_jobs
+
+    jobs = list(iter_jobs('climate_jobs_v6.json'))
+    started = time.perf_counter()
+    index = BM25Index.from_jobs(jobs)
+    print(f'✅ Indexed {index.n_docs} jobs, {len(index.postings)} terms '
+          f'in {time.perf_counter() - started:.2f}s')
+
+    query = ' '.join(sys.argv[1:]) or 'grid scale battery storage engineer'
+    started = time.perf_counter()
+    hits = index.search(query)
+    print(f'\n🔍 {query!r} ({(time.perf_counter() - started) * 1000:.2f} ms)')
+    for job_id, score in hits:
+        print(f"  [{score:5.2f}] {jobs[job_id]['title']} @ {jobs[job_id]['company']}")
@@ -0,0 +1,228 @@
+"""
+Inverted index from taxonomy paths to job IDs.
+
+`searchJobsByCategory` in server.js scans every job and re-splits every
+`climate_categories` string on ' > ' for each one. Here each job is indexed
+once under every prefix of its Sector > Opportunity Area > Imperative/Cluster
+paths, giving a sorted posting list of job IDs per prefix. A category query
+then only walks as much of the posting lists as it returns.
+
+Job IDs are positions in the corpus the index was built from.
+
+Usage:
+    index = CategoryIndex.from_jobs(jobs)
+    index.search('Electricity > Energy Storage & Demand Flexibility')   # [(job_id, score), ...]
+    index.query(all_of=['Electricity'], any_of=['Transportation', 'Buildings'])
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left
+
+from metrics import timed
+from taxonomy import PATH_SEP, load_taxonomy, normalize_path
+
+EXACT_SCORE = 10
+PREFIX_SCORE = 5
+SECTOR_SCORE = 2
+
+DEFAULT_LIMIT = 15
+
+
+# ============================================================================
+# Posting-list operations (inputs are ascending sequences of ints)
+# ============================================================================
+
+def intersect(*postings):
+    """Ascending IDs present in every list. Probes the shorter lists by bisect."""
+    if not postings:
+        return []
+    lists = sorted(postings, key=len)
+    result = list(lists[0])
+    for other in lists[1:]:
+        if not result:
+            break
+        kept = []
+        lo = 0
+        for job_id in result:
+            lo = bisect_left(other, job_id, lo)
+            if lo == len(other):
+                break
+            if other[lo] == job_id:
+                kept.append(job_id)
+        result = kept
+    return result
+
+
+def union(*postings):
+    """Ascending IDs present in any list."""
+    result = []
+    last = None
+    for job_id in heapq.merge(*postings):
+        if job_id != last:
+            result.append(job_id)
+            last = job_id
+    return result
+
+
+def iter_difference(postings, excluded):
+    """Lazily yield IDs of `postings` not in `excluded` (both ascending)."""
+    j = 0
+    n = len(excluded)
+    for job_id in postings:
+        while j < n and excluded[j] < job_id:
+            j += 1
+        if j < n and excluded[j] == job_id:
+            continue
+        yield job_id
+
+
+# ============================================================================
+# Index
+# ============================================================================
+
+def job_category_paths(taxonomy, job):
+    """Category paths for a job, extended one level with its imperatives.
+
+    v6 jobs carry "Sector > Area" strings plus a flat
+    `climate_innovation_imperatives` list; an imperative that the taxonomy
+    places under that area becomes "Sector > Area > Imperative".
+    """
+    paths = list(job.get('climate_categories') or ())
+    leaves = job.get('climate_innovation_imperatives') or ()
+    if leaves:
+        for path in list(paths):
+            area = taxonomy.node(path)
+            if area is None:
+                continue
+            for name in leaves:
+                if taxonomy.node(area.path + PATH_SEP + name) is not None:
+                    paths.append(path + PATH_SEP + name)
+    return paths
+
+
+class CategoryIndex:
+    """Exact-path and path-prefix posting lists over a job corpus."""
+
+    def __init__(self, taxonomy=None):
+        self.taxonomy = taxonomy or load_taxonomy()
+        self.jobs = []
+        self._exact = {}    # normalized full path -> array of job IDs
+        self._prefix = {}   # normalized path prefix -> array of job IDs
+        self._display = {}  # normalized path -> path as first seen
+
+    @classmethod
+    def from_jobs(cls, jobs, taxonomy=None):
+        index = cls(taxonomy)
+        for job in jobs:
+            index.add(job)
+        return index
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def job_paths(self, job):
+        return job_category_paths(self.taxonomy, job)
+
+    def add(self, job):
+        """Index one job; IDs are assigned in insertion order so postings stay sorted."""
+        job_id = len(self.jobs)
+        self.jobs.append(job)
+        exact_keys = set()
+        prefix_keys = set()
+        for path in self.job_paths(job):
+            key = normalize_path(path)
+            self._display.setdefault(key, path)
+            exact_keys.add(key)
+            parts = key.split(PATH_SEP)
+            for depth in range(1, len(parts) + 1):
+                prefix_keys.add(PATH_SEP.join(parts[:depth]))
+        for key in exact_keys:
+            self._exact.setdefault(key, array('I')).append(job_id)
+        for key in prefix_keys:
+            self._prefix.setdefault(key, array('I')).append(job_id)
+        return job_id
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def exact(self, path):
+        return self._exact.get(normalize_path(path), ())
+
+    def prefix(self, path):
+        """Jobs with any category at or below `path`."""
+        return self._prefix.get(normalize_path(path), ())
+
+    def sector(self, path):
+        return self.prefix(path.split(PATH_SEP)[0])
+
+    def count(self, path):
+        return len(self.prefix(path))
+
+    def paths(self):
+        """Every indexed category path, as first spelled in the data."""
+        return list(self._display.values())
+
+    def query(self, all_of=(), any_of=(), none_of=()):
+        """Boolean combination of prefix postings."""
+        result = intersect(*(self.prefix(p) for p in all_of)) if all_of else None
+        if any_of:
+            either = union(*(self.prefix(p) for p in any_of))
+            result = either if result is None else intersect(result, either)
+        if result is None:
+            result = list(range(len(self.jobs)))
+        if none_of:
+            result = list(iter_difference(result, union(*(self.prefix(p) for p in none_of))))
+        return result
+
+    @timed('category.search')
+    def search(self, category_path, limit=DEFAULT_LIMIT):
+        """Ranked (job_id, score) pairs with the same tiers as searchJobsByCategory.
+
+        Exact path matches score 10, deeper matches under the path score 5 and
+        other jobs in the same sector score 2; ties keep corpus order.
+        """
+        exact = self.exact(category_path)
+        prefix = self.prefix(category_path)
+        sector = self.sector(category_path)
+
+        hits = []
+        for postings, excluded, score in ((exact, (), EXACT_SCORE),
+                                          (prefix, exact, PREFIX_SCORE),
+                                          (sector, prefix, SECTOR_SCORE)):
+            for job_id in iter_difference(postings, excluded):
+                if limit is not None and len(hits) >= limit:
+                    return hits
+                hits.append((job_id, score))
+        return hits
+
+    def search_jobs(self, category_path, limit=DEFAULT_LIMIT):
+        """Like `search` but returns job dicts with `match_score` / `matched_categories`."""
+        key = normalize_path(category_path)
+        results = []
+        for job_id, score in self.search(category_path, limit):
+            job = self.jobs[job_id]
+            matched = [path for path in job.get('climate_categories') or ()
+                       if normalize_path(path) == key or normalize_path(path).startswith(key + PATH_SEP)]
+            results.append({**job, 'match_score': score, 'matched_categories': matched})
+        return results
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    from job_ingest import iter_jobs
+
+    started = time.perf_counter()
+    index = CategoryIndex.from_jobs(iter_jobs('climate_jobs_v6.json'))
+    print(f'✅ Indexed {len(index)} jobs under {len(index.paths())} category paths '
+          f'in {(time.perf_counter() - started) * 1000:.1f} ms')
+    for path in sys.argv[1:]:
+        started = time.perf_counter()
+        hits = index.search(path)
+        print(f'\n🔍 {path}: {index.count(path)} jobs ({(time.perf_counter() - started) * 1e6:.0f} µs)')
+        for job_id, score in hits:
+            job = index.jobs[job_id]
+            print(f"  [{score:>2}] {job['title']} @ {job['company']}")
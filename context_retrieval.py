@@ -0,0 +1,209 @@
+"""
+Query-time taxonomy context retrieval with an LRU/TTL cache.
+
+For every /api/chat message server.js runs `extractKeywords`,
+`retrieveContext`, `detectClimateCategories` and `getRelatedCategories` from
+scratch. `ContextRetriever` does the same work in a single pass: the keyword
+automaton plus a name automaton over every sector, area and leaf name. It
+then caches the resulting bundle under the normalized query. Popular
+questions are served from memory. Entries are keyed on the taxonomy content
+hash, and the cache is dropped when the snapshot on disk changes.
+
+Usage:
+    retriever = ContextRetriever()
+    bundle = retriever.retrieve("How do heat pumps help decarbonize buildings?")
+    bundle.as_dict(), retriever.stats()
+"""
+
+import os
+import re
+import time
+
+from cache import LRUCache
+from keyword_matcher import AhoCorasick, KeywordMatcher
+from metrics import METRICS, timed
+from taxonomy import Imperative, Moonshot, OpportunityArea, Sector, TechCluster, load_taxonomy, normalize_name
+
+DEFAULT_CACHE_SIZE = 2048
+DEFAULT_TTL = 15 * 60
+SNAPSHOT_CHECK_INTERVAL = 5.0
+
+# Same caps as retrieveContext / formatCategoryContext in server.js.
+LIMITS = {
+    'imperatives': 5,
+    'moonshots': 3,
+    'tech_categories': 5,
+    'related_areas': 3,
+}
+
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_query(query):
+    """Cache key form of a query: lowercased, single-spaced, trailing punctuation dropped."""
+    return _SPACES.sub(' ', (query or '').lower()).strip().rstrip('?!. ')
+
+
+class ContextBundle:
+    """Immutable taxonomy context for one query: matched keywords plus tuples of node paths."""
+
+    __slots__ = ('query', 'matched_keywords', 'sectors', 'opportunity_areas', 'imperatives',
+                 'moonshots', 'tech_categories', 'related_areas', 'taxonomy_hash')
+
+    def __init__(self, query, taxonomy_hash, **fields):
+        self.query = query
+        self.taxonomy_hash = taxonomy_hash
+        for name in self.__slots__[1:-1]:
+            setattr(self, name, tuple(fields.get(name, ())))
+
+    @property
+    def is_empty(self):
+        return not (self.sectors or self.opportunity_areas or self.matched_keywords)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ContextRetriever:
+    """Builds and caches ContextBundles over a Taxonomy."""
+
+    def __init__(self, taxonomy=None, cache_size=DEFAULT_CACHE_SIZE, ttl=DEFAULT_TTL,
+                 snapshot_path=None, check_interval=SNAPSHOT_CHECK_INTERVAL, graph=None):
+        self.graph = graph
+        self.cache = LRUCache(cache_size, ttl)
+        METRICS.register_cache('context', self.cache)
+        self.snapshot_path = snapshot_path
+        self.check_interval = check_interval
+        self._last_check = 0.0
+        self._snapshot_mtime = None
+        self.set_taxonomy(taxonomy or load_taxonomy())
+
+    def set_taxonomy(self, taxonomy):
+        """Swap in a taxonomy; the cache is cleared when its content hash differs."""
+        if getattr(self, 'taxonomy', None) is not None and taxonomy.content_hash == self.taxonomy.content_hash:
+            return
+        self.taxonomy = taxonomy
+        if self.graph is not None and self.graph.taxonomy.content_hash != taxonomy.content_hash:
+            self.graph = None  # built for another taxonomy version
+        self.matcher = KeywordMatcher(taxonomy)
+        self.names = AhoCorasick(
+            ((normalize_name(node.name), node) for node in taxonomy.nodes),
+            word_boundary=True,
+        )
+        self.cache.clear()
+
+    # ------------------------------------------------------------------
+    # Snapshot invalidation
+    # ------------------------------------------------------------------
+
+    def check_snapshot(self):
+        """Reload if the snapshot file's content hash changed (checked at most every few seconds).
+
+        A snapshot older than FULL_TAXONOMY.py is ignored, so a stale file
+        never replaces the taxonomy load_taxonomy() built from source.
+        """
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+
+        from taxonomy_snapshot import DEFAULT_PATH, SnapshotError, load_fresh_snapshot, peek_header
+        path = self.snapshot_path or DEFAULT_PATH
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._snapshot_mtime:
+            return False
+        self._snapshot_mtime = mtime
+        try:
+            if peek_header(path)['content_sha256'] == self.taxonomy.content_hash:
+                return False
+            snapshot = load_fresh_snapshot(path)
+        except SnapshotError:
+            return False
+        if snapshot is None:
+            return False  # stale: rebuilt on the next build_snapshot, which changes the mtime
+        self.set_taxonomy(snapshot.taxonomy)
+        return True
+
+    # ------------------------------------------------------------------
+    # Retrieval
+    # ------------------------------------------------------------------
+
+    @timed('context.retrieve')
+    def retrieve(self, query):
+        self.check_snapshot()
+        key = (self.taxonomy.content_hash, normalize_query(query))
+        return self.cache.get_or_compute(key, lambda: self._build(key[1]))
+
+    def stats(self):
+        return {**self.cache.stats.as_dict(), 'size': len(self.cache), 'maxsize': self.cache.maxsize}
+
+    @timed('context.build')
+    def _build(self, normalized):
+        hits = {}  # node id -> hit count
+
+        keywords = self.matcher.matched_keywords(normalized)
+        for leaves in keywords.values():
+            for leaf in leaves:
+                hits[leaf.id] = hits.get(leaf.id, 0) + 1
+        # Names are matched on the punctuation-free form so "food agriculture & nature" still hits.
+        name_patterns = self.names.patterns
+        for _, _, index in self.names.iter_matches(normalize_name(normalized)):
+            node = name_patterns[index][1]
+            hits[node.id] = hits.get(node.id, 0) + 2
+
+        nodes = self.taxonomy.nodes
+        ranked = sorted(hits, key=lambda node_id: (-hits[node_id], node_id))
+
+        sectors, areas = {}, {}
+        by_kind = {Imperative: [], Moonshot: [], TechCluster: []}
+        for node_id in ranked:
+            node = nodes[node_id]
+            if isinstance(node, Sector):
+                sectors.setdefault(node.id, node.path)
+                continue
+            sector = node.sector
+            sectors.setdefault(sector.id, sector.path)
+            area = node.opportunity_area
+            areas.setdefault(area.id, area.path)
+            if type(node) in by_kind:
+                by_kind[type(node)].append(node.path)
+
+        related = []
+        for area_id in areas:
+            # With a TaxonomyGraph, related areas are its precomputed neighbours; otherwise sector siblings.
+            if self.graph is not None:
+                candidates = self.graph.related(nodes[area_id], kind=OpportunityArea.kind_name)
+            else:
+                candidates = self.taxonomy.children(nodes[area_id].parent)
+            for candidate in candidates:
+                if candidate.id not in areas and candidate.path not in related:
+                    related.append(candidate.path)
+
+        return ContextBundle(
+            normalized,
+            self.taxonomy.content_hash,
+            matched_keywords=keywords,
+            sectors=sectors.values(),
+            opportunity_areas=areas.values(),
+            imperatives=by_kind[Imperative][:LIMITS['imperatives']],
+            moonshots=by_kind[Moonshot][:LIMITS['moonshots']],
+            tech_categories=by_kind[TechCluster][:LIMITS['tech_categories']],
+            related_areas=related[:LIMITS['related_areas']],
+        )
+
+
+if __name__ == '__main__':
+    import json
+    import sys
+
+    retriever = ContextRetriever()
+    query = ' '.join(sys.argv[1:]) or 'How do heat pumps and smart thermostats cut building emissions?'
+    for attempt in ('cold', 'warm'):
+        started = time.perf_counter()
+        bundle = retriever.retrieve(query)
+        print(f'{attempt}: {(time.perf_counter() - started) * 1e6:.0f} µs')
+    print(json.dumps(bundle.as_dict(), indent=2, ensure_ascii=False))
+    print(retriever.stats())
@@ -0,0 +1,232 @@
+"""
+Batch job -> taxonomy enrichment (Python port of "Step 6" in integrate-taxonomy.js).
+
+Jobs are read in chunks and fanned out over a process pool. Each worker
+loads the taxonomy snapshot and keyword matcher once, then tags its chunk in
+a single automaton pass per job. Output keeps input order, and every list in
+the `taxonomy` block follows taxonomy order, so runs are reproducible.
+
+Usage:
+    python3 enrich_jobs.py climate_jobs_v6.json -o climate_jobs_enriched.json --workers 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from keyword_matcher import KeywordMatcher
+from metrics import timed
+from taxonomy import Imperative, Moonshot, TechCluster, load_taxonomy
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+def sector_impact_scores(taxonomy):
+    """Share of total 2050 emissions per sector in %, as in integrate-taxonomy.js Step 4."""
+    return {sector.name: round(sector.impact_weight * 100, 1) for sector in taxonomy.sectors}
+
+
+def job_text(job):
+    """Text the enrichment matches against (same fields as the JS pipeline)."""
+    skills = job.get('skills_keywords')
+    if skills is None and isinstance(job.get('skills'), list):
+        skills = ', '.join(job['skills'])
+    work_areas = job.get('work_areas')
+    if work_areas is None and isinstance(job.get('climate_opportunity_areas'), list):
+        work_areas = ', '.join(job['climate_opportunity_areas'])
+    return f"{job.get('title')} {skills} {work_areas} {job.get('company')}"
+
+
+class Enricher:
+    """Builds the `taxonomy` block for one job at a time."""
+
+    def __init__(self, taxonomy=None, word_boundary=True):
+        self.taxonomy = taxonomy or load_taxonomy()
+        self.matcher = KeywordMatcher(self.taxonomy, word_boundary=word_boundary)
+        self._keyword_order = {keyword: i for i, (keyword, _) in enumerate(self.matcher.automaton.patterns)}
+
+    def taxonomy_block(self, text):
+        matched = self.matcher.matched_keywords(text)
+
+        nodes, sector_of = self.taxonomy.nodes, self.taxonomy.sector_of
+        sectors, areas, imperatives, moonshots, clusters = {}, {}, {}, {}, {}
+        for leaves in matched.values():
+            for leaf in leaves:
+                sector_id = sector_of[leaf.id]
+                sectors[sector_id] = nodes[sector_id].name
+                if isinstance(leaf, Imperative):
+                    imperatives[leaf.id] = leaf.name
+                elif isinstance(leaf, Moonshot):
+                    moonshots[leaf.id] = leaf.name
+                elif isinstance(leaf, TechCluster):
+                    clusters[leaf.id] = leaf.name
+                    # Tech-category hits carry no opportunity area in the JS pipeline.
+                    continue
+                areas[leaf.parent.id] = leaf.parent.name
+
+        sector_names = _ordered_unique(sectors)
+        leaf_ids = [leaf.id for leaves in matched.values() for leaf in leaves]
+        impact = round(self.taxonomy.impact_score(leaf_ids), 1)
+
+        return {
+            'matched_keywords': sorted(matched, key=self._keyword_order.__getitem__),
+            'sectors': sector_names,
+            'opportunity_areas': _ordered_unique(areas),
+            'innovation_imperatives': _ordered_unique(imperatives),
+            'moonshots': _ordered_unique(moonshots),
+            'tech_categories': _ordered_unique(clusters),
+            'impact_score': impact,
+            'emissions_category': sector_names[0] if sector_names else None,
+        }
+
+    @timed('enrich.job')
+    def enrich(self, job):
+        enriched = dict(job)
+        enriched['taxonomy'] = self.taxonomy_block(job_text(job))
+        return enriched
+
+
+def _ordered_unique(names_by_id):
+    """Names ordered by node id; distinct nodes may share a name (e.g. "Design Optimization")."""
+    seen = {}
+    for node_id in sorted(names_by_id):
+        seen.setdefault(names_by_id[node_id], None)
+    return list(seen)
+
+
+# ============================================================================
+# Process pool
+# ============================================================================
+
+_worker_enricher = None
+
+
+def _init_worker(word_boundary):
+    global _worker_enricher
+    _worker_enricher = Enricher(word_boundary=word_boundary)
+
+
+def _enrich_chunk(chunk):
+    return [_worker_enricher.enrich(job) for job in chunk]
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class EnrichStats:
+    """Throughput counters for one enrichment run."""
+
+    __slots__ = ('jobs', 'matched', 'chunks', 'workers', 'started', 'elapsed')
+
+    def __init__(self, workers):
+        self.jobs = 0
+        self.matched = 0
+        self.chunks = 0
+        self.workers = workers
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add(self, chunk):
+        self.chunks += 1
+        self.jobs += len(chunk)
+        self.matched += sum(1 for job in chunk if job['taxonomy']['sectors'])
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def jobs_per_sec(self):
+        return self.jobs / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def coverage_percent(self):
+        return self.matched / self.jobs * 100 if self.jobs else 0.0
+
+    def as_dict(self):
+        return {
+            'jobs': self.jobs,
+            'matched': self.matched,
+            'chunks': self.chunks,
+            'workers': self.workers,
+            'seconds': round(self.elapsed, 4),
+            'jobs_per_sec': round(self.jobs_per_sec, 1),
+            'coverage_percent': round(self.coverage_percent, 1),
+        }
+
+
+def iter_enriched(jobs, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, word_boundary=True, stats=None):
+    """Yield enriched jobs in input order.
+
+    `jobs` may be any iterable (including a generator); at most two chunks per
+    worker are in flight, so memory stays bounded for large inputs.
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = stats if stats is not None else EnrichStats(workers)
+
+    if workers <= 1:
+        enricher = Enricher(word_boundary=word_boundary)
+        for chunk in chunked(jobs, chunk_size):
+            enriched = [enricher.enrich(job) for job in chunk]
+            stats.add(enriched)
+            yield from enriched
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(word_boundary,)) as pool:
+        pending = deque()
+        for chunk in chunked(jobs, chunk_size):
+            pending.append(pool.submit(_enrich_chunk, chunk))
+            if len(pending) >= workers * 2:
+                enriched = pending.popleft().result()
+                stats.add(enriched)
+                yield from enriched
+        while pending:
+            enriched = pending.popleft().result()
+            stats.add(enriched)
+            yield from enriched
+
+
+def enrich_jobs(jobs, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, word_boundary=True):
+    """Enrich every job; returns (enriched_jobs, EnrichStats)."""
+    stats = EnrichStats(workers or os.cpu_count() or 1)
+    enriched = list(iter_enriched(jobs, workers, chunk_size, word_boundary, stats))
+    return enriched, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Enrich jobs with CLIMATE_TAXONOMY tags.')
+    parser.add_argument('input', nargs='?', default='climate_jobs_v6.json',
+                        help='.json, .jsonl or .csv job file')
+    parser.add_argument('-o', '--output', default='climate_jobs_enriched.json')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--substring', action='store_true',
+                        help='plain substring matching like integrate-taxonomy.js (no word boundaries)')
+    args = parser.parse_args(argv)
+
+    from job_ingest import iter_jobs
+
+    print(f'🎯 Enriching jobs from {args.input}...', file=sys.stderr)
+    enriched, stats = enrich_jobs(iter_jobs(args.input), args.workers, args.chunk_size,
+                                  word_boundary=not args.substring)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'jobs': enriched, 'metadata': {'enrichment': stats.as_dict()}}, f, indent=2, ensure_ascii=False)
+
+    print(f'✅ Enriched {stats.matched}/{stats.jobs} jobs ({stats.coverage_percent:.1f}%) '
+          f'in {stats.elapsed:.2f}s — {stats.jobs_per_sec:,.0f} jobs/sec on {stats.workers} worker(s)',
+          file=sys.stderr)
+    print(f'✅ Saved to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
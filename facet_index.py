@@ -0,0 +1,310 @@
+"""
+Bitmap facet engine: live job counts for every facet under any filter.
+
+`climate-category-taxonomy.json` stores a static `jobCount` per category
+that goes stale, and drilling down means rescanning the corpus. Here each
+facet value has a compressed bitmap over job ids:
+
+    node             every CLIMATE_TAXONOMY node (declared categories and
+                     imperatives with their ancestors, plus moonshots / tech
+                     clusters matched from job text)
+    readiness        Commercial / Pilot / Lab, from matched tech clusters
+    experience_level, salary_type, salary_bucket, location
+
+A filter is {dimension: [values]}: values within a dimension are OR-ed and
+dimensions are AND-ed. Counts are popcounts of the intersection. `counts()`
+gives every facet's live counts in one call, and a dimension's own selection
+is left out of its own counts (standard multi-select drill-down).
+
+Bitmaps are roaring-style: 65536-id chunks held as Python ints, with empty
+chunks absent. Sparse leaves stay small and AND / popcount run in C.
+
+Usage:
+    facets = FacetIndex.from_jobs(iter_jobs('climate_jobs_v6.json'))
+    facets.count({'node': ['Electricity'], 'experience_level': ['Entry-Level']})
+    facets.counts({'salary_bucket': ['100k-150k']})
+"""
+
+import argparse
+import json
+import sys
+
+from category_index import job_category_paths
+from enrich_jobs import job_text
+from keyword_matcher import KeywordMatcher
+from metrics import timed
+from salary_index import salary_midpoint
+from taxonomy import Moonshot, TechCluster, load_taxonomy, normalize_name
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+_CHUNK_MASK = CHUNK_SIZE - 1
+
+# (label, lower bound inclusive) in annual USD; the last bucket is open-ended.
+SALARY_BUCKETS = (
+    ('<50k', 0),
+    ('50k-75k', 50000),
+    ('75k-100k', 75000),
+    ('100k-150k', 100000),
+    ('150k-200k', 150000),
+    ('200k+', 200000),
+)
+UNKNOWN = 'Unknown'
+
+DIMENSIONS = ('node', 'readiness', 'experience_level', 'salary_type', 'salary_bucket', 'location')
+
+
+# ============================================================================
+# Compressed bitmap
+# ============================================================================
+
+class Bitmap:
+    """Set of non-negative ints as {chunk index: int bitset}."""
+
+    __slots__ = ('chunks',)
+
+    def __init__(self, chunks=None):
+        self.chunks = chunks or {}
+
+    @classmethod
+    def from_sorted(cls, ids):
+        """Build from ascending ids in one pass (no per-id big-int copies)."""
+        chunks = {}
+        current, buffer = None, None
+        for i in ids:
+            chunk = i >> CHUNK_BITS
+            if chunk != current:
+                if buffer is not None:
+                    chunks[current] = int.from_bytes(buffer, 'little')
+                current, buffer = chunk, bytearray(CHUNK_SIZE // 8)
+            offset = i & _CHUNK_MASK
+            buffer[offset >> 3] |= 1 << (offset & 7)
+        if buffer is not None:
+            chunks[current] = int.from_bytes(buffer, 'little')
+        return cls(chunks)
+
+    @classmethod
+    def full(cls, n):
+        chunks = {}
+        for chunk in range((n + CHUNK_SIZE - 1) >> CHUNK_BITS):
+            width = min(CHUNK_SIZE, n - (chunk << CHUNK_BITS))
+            chunks[chunk] = (1 << width) - 1
+        return cls(chunks)
+
+    def __and__(self, other):
+        small, large = (self.chunks, other.chunks) if len(self.chunks) <= len(other.chunks) \
+            else (other.chunks, self.chunks)
+        chunks = {}
+        for key, bits in small.items():
+            both = bits & large.get(key, 0)
+            if both:
+                chunks[key] = both
+        return Bitmap(chunks)
+
+    def __or__(self, other):
+        chunks = dict(self.chunks)
+        for key, bits in other.chunks.items():
+            chunks[key] = chunks.get(key, 0) | bits
+        return Bitmap(chunks)
+
+    def __len__(self):
+        return sum(bits.bit_count() for bits in self.chunks.values())
+
+    def __bool__(self):
+        return bool(self.chunks)
+
+    def __contains__(self, i):
+        return bool(self.chunks.get(i >> CHUNK_BITS, 0) >> (i & _CHUNK_MASK) & 1)
+
+    def __iter__(self):
+        for key in sorted(self.chunks):
+            bits, base = self.chunks[key], key << CHUNK_BITS
+            while bits:
+                low = bits & -bits
+                yield base + low.bit_length() - 1
+                bits ^= low
+
+    def nbytes(self):
+        return sum((bits.bit_length() + 7) // 8 for bits in self.chunks.values())
+
+
+def intersect_count(a, b):
+    """len(a & b) without materializing the intersection."""
+    small, large = (a.chunks, b.chunks) if len(a.chunks) <= len(b.chunks) else (b.chunks, a.chunks)
+    return sum((bits & large.get(key, 0)).bit_count() for key, bits in small.items())
+
+
+# ============================================================================
+# Facet values per job
+# ============================================================================
+
+def salary_bucket(job):
+    amount = salary_midpoint(job)
+    if amount is None:
+        return UNKNOWN
+    label = SALARY_BUCKETS[0][0]
+    for name, lower in SALARY_BUCKETS:
+        if amount >= lower:
+            label = name
+    return label
+
+
+class FacetIndex:
+    def __init__(self, taxonomy=None, match_keywords=True):
+        self.taxonomy = taxonomy or load_taxonomy()
+        self.matcher = KeywordMatcher(self.taxonomy) if match_keywords else None
+        self.size = 0
+        self.bitmaps = {dimension: {} for dimension in DIMENSIONS}  # dimension -> value key -> Bitmap
+        self.labels = {dimension: {} for dimension in DIMENSIONS}   # dimension -> value key -> display
+        self._all = Bitmap()
+
+    @classmethod
+    def from_jobs(cls, jobs, taxonomy=None, match_keywords=True):
+        index = cls(taxonomy, match_keywords)
+        index.build(jobs)
+        return index
+
+    def _key(self, dimension, value):
+        if dimension == 'node':
+            node = self.taxonomy.node(value) if isinstance(value, str) else value
+            return node.id if node is not None else None
+        return normalize_name(str(value))
+
+    def job_values(self, job):
+        """{dimension: {key: display}} for one job."""
+        taxonomy = self.taxonomy
+        nodes = {}
+        for path in job_category_paths(taxonomy, job):
+            node = taxonomy.node(path)
+            if node is not None:
+                nodes[node.id] = node
+        for node in list(nodes.values()):
+            for ancestor in node.ancestors():
+                nodes[ancestor.id] = ancestor
+        # Text-matched leaves only count for themselves: generic keywords would
+        # otherwise inflate every sector and area count.
+        readiness = {}
+        if self.matcher is not None:
+            for leaf in self.matcher.matched_nodes(job_text(job)):
+                if isinstance(leaf, (Moonshot, TechCluster)):
+                    nodes[leaf.id] = leaf
+                if isinstance(leaf, TechCluster) and leaf.readiness:
+                    readiness[normalize_name(leaf.readiness)] = leaf.readiness
+
+        values = {
+            'node': {node_id: node.path for node_id, node in nodes.items()},
+            'readiness': readiness,
+        }
+        for dimension, value in (
+            ('experience_level', job.get('experience_level')),
+            ('salary_type', job.get('salary_type')),
+            ('salary_bucket', salary_bucket(job)),
+            ('location', (job.get('location') or '').strip()),
+        ):
+            value = value or UNKNOWN
+            values[dimension] = {normalize_name(value): value}
+        return values
+
+    def build(self, jobs):
+        postings = {dimension: {} for dimension in DIMENSIONS}
+        for job in jobs:
+            job_id = self.size
+            self.size += 1
+            for dimension, values in self.job_values(job).items():
+                labels = self.labels[dimension]
+                for key, display in values.items():
+                    labels.setdefault(key, display)
+                    postings[dimension].setdefault(key, []).append(job_id)
+        for dimension, by_key in postings.items():
+            for key, ids in by_key.items():
+                self.bitmaps[dimension][key] = Bitmap.from_sorted(ids)
+        self._all = Bitmap.full(self.size)
+        return self
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _dimension_bitmap(self, dimension, values):
+        if dimension not in self.bitmaps:
+            raise KeyError(f'unknown facet dimension {dimension!r}; expected one of {DIMENSIONS}')
+        result = Bitmap()
+        for value in values:
+            bitmap = self.bitmaps[dimension].get(self._key(dimension, value))
+            if bitmap is not None:
+                result = result | bitmap
+        return result
+
+    def select(self, filters=None, exclude=None):
+        """Bitmap of jobs matching `filters` ({dimension: [values]}), ignoring dimension `exclude`."""
+        result = self._all
+        for dimension, values in (filters or {}).items():
+            if dimension == exclude or not values:
+                continue
+            if isinstance(values, str):
+                values = (values,)
+            result = result & self._dimension_bitmap(dimension, values)
+        return result
+
+    @timed('facets.count')
+    def count(self, filters=None):
+        return len(self.select(filters))
+
+    def job_ids(self, filters=None, limit=None):
+        ids = iter(self.select(filters))
+        return [i for _, i in zip(range(limit), ids)] if limit is not None else list(ids)
+
+    @timed('facets.counts')
+    def counts(self, filters=None, dimensions=DIMENSIONS, min_count=1):
+        """{dimension: {display value: count}} for every facet value, best first."""
+        filters = filters or {}
+        result = {}
+        for dimension in dimensions:
+            base = self.select(filters, exclude=dimension)
+            labels = self.labels[dimension]
+            counts = {}
+            for key, bitmap in self.bitmaps[dimension].items():
+                n = intersect_count(base, bitmap)
+                if n >= min_count:
+                    counts[labels[key]] = n
+            result[dimension] = dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+        return result
+
+    def node_count(self, path, filters=None):
+        """Live replacement for a category's static `jobCount`."""
+        return self.count({**(filters or {}), 'node': [path]})
+
+    def nbytes(self):
+        return sum(bitmap.nbytes() for by_key in self.bitmaps.values() for bitmap in by_key.values())
+
+
+def main(argv=None):
+    from job_ingest import iter_jobs
+
+    parser = argparse.ArgumentParser(description='Live facet counts over the job corpus.')
+    parser.add_argument('input', nargs='?', default='climate_jobs_v6.json')
+    parser.add_argument('--filter', action='append', default=[], metavar='DIMENSION=VALUE',
+                        help='repeatable; values of one dimension are OR-ed, dimensions AND-ed')
+    parser.add_argument('--no-keywords', action='store_true', help='skip text matching for tech clusters')
+    parser.add_argument('-o', '--output', default=None, help='write counts JSON here instead of stdout')
+    args = parser.parse_args(argv)
+
+    filters = {}
+    for item in args.filter:
+        dimension, _, value = item.partition('=')
+        filters.setdefault(dimension, []).append(value)
+
+    facets = FacetIndex.from_jobs(iter_jobs(args.input), match_keywords=not args.no_keywords)
+    counts = {'filters': filters, 'total': facets.count(filters), 'facets': facets.counts(filters)}
+    text = json.dumps(counts, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    print(f'✅ {facets.size} jobs, {counts["total"]} match, {facets.nbytes() / 1024:.0f} KB of bitmaps',
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Typo-tolerant lookup over the taxonomy vocabulary (symmetric delete).
+
+"perovskit", "geotermal" and "electrolyser" miss every exact-substring
+matcher, so the chat falls back to generic context. `FuzzyLookup`
+precomputes, for every vocabulary word, all strings reachable by deleting
+up to `max_distance` characters from its first `prefix_length` characters.
+It does this for every word in CLIMATE_TAXONOMY names and keywords, plus the
+skills listed in the job corpus.
+
+At query time the same deletes of the typed token are looked up in that
+dictionary. Only the few words that share a delete are verified with a
+bounded edit distance, so no query is ever compared against the whole
+vocabulary. The work per token depends on its length and the distance, not
+on the vocabulary size (SymSpell).
+
+Usage:
+    fuzzy = FuzzyLookup.from_sources(jobs=iter_jobs('climate_jobs_v6.json'))
+    fuzzy.lookup('geotermal')        # [Suggestion('geothermal', 1, ...)]
+    fuzzy.correct('perovskit solar jobs')
+    python3 fuzzy_lookup.py perovskit geotermal electrolyser
+"""
+
+import argparse
+import sys
+
+from metrics import timed
+from taxonomy import load_taxonomy, normalize_name
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+# Tokens shorter than this are never corrected: "ev" -> "eu" does more harm than good.
+MIN_WORD_LENGTH = 4
+# Vocabulary words found in taxonomy text outweigh words only seen in job skills.
+TAXONOMY_COUNT = 10
+# `correct` leaves words shorter than this alone ("good" is not a typo of "food"),
+# and allows two edits only from TWO_EDIT_LENGTH on.
+MIN_CORRECT_LENGTH = 5
+TWO_EDIT_LENGTH = 9
+
+
+class Suggestion:
+    __slots__ = ('term', 'distance', 'count')
+
+    def __init__(self, term, distance, count):
+        self.term = term
+        self.distance = distance
+        self.count = count
+
+    def __repr__(self):
+        return f'Suggestion({self.term!r}, {self.distance}, {self.count})'
+
+
+def edit_distance(a, b, limit):
+    """Optimal-string-alignment distance (adjacent transpositions count 1), or limit + 1 once exceeded.
+
+    Shared prefixes and suffixes are trimmed first and only the diagonal band
+    of width 2 * limit + 1 is filled, so a candidate check costs O(limit * len).
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    while a and a[-1] == b[-1]:
+        a, b = a[:-1], b[:-1]
+    start = 0
+    while start < len(a) and a[start] == b[start]:
+        start += 1
+    a, b = a[start:], b[start:]
+    n, m = len(a), len(b)
+    if m - n > limit:
+        return limit + 1
+    if not n:
+        return m
+    beyond = limit + 1
+    previous2 = None
+    previous = [j if j <= limit else beyond for j in range(m + 1)]
+    for i in range(1, n + 1):
+        ca = a[i - 1]
+        current = [beyond] * (m + 1)
+        current[0] = i if i <= limit else beyond
+        low = current[0]
+        for j in range(max(1, i - limit), min(m, i + limit) + 1):
+            cb = b[j - 1]
+            value = previous[j - 1] if ca == cb else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb and previous2[j - 2] + 1 < value:
+                value = previous2[j - 2] + 1
+            current[j] = value if value < beyond else beyond
+            if value < low:
+                low = value
+        if low > limit:
+            return beyond
+        previous2, previous = previous, current
+    return previous[m] if previous[m] <= limit else beyond
+
+
+def deletes(word, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+    """Every string reachable from word[:prefix_length] by deleting up to `max_distance` characters."""
+    word = word[:prefix_length]
+    found = {word}
+    frontier = [word]
+    for _ in range(max_distance):
+        following = []
+        for item in frontier:
+            if len(item) <= 1:
+                continue
+            for i in range(len(item)):
+                candidate = item[:i] + item[i + 1:]
+                if candidate not in found:
+                    found.add(candidate)
+                    following.append(candidate)
+        frontier = following
+    return found
+
+
+class FuzzyLookup:
+    """Symmetric-delete dictionary over a word -> count vocabulary."""
+
+    def __init__(self, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words = {}      # word -> count
+        self._deletes = {}   # delete -> [word]
+
+    @classmethod
+    def from_sources(cls, taxonomy=None, jobs=(), max_distance=MAX_DISTANCE):
+        """Vocabulary from taxonomy names and keywords plus each job's `skills` / `skills_keywords`."""
+        fuzzy = cls(max_distance)
+        taxonomy = taxonomy or load_taxonomy()
+        for node in taxonomy.nodes:
+            for text in (node.name,) + node.keywords:
+                for word in normalize_name(text).split():
+                    fuzzy.add(word, TAXONOMY_COUNT)
+        for job in jobs:
+            skills = list(job.get('skills') or ())
+            skills.append(job.get('skills_keywords') or '')
+            for skill in skills:
+                for word in normalize_name(str(skill)).split():
+                    fuzzy.add(word)
+        return fuzzy
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.words
+
+    def add(self, word, count=1):
+        if len(word) < MIN_WORD_LENGTH or word.isdigit():
+            return
+        if word in self.words:
+            self.words[word] += count
+            return
+        self.words[word] = count
+        for item in deletes(word, self.max_distance, self.prefix_length):
+            self._deletes.setdefault(item, []).append(word)
+
+    @timed('fuzzy.lookup')
+    def lookup(self, token, max_distance=None, limit=5):
+        """Vocabulary words within `max_distance` edits of `token`: closest first, then most frequent."""
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        token = normalize_name(token).replace(' ', '')
+        if token in self.words:
+            return [Suggestion(token, 0, self.words[token])]
+        if len(token) < MIN_WORD_LENGTH:
+            return []
+        found = {}
+        for item in deletes(token, max_distance, self.prefix_length):
+            for word in self._deletes.get(item, ()):
+                if word in found:
+                    continue
+                distance = edit_distance(token, word, max_distance)
+                if distance <= max_distance:
+                    found[word] = distance
+        ranked = sorted(found.items(), key=lambda item: (item[1], -self.words[item[0]], item[0]))
+        return [Suggestion(word, distance, self.words[word]) for word, distance in ranked[:limit]]
+
+    def correct(self, text, known=()):
+        """(corrected text, {typo: correction}).
+
+        Vocabulary words, words in `known` (e.g. intent phrase words) and
+        short words are left alone. Words under TWO_EDIT_LENGTH characters
+        get at most one edit, so everyday words are not bent into jargon.
+        """
+        corrections = {}
+        words = normalize_name(text).split()
+        for i, word in enumerate(words):
+            if word in self.words or word in known or len(word) < MIN_CORRECT_LENGTH or word.isdigit():
+                continue
+            suggestions = self.lookup(word, 1 if len(word) < TWO_EDIT_LENGTH else 2, limit=1)
+            if suggestions:
+                corrections[word] = words[i] = suggestions[0].term
+        return ' '.join(words), corrections
+
+
+def main(argv=None):
+    from job_ingest import iter_jobs
+
+    parser = argparse.ArgumentParser(description='Typo-tolerant lookup over taxonomy and skill vocabulary.')
+    parser.add_argument('tokens', nargs='+')
+    parser.add_argument('--input', default='climate_jobs_v6.json', help='job corpus for skill vocabulary')
+    parser.add_argument('--max-distance', type=int, default=MAX_DISTANCE)
+    args = parser.parse_args(argv)
+
+    fuzzy = FuzzyLookup.from_sources(jobs=iter_jobs(args.input), max_distance=args.max_distance)
+    print(f'✅ {len(fuzzy):,} words, {len(fuzzy._deletes):,} deletes', file=sys.stderr)
+    for token in args.tokens:
+        suggestions = fuzzy.lookup(token)
+        shown = ', '.join(f'{s.term} (d={s.distance})' for s in suggestions) or 'no match'
+        print(f'🔍 {token}: {shown}')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,9 +3,9 @@ const { execSync } = require('child_process');
 
 console.log('🌍 Integrating Climate Taxonomy...\n');
 
-// Step 1: Extract full taxonomy from Python file
+// Step 1: Extract full taxonomy (from the precompiled snapshot; rebuilt if FULL_TAXONOMY.py changed)
 console.log('📊 Extracting taxonomy from FULL_TAXONOMY.py...');
-const taxonomyJson = execSync('python3 -c "import sys; sys.path.append(\'.\'); from FULL_TAXONOMY import CLIMATE_TAXONOMY; import json; print(json.dumps(CLIMATE_TAXONOMY, indent=2))"', {
+const taxonomyJson = execSync('python3 taxonomy_snapshot.py --json', {
   encoding: 'utf-8',
   maxBuffer: 50 * 1024 * 1024 // 50MB buffer
 });
@@ -0,0 +1,197 @@
+"""
+MinHash / LSH near-duplicate detection for scraped job postings.
+
+The Greenhouse, Ashby and Lever scrapers often return the same role several
+times with small wording changes (a new location suffix, a reordered skills
+list). This stage runs before taxonomy enrichment. Each job's title,
+requirements and skills are shingled into word 3-grams and reduced to a
+MinHash signature. LSH banding then finds candidate duplicates through hash
+buckets, so the whole pass stays roughly linear in the number of jobs.
+
+The pass streams: the first posting seen in a cluster is canonical and is
+passed through. Later near-duplicates (estimated Jaccard >= threshold, same
+company by default) are dropped and recorded in the duplicate map.
+
+Usage:
+    python3 job_dedup.py climate_jobs_v6.json -o climate_jobs_dedup.json --map duplicates.json
+    python3 job_ingest.py climate_jobs_v6.csv --dedup
+"""
+
+import argparse
+import json
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from job_ingest import job_key
+from taxonomy import normalize_name
+
+NUM_PERM = 128
+BANDS = 16              # 16 bands x 8 rows: pairs above ~0.7 Jaccard almost always collide
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+SEED = 1
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_LOW_29 = np.uint64((1 << 29) - 1)
+
+
+def shingle_text(job):
+    skills = job.get('skills_keywords') or ', '.join(job.get('skills') or ())
+    return ' '.join(str(part) for part in (
+        job.get('title') or '', job.get('requirements_and_qualifications') or '', skills,
+    ))
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """crc32 hashes of the word `size`-grams of `text` (the whole text if shorter)."""
+    tokens = normalize_name(text).split()
+    if len(tokens) <= size:
+        return {zlib.crc32(' '.join(tokens).encode('utf-8'))} if tokens else set()
+    return {zlib.crc32(' '.join(tokens[i:i + size]).encode('utf-8'))
+            for i in range(len(tokens) - size + 1)}
+
+
+def mulmod_mersenne(a, x):
+    """outer(a, x) mod 2^61-1 without uint64 overflow, for a < 2^32 and any uint64 x.
+
+    x is split into 32-bit halves; the high product is shifted by 2^32 using
+    2^61 = 1 (mod 2^61-1), so no intermediate exceeds 2^62.
+    """
+    x = x % _MERSENNE
+    low = np.outer(a, x & _MAX_HASH) % _MERSENNE
+    high = np.outer(a, x >> np.uint64(32))  # < 2^61
+    high = ((high >> np.uint64(29)) + ((high & _LOW_29) << np.uint64(32))) % _MERSENNE
+    return (low + high) % _MERSENNE
+
+
+class MinHasher:
+    """NUM_PERM universal hash functions (a*x + b) mod 2^61-1, truncated to 32 bits."""
+
+    def __init__(self, num_perm=NUM_PERM, seed=SEED):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        if not hashes:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        permuted = (mulmod_mersenne(self.a, values) + self.b[:, None]) % _MERSENNE & _MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class Deduplicator:
+    """Streaming near-duplicate filter.
+
+    `check(job)` returns None for a new canonical posting, or the index of
+    the canonical posting it duplicates.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, bands=BANDS,
+                 same_company=True, seed=SEED):
+        if num_perm % bands:
+            raise ValueError('num_perm must be a multiple of bands')
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.same_company = same_company
+        self.hasher = MinHasher(num_perm, seed)
+        self.signatures = []   # canonical index -> signature
+        self.companies = []    # canonical index -> normalized company
+        self.keys = []         # canonical index -> job_key
+        self.duplicates = {}   # duplicate job_key -> canonical job_key
+        self._buckets = [{} for _ in range(bands)]
+        self.seen = 0
+
+    def check(self, job):
+        self.seen += 1
+        signature = self.hasher.signature(shingles(shingle_text(job)))
+        company = normalize_name(job.get('company') or '')
+        band_keys = [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+        best, best_score = None, self.threshold
+        tried = set()
+        for bucket, band_key in zip(self._buckets, band_keys):
+            for candidate in bucket.get(band_key, ()):
+                if candidate in tried:
+                    continue
+                tried.add(candidate)
+                if self.same_company and self.companies[candidate] != company:
+                    continue
+                score = similarity(signature, self.signatures[candidate])
+                if score >= best_score:
+                    best, best_score = candidate, score
+
+        if best is not None:
+            self.duplicates[job_key(job)] = self.keys[best]
+            return best
+
+        index = len(self.signatures)
+        self.signatures.append(signature)
+        self.companies.append(company)
+        self.keys.append(job_key(job))
+        for bucket, band_key in zip(self._buckets, band_keys):
+            bucket.setdefault(band_key, []).append(index)
+        return None
+
+    def iter_unique(self, jobs):
+        """Yield only canonical jobs, in input order."""
+        for job in jobs:
+            if self.check(job) is None:
+                yield job
+
+    def clusters(self):
+        """{canonical job_key: [duplicate job_keys]} for every cluster with duplicates."""
+        grouped = {}
+        for duplicate, canonical in self.duplicates.items():
+            grouped.setdefault(canonical, []).append(duplicate)
+        return grouped
+
+    def summary(self):
+        return {
+            'seen': self.seen,
+            'canonical': len(self.signatures),
+            'duplicates': len(self.duplicates),
+            'clusters': len(self.clusters()),
+            'threshold': self.threshold,
+        }
+
+
+def main(argv=None):
+    from job_ingest import iter_jobs
+
+    parser = argparse.ArgumentParser(description='Drop near-duplicate job postings (MinHash + LSH).')
+    parser.add_argument('input', nargs='?', default='climate_jobs_v6.json')
+    parser.add_argument('-o', '--output', default='climate_jobs_dedup.json')
+    parser.add_argument('--map', default=None, help='write {canonical: [duplicates]} JSON here')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--any-company', action='store_true', help='also merge postings across companies')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    dedup = Deduplicator(args.threshold, same_company=not args.any_company)
+    unique = list(dedup.iter_unique(iter_jobs(args.input)))
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'jobs': unique, 'metadata': {'dedup': dedup.summary()}}, f, indent=2, ensure_ascii=False)
+    if args.map:
+        with open(args.map, 'w', encoding='utf-8') as f:
+            json.dump(dedup.clusters(), f, indent=2, ensure_ascii=False)
+
+    summary = dedup.summary()
+    print(f"✅ {summary['seen']} jobs -> {summary['canonical']} canonical, "
+          f"{summary['duplicates']} duplicates in {summary['clusters']} clusters "
+          f'({time.perf_counter() - started:.2f}s)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
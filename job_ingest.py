@@ -0,0 +1,256 @@
+"""
+Streaming job ingestion: CSV / JSONL -> enriched, sharded JSONL.
+
+`server.js` and `convert_csv_to_json.js` read the entire corpus into memory.
+Here rows are yielded one at a time, normalized to the climate_jobs_v6.json
+schema, enriched against the taxonomy on the fly (see enrich_jobs.py) and
+written to fixed-size JSONL shards, so memory stays flat as the corpus grows.
+
+Usage:
+    python3 job_ingest.py climate_jobs_v6.csv --out-dir job_shards --shard-size 5000
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from enrich_jobs import DEFAULT_CHUNK_SIZE, EnrichStats, iter_enriched
+from salary_index import with_annual_salary
+from taxonomy import PATH_SEP, load_taxonomy, normalize_name
+
+LIST_FIELDS = ('climate_sectors', 'climate_opportunity_areas', 'climate_innovation_imperatives',
+               'applicable_majors', 'skills')
+NUMBER_FIELDS = ('salary_min', 'salary_max')
+NULL_VALUES = ('', 'null', 'None')
+
+DEFAULT_SHARD_SIZE = 10000
+
+
+# ============================================================================
+# Row normalization (mirrors convert_csv_to_json.js)
+# ============================================================================
+
+def _known_sector_keys():
+    keys = {normalize_name(sector.name) for sector in load_taxonomy().sectors}
+    # Spellings used by the scrapers that differ beyond punctuation.
+    keys.add(normalize_name('Food, Agriculture & Nature'))
+    return keys
+
+
+_SECTOR_KEYS = None
+
+
+def split_sectors(value):
+    """Split a comma-joined sector list without breaking "Food, Agriculture, & Nature".
+
+    convert_csv_to_json.js splits on every comma, which turns that sector into
+    three bogus ones. Consecutive pieces are re-joined whenever together they
+    spell a known taxonomy sector.
+    """
+    global _SECTOR_KEYS
+    if _SECTOR_KEYS is None:
+        _SECTOR_KEYS = _known_sector_keys()
+
+    parts = [part.strip() for part in value.split(',') if part.strip()]
+    sectors = []
+    i = 0
+    while i < len(parts):
+        for j in range(len(parts), i, -1):
+            candidate = ', '.join(parts[i:j])
+            if j == i + 1 or normalize_name(candidate) in _SECTOR_KEYS:
+                sectors.append(candidate)
+                i = j
+                break
+    return sectors
+
+
+def job_key(job):
+    """Stable identity for a posting: its URL, else title + company + location."""
+    return job.get('url') or '|'.join(str(job.get(f) or '') for f in ('title', 'company', 'location'))
+
+
+def normalize_row(row):
+    """One CSV row (dict of strings) -> job dict in the v6 JSON schema."""
+    job = {}
+    for field, value in row.items():
+        if field is None:
+            continue
+        value = value.strip() if isinstance(value, str) else value
+        if value in NULL_VALUES:
+            value = None
+        if field in NUMBER_FIELDS:
+            try:
+                value = float(value) if value else None
+            except ValueError:
+                value = None
+        elif field == 'climate_sectors':
+            value = split_sectors(value) if value else []
+        elif field in LIST_FIELDS:
+            value = [v.strip() for v in value.split(',') if v.strip()] if value else []
+        job[field] = value
+
+    sectors = job.get('climate_sectors') or []
+    areas = job.get('climate_opportunity_areas') or []
+    job['climate_categories'] = [
+        f'{sector}{PATH_SEP}{area}' for sector in sectors for area in areas
+    ] if areas else list(sectors)
+    job['skills_keywords'] = ', '.join(job.get('skills') or [])
+    job['work_areas'] = ', '.join(areas)
+    return job
+
+
+# ============================================================================
+# Readers
+# ============================================================================
+
+def iter_csv_jobs(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield normalize_row(row)
+
+
+def iter_jsonl_jobs(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_json_jobs(path):
+    """Legacy `{"jobs": [...]}` files. JSON has no row framing, so this one loads the whole file."""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    yield from (data['jobs'] if isinstance(data, dict) else data)
+
+
+def iter_jobs(path):
+    """Yield jobs from a .csv, .jsonl/.ndjson or .json file, a directory of JSONL shards or a job store."""
+    if os.path.isdir(path):
+        if os.path.isfile(os.path.join(path, 'store.json')):
+            from job_store import JobStore
+            store = JobStore.open(path)
+            if not store.is_fresh():
+                print(f'⚠️  {path} was built for another taxonomy version; rebuild it with job_store.py',
+                      file=sys.stderr)
+            yield from store
+            return
+        manifest_path = os.path.join(path, 'manifest.json')
+        if os.path.isfile(manifest_path):
+            # Only the shards of the last write_shards run, never leftovers from a bigger earlier one.
+            with open(manifest_path, encoding='utf-8') as f:
+                names = [shard['file'] for shard in json.load(f)['shards']]
+        else:
+            names = sorted(name for name in os.listdir(path) if name.endswith('.jsonl'))
+        for name in names:
+            yield from iter_jsonl_jobs(os.path.join(path, name))
+        return
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        yield from iter_csv_jobs(path)
+    elif ext in ('.jsonl', '.ndjson'):
+        yield from iter_jsonl_jobs(path)
+    else:
+        yield from iter_json_jobs(path)
+
+
+# ============================================================================
+# Sharded writer
+# ============================================================================
+
+def write_shards(jobs, out_dir, shard_size=DEFAULT_SHARD_SIZE, prefix='jobs'):
+    """Write jobs to `{prefix}-00000.jsonl`, ... plus a manifest.json; returns the manifest.
+
+    Shards left in `out_dir` by an earlier, larger run are deleted.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    shards = []
+    sectors = {}
+    total = 0
+    f = None
+
+    try:
+        for job in jobs:
+            if total % shard_size == 0:
+                if f is not None:
+                    f.close()
+                name = f'{prefix}-{len(shards):05d}.jsonl'
+                shards.append({'file': name, 'jobs': 0})
+                f = open(os.path.join(out_dir, name), 'w', encoding='utf-8')
+            f.write(json.dumps(job, ensure_ascii=False))
+            f.write('\n')
+            shards[-1]['jobs'] += 1
+            total += 1
+            for sector in (job.get('taxonomy') or {}).get('sectors', ()):
+                sectors[sector] = sectors.get(sector, 0) + 1
+    finally:
+        if f is not None:
+            f.close()
+
+    manifest = {
+        'total_jobs': total,
+        'shard_size': shard_size,
+        'shards': shards,
+        'sectors': sectors,
+    }
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as mf:
+        json.dump(manifest, mf, indent=2, ensure_ascii=False)
+
+    current = {shard['file'] for shard in shards}
+    for name in os.listdir(out_dir):
+        if name.startswith(prefix + '-') and name.endswith('.jsonl') and name not in current:
+            os.remove(os.path.join(out_dir, name))
+    return manifest
+
+
+def ingest(path, out_dir, shard_size=DEFAULT_SHARD_SIZE, workers=None,
+           chunk_size=DEFAULT_CHUNK_SIZE, word_boundary=True, dedup_threshold=None):
+    """Stream `path` through enrichment into shards. Returns (manifest, EnrichStats).
+
+    Salaries are annualized into `salary_annual_min` / `salary_annual_max`
+    (see salary_index.py). With `dedup_threshold`, near-duplicate postings
+    are dropped before enrichment (see job_dedup.py).
+    """
+    stats = EnrichStats(workers or os.cpu_count() or 1)
+    jobs = iter_jobs(path)
+    dedup = None
+    if dedup_threshold is not None:
+        from job_dedup import Deduplicator
+        dedup = Deduplicator(dedup_threshold)
+        jobs = dedup.iter_unique(jobs)
+    jobs = (with_annual_salary(job) for job in jobs)
+    enriched = iter_enriched(jobs, workers, chunk_size, word_boundary, stats)
+    manifest = write_shards(enriched, out_dir, shard_size)
+    manifest['enrichment'] = stats.as_dict()
+    if dedup is not None:
+        manifest['dedup'] = dedup.summary()
+    return manifest, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Stream, enrich and shard a job corpus.')
+    parser.add_argument('input', nargs='?', default='climate_jobs_v6.csv')
+    parser.add_argument('--out-dir', default='job_shards')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--substring', action='store_true')
+    parser.add_argument('--dedup', nargs='?', type=float, const=0.8, default=None, metavar='THRESHOLD',
+                        help='drop near-duplicate postings before enrichment (default threshold 0.8)')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    print(f'💼 Streaming jobs from {args.input}...', file=sys.stderr)
+    manifest, stats = ingest(args.input, args.out_dir, args.shard_size, args.workers,
+                             args.chunk_size, word_boundary=not args.substring, dedup_threshold=args.dedup)
+    if 'dedup' in manifest:
+        print(f"🧹 Dropped {manifest['dedup']['duplicates']} near-duplicate postings", file=sys.stderr)
+    print(f"✅ Wrote {manifest['total_jobs']} jobs to {len(manifest['shards'])} shard(s) in {args.out_dir} "
+          f'({time.perf_counter() - started:.2f}s, {stats.jobs_per_sec:,.0f} jobs/sec)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""
+Sparse job x taxonomy-feature matrix for vectorized scoring. Requires NumPy.
+
+`searchJobs` and `matchJobsToResume` in server.js loop over every job and
+call `jobText.includes(skill)` for every query term. Here each job is encoded
+once, through the keyword automaton, as a CSR row over a fixed feature space:
+
+    columns [0, V)        every taxonomy keyword (keyword-index order)
+    columns [V, V + N)    every taxonomy node (node id order) - sectors,
+                          opportunity areas and the matched leaves
+
+A query or resume profile is encoded into the same space with per-kind
+weights, and ranking the whole corpus is one sparse mat-vec plus a top-k
+partition. Query vectors are usually very sparse, so the mat-vec runs
+column-wise over a lazily built CSC copy when that touches fewer entries.
+
+Usage:
+    matrix = JobMatrix.build(jobs)
+    encoder = QueryEncoder(matrix.space)
+    matrix.top_k(encoder.encode("battery recycling engineer"), k=10)
+"""
+
+import numpy as np
+
+from enrich_jobs import job_text
+from keyword_matcher import KeywordMatcher
+from metrics import timed
+from taxonomy import load_taxonomy
+
+# Mirrors the additive weights in searchJobs: sector +3, imperative/area +2, keyword +1.
+FEATURE_WEIGHTS = {
+    'keyword': 1.0,
+    'sector': 3.0,
+    'opportunity_area': 2.0,
+    'innovation_imperative': 2.0,
+    'moonshot': 1.5,
+    'tech_category': 1.5,
+}
+
+# Relative weight of each resume field, as in matchJobsToResume (skills 5, interests 3, industries 2).
+PROFILE_FIELD_WEIGHTS = {
+    'skills': 5.0,
+    'areas_of_interest': 3.0,
+    'industries_worked_in': 2.0,
+}
+
+
+class FeatureSpace:
+    """Column layout shared by the job matrix and query vectors."""
+
+    def __init__(self, taxonomy=None, word_boundary=True):
+        self.taxonomy = taxonomy or load_taxonomy()
+        self.matcher = KeywordMatcher(self.taxonomy, word_boundary=word_boundary)
+        self.keyword_column = {keyword: i for i, (keyword, _) in enumerate(self.matcher.automaton.patterns)}
+        self.node_offset = len(self.keyword_column)
+        self.size = self.node_offset + len(self.taxonomy.nodes)
+
+    def features(self, text):
+        """Matched keyword columns and node columns for `text`.
+
+        Returns ({column: kind}, matched leaf ids); a leaf hit also activates
+        its opportunity area and sector.
+        """
+        columns = {}
+        leaf_ids = []
+        offset = self.node_offset
+        for keyword, leaves in self.matcher.matched_keywords(text).items():
+            columns[self.keyword_column[keyword]] = 'keyword'
+            for leaf in leaves:
+                leaf_ids.append(leaf.id)
+                columns[offset + leaf.id] = leaf.kind
+                for ancestor in leaf.ancestors():
+                    columns[offset + ancestor.id] = ancestor.kind
+        return columns, leaf_ids
+
+    def column_name(self, column):
+        if column < self.node_offset:
+            return self.matcher.automaton.patterns[column][0]
+        return self.taxonomy.nodes[column - self.node_offset].path
+
+
+class JobMatrix:
+    """Binary CSR matrix (all stored values are 1) of jobs x features."""
+
+    def __init__(self, space, indptr, indices, impact):
+        self.space = space
+        self.indptr = indptr      # int64, len n_jobs + 1
+        self.indices = indices    # int32, sorted within each row
+        self.impact = impact      # float32 per-job impact score
+        self.shape = (len(indptr) - 1, space.size)
+        self._csc = None
+
+    @property
+    def taxonomy(self):
+        return self.space.taxonomy
+
+    @property
+    def nnz(self):
+        return int(self.indptr[-1])
+
+    @classmethod
+    def build(cls, jobs, space=None, text=job_text):
+        space = space or FeatureSpace()
+        taxonomy = space.taxonomy
+        indptr = [0]
+        indices = []
+        impact = []
+        for job in jobs:
+            columns, leaf_ids = space.features(text(job))
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+            impact.append(taxonomy.impact_score(leaf_ids))
+        return cls(
+            space,
+            np.asarray(indptr, dtype=np.int64),
+            np.asarray(indices, dtype=np.int32),
+            np.asarray(impact, dtype=np.float32),
+        )
+
+    def matvec(self, vector):
+        """Score every job: row . vector."""
+        vector = np.asarray(vector, dtype=np.float64)
+        columns = np.flatnonzero(vector)
+        colptr, rows = self.csc()
+        touched = int((colptr[columns + 1] - colptr[columns]).sum())
+        if touched * 4 < self.nnz:
+            # Column-wise: only the posting lists of the query's features.
+            starts, ends = colptr[columns], colptr[columns + 1]
+            hit_rows = np.concatenate([rows[a:b] for a, b in zip(starts, ends)]) if len(columns) else rows[:0]
+            weights = np.repeat(vector[columns], ends - starts)
+            return np.bincount(hit_rows, weights=weights, minlength=self.shape[0])
+        # Row-wise: gather every stored entry and sum each row with a prefix sum.
+        prefix = np.concatenate(([0.0], np.cumsum(vector[self.indices])))
+        return prefix[self.indptr[1:]] - prefix[self.indptr[:-1]]
+
+    def csc(self):
+        """(colptr, row indices) of the transposed matrix, built on first use."""
+        if self._csc is None:
+            row_of = np.repeat(np.arange(self.shape[0], dtype=np.int32), np.diff(self.indptr))
+            order = np.argsort(self.indices, kind='stable')
+            colptr = np.zeros(self.shape[1] + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=self.shape[1]), out=colptr[1:])
+            self._csc = (colptr, row_of[order])
+        return self._csc
+
+    @timed('matrix.top_k')
+    def top_k(self, vector, k=20, impact_bias=0.1):
+        """Best `k` (job_id, score) pairs with score > 0.
+
+        `impact_bias` adds a fraction of the job's impact score, matching the
+        `match_score * 10 + impact_score` ordering in searchJobs. Ties keep
+        corpus order.
+        """
+        match = self.matvec(vector)
+        ranked = match + impact_bias * self.impact if impact_bias else match
+        candidates = np.flatnonzero(match > 0)
+        if len(candidates) > k:
+            # Keep every job tied with the k-th score, so the cut below keeps the earliest ones.
+            scores = ranked[candidates]
+            cutoff = -np.partition(-scores, k - 1)[k - 1]
+            candidates = candidates[scores >= cutoff]
+        order = np.lexsort((candidates, -ranked[candidates]))[:k]
+        return [(int(job_id), float(match[job_id])) for job_id in candidates[order]]
+
+    def row(self, job_id):
+        return self.indices[self.indptr[job_id]:self.indptr[job_id + 1]]
+
+    def to_scipy(self):
+        """The same matrix as a scipy.sparse.csr_matrix (needs SciPy)."""
+        from scipy.sparse import csr_matrix
+        data = np.ones(self.nnz, dtype=np.float32)
+        return csr_matrix((data, self.indices, self.indptr), shape=self.shape)
+
+
+class QueryEncoder:
+    """Encodes free text or a parsed resume into a weighted feature vector."""
+
+    def __init__(self, space, weights=None):
+        self.space = space
+        self.weights = {**FEATURE_WEIGHTS, **(weights or {})}
+
+    def encode(self, text, scale=1.0, out=None):
+        vector = out if out is not None else np.zeros(self.space.size, dtype=np.float32)
+        columns, _ = self.space.features(text or '')
+        for column, kind in columns.items():
+            vector[column] = max(vector[column], scale * self.weights.get(kind, 0.0))
+        return vector
+
+    def encode_profile(self, resume):
+        """Vector for a parsed resume (`skills`, `areas_of_interest`, `industries_worked_in`)."""
+        vector = np.zeros(self.space.size, dtype=np.float32)
+        for field, scale in PROFILE_FIELD_WEIGHTS.items():
+            values = resume.get(field) or ()
+            if values:
+                self.encode(', '.join(values), scale=scale, out=vector)
+        return vector
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    from job_ingest import iter_jobs
+
+    jobs = list(iter_jobs('climate_jobs_v6.json'))
+    started = time.perf_counter()
+    matrix = JobMatrix.build(jobs)
+    print(f'✅ Encoded {matrix.shape[0]} jobs x {matrix.shape[1]} features '
+          f'({matrix.nnz} non-zeros) in {time.perf_counter() - started:.2f}s')
+
+    encoder = QueryEncoder(matrix.space)
+    query = ' '.join(sys.argv[1:]) or 'battery recycling and grid storage'
+    vector = encoder.encode(query)
+    started = time.perf_counter()
+    hits = matrix.top_k(vector, k=10)
+    print(f'\n🔍 {query!r}: ranked in {(time.perf_counter() - started) * 1000:.2f} ms')
+    for job_id, score in hits:
+        print(f"  [{score:4.1f}] {jobs[job_id]['title']} @ {jobs[job_id]['company']}")
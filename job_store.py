@@ -0,0 +1,448 @@
+"""
+Columnar, memory-mapped job store with dictionary-encoded strings. Requires NumPy.
+
+Each of the job dicts repeats the same long strings: company names and
+descriptions, sector and area names, majors, "Lever API". Loading the JSON
+gives every worker process its own copy of all of them. `write_store` lays
+the corpus out as one directory of .npy files:
+
+    <column>.codes.npy             int32 codes into a string dictionary (-1 = null)
+    <column>.indptr.npy + codes    list columns as CSR rows of codes
+    <column>.blob.npy + offsets    texts that rarely repeat (titles, urls, requirements)
+    <column>.values.npy + null     int64 or float64 numbers plus a null mask
+    dict.<name>.blob/offsets.npy   each string dictionary, UTF-8 back to back
+    node_ids.indptr/codes.npy      taxonomy node ids per job (declared paths + ancestors)
+    store.json                     column kinds, dictionaries, array names, taxonomy hash
+
+Companies, majors and taxonomy names are interned once in shared
+dictionaries. `JobStore.open` memory-maps every array read-only, so opening
+is a few small reads. The pages are shared between all processes that open
+the same directory, and a job dict is only materialized when asked for.
+Equality filters (`where`, `where_any`) compare integer codes with NumPy and
+never decode a string. Node ids are only valid for the taxonomy the store
+was built with: `node_ids` / `with_node` raise StoreError once
+FULL_TAXONOMY.py has changed, and `is_fresh()` checks it up front.
+
+Usage:
+    python3 job_store.py climate_jobs_v6.json -o job_store
+    store = JobStore.open('job_store')
+    store[0], store.value('company', 12), store.where('experience_level', 'Entry-Level')
+    for job in iter_jobs('job_store'): ...   # job_ingest.iter_jobs reads stores too
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from category_index import job_category_paths
+from taxonomy import load_taxonomy
+
+STORE_FORMAT = 3
+MANIFEST = 'store.json'
+
+# Columns sharing one dictionary; other dictionary-encoded columns get their own.
+SHARED_DICTIONARIES = {
+    'company': 'companies',
+    'applicable_majors': 'majors',
+    'climate_sectors': 'taxonomy_names',
+    'climate_opportunity_areas': 'taxonomy_names',
+    'climate_innovation_imperatives': 'taxonomy_names',
+    'climate_categories': 'taxonomy_names',
+}
+# A string column is dictionary-encoded when it has at most this many distinct values per row.
+DICTIONARY_RATIO = 0.5
+NULL = -1
+
+
+# ============================================================================
+# Strings
+# ============================================================================
+
+def encode_strings(strings):
+    """(uint8 UTF-8 blob, int64 offsets of length n + 1)."""
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    blob = np.frombuffer(b''.join(encoded), dtype=np.uint8) if encoded else np.zeros(0, dtype=np.uint8)
+    return blob, offsets
+
+
+class StringTable:
+    """Read-only strings over a UTF-8 blob and offsets (both may be memory-mapped)."""
+
+    __slots__ = ('blob', 'offsets', '_index')
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+        self._index = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self.blob[start:end].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def code(self, value):
+        """Code of `value`, or None; the reverse index is built on first use."""
+        if self._index is None:
+            self._index = {s: i for i, s in enumerate(self)}
+        return self._index.get(value)
+
+
+# ============================================================================
+# Writer
+# ============================================================================
+
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def infer_kind(values):
+    """'list', 'int', 'float', 'dict', 'text' or 'json' for one column's values.
+
+    Mixed int / float columns and ints outside int64 are 'json', so every
+    value reads back with its own type and full precision.
+    """
+    present = [v for v in values if v is not None]
+    if not present:
+        return 'text'
+    if all(isinstance(v, list) and all(isinstance(x, str) for x in v) for v in present):
+        return 'list'
+    if all(type(v) is int and INT64_MIN <= v <= INT64_MAX for v in present):
+        return 'int'
+    if all(type(v) is float for v in present):
+        return 'float'
+    if all(isinstance(v, str) for v in present):
+        return 'dict' if len(set(present)) <= DICTIONARY_RATIO * len(present) else 'text'
+    return 'json'
+
+
+class _Dictionary:
+    def __init__(self):
+        self.codes = {}
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+        return code
+
+
+def _save(out_dir, name, array):
+    np.save(os.path.join(out_dir, name + '.npy'), array, allow_pickle=False)
+
+
+def clear_store(out_dir):
+    """Remove a previous store's manifest, then its arrays, so no stale column survives a rewrite."""
+    manifest = os.path.join(out_dir, MANIFEST)
+    if os.path.exists(manifest):
+        os.remove(manifest)
+    for name in os.listdir(out_dir):
+        if name.endswith('.npy'):
+            os.remove(os.path.join(out_dir, name))
+
+
+def write_store(jobs, out_dir, taxonomy=None):
+    """Write `jobs` (an iterable of dicts) as a store directory; returns the manifest."""
+    jobs = list(jobs)
+    taxonomy = taxonomy or load_taxonomy()
+    os.makedirs(out_dir, exist_ok=True)
+    clear_store(out_dir)
+    arrays = []
+
+    def save(name, array):
+        _save(out_dir, name, array)
+        arrays.append(name)
+
+    names = list(dict.fromkeys(key for job in jobs for key in job))
+    dictionaries = {}
+    columns = {}
+    for name in names:
+        values = [job.get(name) for job in jobs]
+        kind = infer_kind(values)
+        spec = {'kind': kind}
+        if any(name not in job for job in jobs):
+            save(f'{name}.present', np.array([name in job for job in jobs], dtype=bool))
+            spec['sparse'] = True
+
+        if kind in ('dict', 'list'):
+            dictionary_name = SHARED_DICTIONARIES.get(name, name)
+            dictionary = dictionaries.setdefault(dictionary_name, _Dictionary())
+            spec['dictionary'] = dictionary_name
+            if kind == 'dict':
+                codes = [NULL if v is None else dictionary.code(v) for v in values]
+                save(f'{name}.codes', np.array(codes, dtype=np.int32))
+            else:
+                indptr = np.zeros(len(values) + 1, dtype=np.int64)
+                flat = []
+                nulls = []
+                for i, value in enumerate(values):
+                    if value is None:
+                        nulls.append(i)
+                    flat.extend(dictionary.code(v) for v in value or ())
+                    indptr[i + 1] = len(flat)
+                save(f'{name}.indptr', indptr)
+                save(f'{name}.codes', np.array(flat, dtype=np.int32))
+                if nulls:
+                    save(f'{name}.nulls', np.array(nulls, dtype=np.int64))
+        elif kind in ('int', 'float'):
+            dtype, fill = (np.int64, 0) if kind == 'int' else (np.float64, 0.0)
+            save(f'{name}.values', np.array([fill if v is None else v for v in values], dtype=dtype))
+            save(f'{name}.null', np.array([v is None for v in values], dtype=bool))
+        else:
+            texts = [('' if v is None else v) if kind == 'text' else json.dumps(v, ensure_ascii=False)
+                     for v in values]
+            blob, offsets = encode_strings(texts)
+            save(f'{name}.blob', blob)
+            save(f'{name}.offsets', offsets)
+            if kind == 'text':
+                save(f'{name}.null', np.array([v is None for v in values], dtype=bool))
+        columns[name] = spec
+
+    for name, dictionary in dictionaries.items():
+        blob, offsets = encode_strings(dictionary.codes)
+        save(f'dict.{name}.blob', blob)
+        save(f'dict.{name}.offsets', offsets)
+
+    indptr = np.zeros(len(jobs) + 1, dtype=np.int64)
+    node_ids = []
+    for i, job in enumerate(jobs):
+        ids = set()
+        for path in job_category_paths(taxonomy, job):
+            node = taxonomy.node(path)
+            if node is not None:
+                ids.add(node.id)
+                ids.update(ancestor.id for ancestor in node.ancestors())
+        node_ids.extend(sorted(ids))
+        indptr[i + 1] = len(node_ids)
+    save('node_ids.indptr', indptr)
+    save('node_ids.codes', np.array(node_ids, dtype=np.int32))
+
+    manifest = {
+        'format': STORE_FORMAT,
+        'count': len(jobs),
+        'columns': columns,
+        'dictionaries': sorted(dictionaries),
+        'arrays': sorted(arrays),
+        'taxonomy_hash': taxonomy.content_hash,
+    }
+    # The old manifest was removed first and this one goes last, so a half-written store never looks complete.
+    tmp = os.path.join(out_dir, MANIFEST + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(out_dir, MANIFEST))
+    return manifest
+
+
+# ============================================================================
+# Reader
+# ============================================================================
+
+class StoreError(ValueError):
+    pass
+
+
+class StaleStoreError(StoreError):
+    """The store's node ids were built for another taxonomy version."""
+
+
+def is_store(path):
+    return os.path.isfile(os.path.join(path, MANIFEST))
+
+
+class JobStore:
+    """Read-only view over a store directory."""
+
+    def __init__(self, path, manifest, arrays, taxonomy=None):
+        self.path = path
+        self.manifest = manifest
+        self.count = manifest['count']
+        self.columns = manifest['columns']
+        self.taxonomy_hash = manifest.get('taxonomy_hash')
+        self._arrays = arrays
+        self._taxonomy = taxonomy
+        self._fresh = None
+        self.dictionaries = {
+            name: StringTable(arrays[f'dict.{name}.blob'], arrays[f'dict.{name}.offsets'])
+            for name in manifest['dictionaries']
+        }
+        self._texts = {
+            name: StringTable(arrays[f'{name}.blob'], arrays[f'{name}.offsets'])
+            for name, spec in self.columns.items() if spec['kind'] in ('text', 'json')
+        }
+        self._list_nulls = {
+            name: frozenset(arrays[f'{name}.nulls'].tolist())
+            for name, spec in self.columns.items() if spec['kind'] == 'list' and f'{name}.nulls' in arrays
+        }
+
+    @classmethod
+    def open(cls, path, mmap=True, taxonomy=None):
+        """Map a store read-only; `taxonomy` (default load_taxonomy(), loaded lazily) validates node ids."""
+        try:
+            with open(os.path.join(path, MANIFEST), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as error:
+            raise StoreError(f'{path}: not a job store ({error})') from error
+        if manifest.get('format') != STORE_FORMAT:
+            raise StoreError(f"{path}: store format {manifest.get('format')}, expected {STORE_FORMAT}")
+        mode = 'r' if mmap else None
+        arrays = {}
+        # Only the arrays the manifest lists: stray .npy files in the directory are never read.
+        for name in manifest['arrays']:
+            try:
+                arrays[name] = np.load(os.path.join(path, name + '.npy'), mmap_mode=mode, allow_pickle=False)
+            except OSError as error:
+                raise StoreError(f'{path}: missing array {name} ({error})') from error
+        return cls(path, manifest, arrays, taxonomy)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def __getitem__(self, job_id):
+        if not 0 <= job_id < self.count:
+            raise IndexError(job_id)
+        job = {}
+        for name, spec in self.columns.items():
+            if spec.get('sparse') and not self._arrays[f'{name}.present'][job_id]:
+                continue
+            job[name] = self.value(name, job_id)
+        return job
+
+    def value(self, name, job_id):
+        """One decoded field."""
+        spec = self.columns[name]
+        kind = spec['kind']
+        arrays = self._arrays
+        if kind == 'dict':
+            code = int(arrays[f'{name}.codes'][job_id])
+            return None if code == NULL else self.dictionaries[spec['dictionary']][code]
+        if kind == 'list':
+            if job_id in self._list_nulls.get(name, ()):
+                return None
+            indptr = arrays[f'{name}.indptr']
+            table = self.dictionaries[spec['dictionary']]
+            return [table[int(code)] for code in arrays[f'{name}.codes'][indptr[job_id]:indptr[job_id + 1]]]
+        if kind in ('int', 'float'):
+            if arrays[f'{name}.null'][job_id]:
+                return None
+            return arrays[f'{name}.values'][job_id].item()
+        if kind == 'json':
+            return json.loads(self._texts[name][job_id])
+        if arrays[f'{name}.null'][job_id]:
+            return None
+        return self._texts[name][job_id]
+
+    def codes(self, name):
+        """Raw int32 codes of a dictionary or list column (memory-mapped)."""
+        return self._arrays[f'{name}.codes']
+
+    def numbers(self, name):
+        """(values, null mask) of a number column (memory-mapped)."""
+        return self._arrays[f'{name}.values'], self._arrays[f'{name}.null']
+
+    def is_fresh(self, taxonomy=None):
+        """True when the store was built for `taxonomy` (default: the one given to open, else load_taxonomy())."""
+        if taxonomy is not None:
+            return self.taxonomy_hash == taxonomy.content_hash
+        if self._fresh is None:
+            self._taxonomy = self._taxonomy or load_taxonomy()
+            self._fresh = self.taxonomy_hash == self._taxonomy.content_hash
+        return self._fresh
+
+    def _check_nodes(self):
+        if not self.is_fresh():
+            raise StaleStoreError(f'{self.path}: node ids were built for taxonomy {self.taxonomy_hash}, '
+                                  f'not {self._taxonomy.content_hash}; rebuild with job_store.py')
+
+    def node_ids(self, job_id):
+        self._check_nodes()
+        indptr = self._arrays['node_ids.indptr']
+        return self._arrays['node_ids.codes'][indptr[job_id]:indptr[job_id + 1]]
+
+    def _code(self, name, value):
+        return self.dictionaries[self.columns[name]['dictionary']].code(value)
+
+    def where(self, name, value):
+        """Ascending job ids whose dictionary column equals `value`."""
+        code = self._code(name, value)
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(self.codes(name) == code)
+
+    def where_any(self, name, value):
+        """Ascending job ids whose list column contains `value`."""
+        code = self._code(name, value)
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        positions = np.flatnonzero(self.codes(name) == code)
+        rows = np.searchsorted(self._arrays[f'{name}.indptr'], positions, side='right') - 1
+        return np.unique(rows)
+
+    def with_node(self, node_id):
+        """Ascending job ids tagged with a taxonomy node (or a descendant of it)."""
+        self._check_nodes()
+        positions = np.flatnonzero(self._arrays['node_ids.codes'] == node_id)
+        return np.searchsorted(self._arrays['node_ids.indptr'], positions, side='right') - 1
+
+    def nbytes(self):
+        return sum(array.nbytes for array in self._arrays.values())
+
+
+def main(argv=None):
+    import tracemalloc
+
+    from job_ingest import iter_jobs
+
+    parser = argparse.ArgumentParser(description='Write the job corpus as a memory-mapped columnar store.')
+    parser.add_argument('input', nargs='?', default='climate_jobs_v6.json')
+    parser.add_argument('-o', '--out-dir', default='job_store')
+    args = parser.parse_args(argv)
+
+    jobs = list(iter_jobs(args.input))
+    started = time.perf_counter()
+    manifest = write_store(jobs, args.out_dir)
+    print(f"✅ {manifest['count']} jobs, {len(manifest['columns'])} columns, "
+          f"{len(manifest['dictionaries'])} dictionaries -> {args.out_dir} "
+          f'({time.perf_counter() - started:.2f}s)', file=sys.stderr)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    loaded = list(iter_jobs(args.input))
+    json_seconds = time.perf_counter() - started
+    json_heap = tracemalloc.get_traced_memory()[0]
+    del loaded
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    store = JobStore.open(args.out_dir)
+    store_seconds = time.perf_counter() - started
+    store_heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    mismatches = sum(1 for i, job in enumerate(jobs) if store[i] != job)
+    print(f'⏱️  load: json {json_seconds * 1000:.1f} ms / {json_heap / 1024:,.0f} KB heap, '
+          f'store {store_seconds * 1000:.1f} ms / {store_heap / 1024:,.0f} KB heap '
+          f'({store.nbytes() / 1024:,.0f} KB mapped)', file=sys.stderr)
+    if mismatches:
+        print(f'⚠️  {mismatches} jobs did not round-trip', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
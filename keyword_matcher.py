@@ -0,0 +1,190 @@
+"""
+Single-pass multi-keyword matcher over every CLIMATE_TAXONOMY keyword.
+
+The JS enrichment loop and `detectClimateCategories` test each keyword with
+its own `includes`, i.e. O(keywords x text) per job or chat message. Here all
+keywords are compiled into one Aho-Corasick automaton, so a text is scanned
+once and every hit comes back with the taxonomy nodes it belongs to.
+
+Usage:
+    from keyword_matcher import load_matcher
+    matcher = load_matcher()
+    for hit in matcher.find_all("Battery engineer working on fast charging"):
+        print(hit.keyword, hit.paths)
+"""
+
+from collections import deque
+from functools import lru_cache
+
+from metrics import timed
+from taxonomy import load_taxonomy
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+def fold_case(text):
+    """Lowercase `text` without changing its length, so offsets stay valid."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(ch.lower()[:1] for ch in text)
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over (pattern, value) pairs.
+
+    Patterns are matched case-insensitively. With `word_boundary=True` a hit
+    only counts when it is not glued to surrounding letters or digits
+    ("ev" does not fire inside "developer"); patterns that start or end with
+    punctuation are only boundary-checked on their alphanumeric side.
+    """
+
+    def __init__(self, patterns, word_boundary=True):
+        self.word_boundary = word_boundary
+        self.patterns = []  # pattern index -> (lowered pattern, value)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        seen = {}
+        for pattern, value in patterns:
+            key = fold_case(pattern.strip())
+            if not key:
+                continue
+            if key in seen:
+                continue
+            seen[key] = len(self.patterns)
+            self.patterns.append((key, value))
+            self._insert(key, seen[key])
+        self._build_failure_links()
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def _insert(self, key, index):
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + (index,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text):
+        """Yield (start, end, pattern_index) for every hit, in end order."""
+        goto, fail, out = self._goto, self._fail, self._out
+        patterns = self.patterns
+        lowered = fold_case(text)
+        check = self.word_boundary
+        length = len(lowered)
+        state = 0
+
+        for pos, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = pos + 1
+            for index in out[state]:
+                key = patterns[index][0]
+                start = end - len(key)
+                if check:
+                    if start > 0 and _is_word_char(key[0]) and _is_word_char(lowered[start - 1]):
+                        continue
+                    if end < length and _is_word_char(key[-1]) and _is_word_char(lowered[end]):
+                        continue
+                yield start, end, index
+
+
+class Hit:
+    """One keyword occurrence and the taxonomy leaves that list it."""
+
+    __slots__ = ('keyword', 'start', 'end', 'nodes')
+
+    def __init__(self, keyword, start, end, nodes):
+        self.keyword = keyword
+        self.start = start
+        self.end = end
+        self.nodes = nodes
+
+    @property
+    def paths(self):
+        return [node.path for node in self.nodes]
+
+    def __repr__(self):
+        return f'<Hit {self.keyword!r} [{self.start}:{self.end}] {len(self.nodes)} nodes>'
+
+
+class KeywordMatcher:
+    """Aho-Corasick matcher compiled from a Taxonomy's keyword index."""
+
+    def __init__(self, taxonomy=None, word_boundary=True):
+        self.taxonomy = taxonomy or load_taxonomy()
+        self.automaton = AhoCorasick(self.taxonomy.keyword_index.items(), word_boundary=word_boundary)
+
+    @property
+    def word_boundary(self):
+        return self.automaton.word_boundary
+
+    def find_all(self, text):
+        """Every keyword occurrence in `text`, in the order they end."""
+        patterns = self.automaton.patterns
+        return [
+            Hit(patterns[index][0], start, end, patterns[index][1])
+            for start, end, index in self.automaton.iter_matches(text or '')
+        ]
+
+    @timed('keywords.match')
+    def matched_keywords(self, text):
+        """Distinct matched keywords -> leaf nodes, in first-hit order."""
+        patterns = self.automaton.patterns
+        matches = {}
+        for _, _, index in self.automaton.iter_matches(text or ''):
+            keyword, nodes = patterns[index]
+            if keyword not in matches:
+                matches[keyword] = nodes
+        return matches
+
+    def matched_nodes(self, text):
+        """Distinct matched leaf nodes, ordered by taxonomy position."""
+        nodes = {}
+        for leaves in self.matched_keywords(text).values():
+            for node in leaves:
+                nodes[node.id] = node
+        return [nodes[node_id] for node_id in sorted(nodes)]
+
+
+@lru_cache(maxsize=2)
+def load_matcher(word_boundary=True):
+    """Process-wide matcher over the default taxonomy."""
+    return KeywordMatcher(load_taxonomy(), word_boundary=word_boundary)
+
+
+if __name__ == '__main__':
+    import sys
+
+    text = ' '.join(sys.argv[1:]) or sys.stdin.read()
+    for hit in load_matcher().find_all(text):
+        print(f'{hit.keyword!r} @ {hit.start}-{hit.end}')
+        for path in hit.paths:
+            print(f'    {path}')
@@ -0,0 +1,484 @@
+"""
+Location normalization and a geo index for job search.
+
+`location` is free text: "St. Landry, LA", "Remote (USA)", "Texas",
+"Alameda, CA, Albuquerque, NM, or Oak Ridge, TN", "San Francisco, CA - US".
+`metadata.locations` in climate_jobs_v6.json is just the distinct strings.
+`LocationParser` splits a value into places (city / region / country /
+metro plus coordinates when the city is in the offline gazetteer) and
+remote / hybrid flags. It memoizes per distinct string; the corpus has about
+180 of them.
+
+`LocationIndex` keeps posting lists per state/province, country, metro,
+city and remote, plus a 1-degree lat/lon grid, so "jobs near Denver" only
+reads nearby cells. All postings are ascending job ids, so they intersect
+with CategoryIndex postings via category_index.intersect.
+
+Usage:
+    index = LocationIndex.from_jobs(iter_jobs('climate_jobs_v6.json'))
+    index.near_place('Denver', radius_km=80)
+    python3 location_index.py --near Denver --radius 80 --query battery
+    python3 location_index.py --remote --path "GHG Removal"
+"""
+
+import argparse
+import csv
+import math
+import os
+import re
+import sys
+from array import array
+from functools import lru_cache
+
+from category_index import intersect
+from metrics import timed
+from taxonomy import normalize_name
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GAZETTEER_PATH = os.path.join(BASE_DIR, 'location_gazetteer.csv')
+
+GRID_DEGREES = 1.0
+EARTH_RADIUS_KM = 6371.0
+DEFAULT_RADIUS_KM = 50
+PARSE_CACHE_SIZE = 8192
+
+US = 'United States'
+US_STATES = {
+    'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas', 'CA': 'California',
+    'CO': 'Colorado', 'CT': 'Connecticut', 'DE': 'Delaware', 'DC': 'District of Columbia',
+    'FL': 'Florida', 'GA': 'Georgia', 'HI': 'Hawaii', 'ID': 'Idaho', 'IL': 'Illinois',
+    'IN': 'Indiana', 'IA': 'Iowa', 'KS': 'Kansas', 'KY': 'Kentucky', 'LA': 'Louisiana',
+    'ME': 'Maine', 'MD': 'Maryland', 'MA': 'Massachusetts', 'MI': 'Michigan', 'MN': 'Minnesota',
+    'MS': 'Mississippi', 'MO': 'Missouri', 'MT': 'Montana', 'NE': 'Nebraska', 'NV': 'Nevada',
+    'NH': 'New Hampshire', 'NJ': 'New Jersey', 'NM': 'New Mexico', 'NY': 'New York',
+    'NC': 'North Carolina', 'ND': 'North Dakota', 'OH': 'Ohio', 'OK': 'Oklahoma', 'OR': 'Oregon',
+    'PA': 'Pennsylvania', 'RI': 'Rhode Island', 'SC': 'South Carolina', 'SD': 'South Dakota',
+    'TN': 'Tennessee', 'TX': 'Texas', 'UT': 'Utah', 'VT': 'Vermont', 'VA': 'Virginia',
+    'WA': 'Washington', 'WV': 'West Virginia', 'WI': 'Wisconsin', 'WY': 'Wyoming',
+}
+CA_PROVINCES = {
+    'AB': 'Alberta', 'BC': 'British Columbia', 'MB': 'Manitoba', 'NB': 'New Brunswick',
+    'NL': 'Newfoundland and Labrador', 'NS': 'Nova Scotia', 'ON': 'Ontario', 'PE': 'Prince Edward Island',
+    'QC': 'Quebec', 'SK': 'Saskatchewan',
+}
+# Australian states by name only: SA / WA / NT codes collide with US usage.
+AU_STATES = {
+    'NSW': 'New South Wales', 'QLD': 'Queensland', 'VIC': 'Victoria', 'TAS': 'Tasmania',
+    'SA': 'South Australia', 'WA': 'Western Australia', 'NT': 'Northern Territory',
+}
+COUNTRIES = {
+    'united states': US, 'united states of america': US, 'usa': US, 'us': US, 'u s': US, 'u s a': US,
+    'canada': 'Canada', 'mexico': 'Mexico', 'costa rica': 'Costa Rica',
+    'united kingdom': 'United Kingdom', 'uk': 'United Kingdom', 'england': 'United Kingdom',
+    'ireland': 'Ireland', 'ie': 'Ireland', 'germany': 'Germany', 'france': 'France',
+    'netherlands': 'Netherlands', 'austria': 'Austria', 'india': 'India', 'saudi arabia': 'Saudi Arabia',
+    'singapore': 'Singapore', 'taiwan': 'Taiwan', 'thailand': 'Thailand', 'australia': 'Australia',
+    'europe': 'Europe',
+}
+
+# region key (code or name, normalized) -> (code, country)
+REGIONS = {}
+for _codes, _country in ((US_STATES, US), (CA_PROVINCES, 'Canada')):
+    for _code, _name in _codes.items():
+        REGIONS[normalize_name(_code)] = (_code, _country)
+        REGIONS[normalize_name(_name)] = (_code, _country)
+for _code, _name in AU_STATES.items():
+    REGIONS[normalize_name(_name)] = (_code, 'Australia')
+    if _code not in US_STATES:
+        REGIONS[normalize_name(_code)] = (_code, 'Australia')
+
+# Only lowercase "or" / "and" between words separate places: "Bend, OR" is Oregon.
+_SPLIT = re.compile(r'(;|/|\||\s+(?:or|and)\s+|\s+-\s+|,)')
+_PARENS = re.compile(r'\(([^)]*)\)')
+_NOISE = re.compile(
+    r'\b(based in|any location|preferred|possible|hybrid|remote|local to|with field work at various sites across|'
+    r'metro area|metro|area|hq|\d{5}(?:-\d{4})?)\b',
+    re.IGNORECASE,
+)
+
+
+# ============================================================================
+# Gazetteer
+# ============================================================================
+
+class Place:
+    __slots__ = ('city', 'region', 'country', 'metro', 'lat', 'lon')
+
+    def __init__(self, city=None, region=None, country=None, metro=None, lat=None, lon=None):
+        self.city = city
+        self.region = region
+        self.country = country
+        self.metro = metro
+        self.lat = lat
+        self.lon = lon
+
+    @property
+    def has_coordinates(self):
+        return self.lat is not None
+
+    def key(self):
+        return (self.city, self.region, self.country)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"<Place {', '.join(str(part) for part in self.key() if part)}>"
+
+
+class Gazetteer:
+    """Offline city table: name / region / country / metro / lat / lon."""
+
+    def __init__(self, rows):
+        self.by_name = {}       # normalized name -> [Place]
+        self.by_metro = {}      # normalized metro -> [Place]
+        for row in rows:
+            place = Place(row['name'], row['region'] or None, row['country'], row['metro'] or None,
+                          float(row['lat']), float(row['lon']))
+            self.by_name.setdefault(normalize_name(place.city), []).append(place)
+            if place.metro:
+                self.by_metro.setdefault(normalize_name(place.metro), []).append(place)
+
+    @classmethod
+    def load(cls, path=GAZETTEER_PATH):
+        with open(path, newline='', encoding='utf-8') as f:
+            return cls(list(csv.DictReader(f)))
+
+    def lookup(self, name, region=None):
+        """Gazetteer place for a city name, optionally within a region code."""
+        places = self.by_name.get(normalize_name(name), ())
+        if region is not None:
+            places = [place for place in places if place.region == region]
+        return places[0] if len(places) == 1 else None
+
+    def geocode(self, name):
+        """Coordinates for a city or metro name: (lat, lon) or None."""
+        place = self.lookup(name)
+        if place is None:
+            members = self.by_metro.get(normalize_name(name))
+            if members:
+                place = members[0]
+        return (place.lat, place.lon) if place is not None else None
+
+
+# ============================================================================
+# Parser
+# ============================================================================
+
+class Location:
+    """Parsed `location` value."""
+
+    __slots__ = ('raw', 'places', 'remote', 'hybrid', 'unresolved')
+
+    def __init__(self, raw, places, remote, hybrid, unresolved):
+        self.raw = raw
+        self.places = tuple(places)
+        self.remote = remote
+        self.hybrid = hybrid
+        self.unresolved = tuple(unresolved)
+
+    @property
+    def regions(self):
+        return sorted({place.region for place in self.places if place.region})
+
+    @property
+    def countries(self):
+        return sorted({place.country for place in self.places if place.country})
+
+    @property
+    def metros(self):
+        return sorted({place.metro for place in self.places if place.metro})
+
+    def as_dict(self):
+        return {
+            'raw': self.raw,
+            'places': [place.as_dict() for place in self.places],
+            'regions': self.regions,
+            'countries': self.countries,
+            'metros': self.metros,
+            'remote': self.remote,
+            'hybrid': self.hybrid,
+            'unresolved': list(self.unresolved),
+        }
+
+
+def _region(token):
+    """(code, country) if the token is a state / province code or name."""
+    return REGIONS.get(normalize_name(token))
+
+
+def _split(text):
+    """Place tokens of a location string; region names like "Newfoundland and Labrador" stay whole."""
+    parts = _SPLIT.split(text)
+    tokens = [parts[0]]
+    for separator, token in zip(parts[1::2], parts[2::2]):
+        joined = tokens[-1] + separator + token
+        if separator.strip() == 'and' and _region(joined) is not None:
+            tokens[-1] = joined
+        else:
+            tokens.append(token)
+    return tokens
+
+
+class LocationParser:
+    """Memoized free-text location parser over a Gazetteer."""
+
+    def __init__(self, gazetteer=None, cache_size=PARSE_CACHE_SIZE):
+        self.gazetteer = gazetteer or Gazetteer.load()
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    def _city(self, text, region=None):
+        """Place for a city-ish token; tries the trailing 1-3 words when the whole token is unknown."""
+        words = text.split()
+        for start in range(len(words)):
+            if len(words) - start > 4:
+                continue
+            candidate = ' '.join(words[start:])
+            place = self.gazetteer.lookup(candidate, region)
+            if place is not None:
+                return place
+            if region is None and start > 0:
+                found = _region(candidate)
+                if found is not None:
+                    return Place(region=found[0], country=found[1])
+                country = COUNTRIES.get(normalize_name(candidate))
+                if country is not None:
+                    return Place(country=country)
+            metro = self.gazetteer.by_metro.get(normalize_name(candidate))
+            if metro and region is None:
+                anchor = metro[0]
+                return Place(None, anchor.region, anchor.country, anchor.metro, anchor.lat, anchor.lon)
+        return None
+
+    def _parse(self, raw):
+        text = raw or ''
+        lowered = text.lower()
+        remote = 'remote' in lowered
+        hybrid = 'hybrid' in lowered
+        text = _PARENS.sub(lambda m: ',' + m.group(1) + ',', text)
+
+        places, unresolved = [], []
+        pending = None  # city text waiting for a region token
+
+        def flush():
+            nonlocal pending
+            if pending is None:
+                return
+            place = self._city(pending)
+            if place is None:
+                found = _region(pending)
+                country = COUNTRIES.get(normalize_name(pending))
+                if found is not None:
+                    place = Place(region=found[0], country=found[1])
+                elif country is not None:
+                    place = Place(country=country)
+            if place is not None:
+                places.append(place)
+            else:
+                unresolved.append(pending)
+            pending = None
+
+        for token in _split(text):
+            token = ' '.join(token.split()).strip(' .')
+            if self.gazetteer.lookup(token) is None:
+                # Keep names like "San Francisco Bay Area" whole; strip noise otherwise.
+                token = ' '.join(_NOISE.sub(' ', token).split()).strip(' .')
+            if not token or token.isdigit():
+                continue
+            found = _region(token)
+            country = COUNTRIES.get(normalize_name(token))
+            if pending is not None and found is not None:
+                place = self._city(pending, found[0])
+                if place is not None or self.gazetteer.lookup(pending) is None:
+                    places.append(place or Place(pending, found[0], found[1]))
+                    pending = None
+                    continue
+                flush()  # "Washington DC; New York, NY": the pending city is complete already
+            if country is not None and (len(token) > 2 or token.isupper()):
+                flush()
+                if places and places[-1].country in (None, country):
+                    places[-1].country = country
+                elif not any(place.country == country for place in places):
+                    places.append(Place(country=country))
+                continue
+            if found is not None and (len(token) == 2 or self.gazetteer.lookup(token) is None):
+                flush()
+                places.append(Place(region=found[0], country=found[1]))
+                continue
+            flush()
+            pending = token
+        flush()
+
+        unique = {}
+        for place in places:
+            unique.setdefault(place.key(), place)
+        places = list(unique.values())
+        # Drop bare country / region entries already implied by a more specific place.
+        specific = [place for place in places if place.city or place.metro]
+        places = [place for place in places if place.city or place.metro or not any(
+            other.country == place.country and (place.region is None or other.region == place.region)
+            for other in specific)]
+        return Location(raw, places, remote, hybrid, unresolved)
+
+
+@lru_cache(maxsize=1)
+def default_parser():
+    return LocationParser()
+
+
+def parse_location(raw):
+    return default_parser().parse(raw)
+
+
+# ============================================================================
+# Index
+# ============================================================================
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _cell(lat, lon):
+    return math.floor(lat / GRID_DEGREES), math.floor(lon / GRID_DEGREES)
+
+
+class LocationIndex:
+    """Posting lists per region / country / metro / city / remote plus a lat/lon grid."""
+
+    def __init__(self, parser=None):
+        self.parser = parser or default_parser()
+        self.size = 0
+        self._postings = {}  # (kind, normalized value) -> array of job ids
+        self._grid = {}      # (lat cell, lon cell) -> [(job id, lat, lon)]
+
+    @classmethod
+    def from_jobs(cls, jobs, parser=None):
+        index = cls(parser)
+        for job in jobs:
+            index.add(job)
+        return index
+
+    def _post(self, kind, value, job_id):
+        postings = self._postings.setdefault((kind, normalize_name(value)), array('I'))
+        if not postings or postings[-1] != job_id:
+            postings.append(job_id)
+
+    def add(self, job):
+        job_id = self.size
+        self.size += 1
+        location = self.parser.parse(job.get('location') or '')
+        if location.remote:
+            self._post('remote', 'remote', job_id)
+        for place in location.places:
+            for kind, value in (('region', place.region), ('country', place.country),
+                                ('metro', place.metro), ('city', place.city)):
+                if value:
+                    self._post(kind, value, job_id)
+            if place.has_coordinates:
+                self._grid.setdefault(_cell(place.lat, place.lon), []).append((job_id, place.lat, place.lon))
+        return job_id
+
+    def postings(self, kind, value):
+        if kind == 'region':
+            found = _region(value)
+            value = found[0] if found else value
+        elif kind == 'country':
+            value = COUNTRIES.get(normalize_name(value), value)
+        return self._postings.get((kind, normalize_name(value)), array('I'))
+
+    def region(self, value):
+        """Jobs in a US state or Canadian province (code or name)."""
+        return self.postings('region', value)
+
+    def country(self, value):
+        return self.postings('country', value)
+
+    def metro(self, value):
+        return self.postings('metro', value)
+
+    def remote(self):
+        return self.postings('remote', 'remote')
+
+    @timed('location.near')
+    def near(self, lat, lon, radius_km=DEFAULT_RADIUS_KM):
+        """[(job id, km)] within `radius_km`, nearest first; reads only the grid cells in range."""
+        dlat = radius_km / 111.0
+        dlon = radius_km / max(1e-6, 111.0 * math.cos(math.radians(lat)))
+        (lat_lo, lon_lo), (lat_hi, lon_hi) = _cell(lat - dlat, lon - dlon), _cell(lat + dlat, lon + dlon)
+        best = {}
+        for i in range(lat_lo, lat_hi + 1):
+            for j in range(lon_lo, lon_hi + 1):
+                for job_id, job_lat, job_lon in self._grid.get((i, j), ()):
+                    km = haversine_km(lat, lon, job_lat, job_lon)
+                    if km <= radius_km and km < best.get(job_id, math.inf):
+                        best[job_id] = km
+        return sorted(best.items(), key=lambda item: (item[1], item[0]))
+
+    def near_place(self, name, radius_km=DEFAULT_RADIUS_KM):
+        """Like `near`, centred on a gazetteer city or metro; [] when the name is unknown."""
+        point = self.parser.gazetteer.geocode(name)
+        return self.near(point[0], point[1], radius_km) if point else []
+
+    def query(self, region=None, country=None, metro=None, remote=None, near=None,
+              radius_km=DEFAULT_RADIUS_KM, postings=None):
+        """Ascending job ids matching every given constraint (AND); `postings` adds e.g. a CategoryIndex list."""
+        lists = []
+        if region:
+            lists.append(self.region(region))
+        if country:
+            lists.append(self.country(country))
+        if metro:
+            lists.append(self.metro(metro))
+        if remote:
+            lists.append(self.remote())
+        if near:
+            lists.append(sorted(job_id for job_id, _ in self.near_place(near, radius_km)))
+        if postings is not None:
+            lists.append(postings)
+        if not lists:
+            return list(range(self.size))
+        return intersect(*lists)
+
+
+def main(argv=None):
+    from bm25_search import BM25Index
+    from category_index import CategoryIndex
+    from job_ingest import iter_jobs
+
+    parser = argparse.ArgumentParser(description='Location-aware job lookup.')
+    parser.add_argument('input', nargs='?', default='climate_jobs_v6.json')
+    parser.add_argument('--near', default=None, help='city or metro name from the gazetteer')
+    parser.add_argument('--radius', type=float, default=DEFAULT_RADIUS_KM, help='km')
+    parser.add_argument('--region', default=None, help='state / province code or name')
+    parser.add_argument('--country', default=None)
+    parser.add_argument('--remote', action='store_true')
+    parser.add_argument('--path', default=None, help='restrict to a taxonomy path prefix')
+    parser.add_argument('--query', default=None, help='rank the matches by BM25 relevance to this text')
+    parser.add_argument('--parse', action='store_true', help='print how every distinct location parses')
+    parser.add_argument('-n', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    jobs = list(iter_jobs(args.input))
+    if args.parse:
+        for raw in sorted({job.get('location') or '' for job in jobs}):
+            location = parse_location(raw)
+            print(f'{raw!r:70} -> {location.places} remote={location.remote} unresolved={list(location.unresolved)}')
+        return
+
+    index = LocationIndex.from_jobs(jobs)
+    postings = CategoryIndex.from_jobs(jobs).prefix(args.path) if args.path else None
+    ids = index.query(args.region, args.country, None, args.remote, args.near, args.radius, postings)
+    if args.query:
+        scores = BM25Index.from_jobs(jobs).scores(args.query)
+        ids = sorted((job_id for job_id in ids if job_id in scores), key=lambda job_id: (-scores[job_id], job_id))
+    print(f'📍 {len(ids)} jobs', file=sys.stderr)
+    for job_id in ids[:args.n]:
+        job = jobs[job_id]
+        print(f"   {job['title']} @ {job['company']} ({job['location']})")
+
+
+if __name__ == '__main__':
+    main()
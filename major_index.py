@@ -0,0 +1,240 @@
+"""
+Major alias index and precomputed major -> job posting lists.
+
+`searchJobsByMajor` lowercases and compares every `applicable_majors` entry
+of every job on each request, and ignores the `aliases` / `job_keywords` in
+the majors ontology ("MechE", "ME", ...). Here the ontology is loaded once.
+Every spelling (name, display name, code, aliases, page slug) resolves to
+its major through one hash map. Per major we precompute the job IDs, already
+in the /api/major-jobs order (experience level, then company), plus sector
+and opportunity-area coverage resolved against CLIMATE_TAXONOMY.
+
+Usage:
+    index = MajorIndex.from_files()
+    index.jobs_for('MechE')            # sorted job ids
+    python3 major_index.py -o major_jobs.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+
+from enrich_jobs import job_text
+from keyword_matcher import AhoCorasick
+from metrics import timed
+from taxonomy import PATH_SEP, load_taxonomy, normalize_name
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MAJORS_PATH = os.path.join(BASE_DIR, 'climatetech_majors_v3 (1).json')
+
+# Same order as searchJobsByMajor in server.js; unknown levels sort last.
+LEVEL_ORDER = {
+    'Internship': 1,
+    'Entry-Level': 2,
+    'Associate': 3,
+    'Senior': 4,
+    'Lead/Principal': 5,
+    'Executive': 6,
+}
+
+# A job must hit this many of a major's job_keywords to be inferred for it.
+MIN_INFERRED_HITS = 2
+
+
+def slugify(name):
+    """'Materials Science & Engineering' -> 'materials-science-engineering' (the major-*.html slug)."""
+    return normalize_name(name).replace(' ', '-')
+
+
+class Major:
+    __slots__ = ('id', 'name', 'display', 'code', 'category', 'aliases', 'description', 'job_keywords', 'slug')
+
+    def __init__(self, id, name, data, category):
+        self.id = id
+        self.name = name
+        self.display = data.get('display') or name
+        self.code = data.get('code') or ''
+        self.category = category
+        self.aliases = tuple(data.get('aliases') or ())
+        self.description = data.get('description') or ''
+        self.job_keywords = tuple(data.get('job_keywords') or ())
+        self.slug = slugify(self.display)
+
+    def spellings(self):
+        return (self.name, self.display, self.code, self.slug, f'major-{self.slug}') + self.aliases
+
+    def __repr__(self):
+        return f'<Major {self.display!r}>'
+
+
+def load_majors(path=MAJORS_PATH):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    majors = []
+    for category, entries in data.items():
+        for name, entry in entries.items():
+            majors.append(Major(len(majors), name, entry, category))
+    return majors
+
+
+class MajorIndex:
+    def __init__(self, majors, taxonomy=None):
+        self.majors = majors
+        self.taxonomy = taxonomy or load_taxonomy()
+        self.jobs = []
+        self._aliases = {}
+        for major in majors:
+            for spelling in major.spellings():
+                # First major to claim a spelling keeps it ("EE" etc. are shared by a few majors).
+                self._aliases.setdefault(normalize_name(spelling), major)
+        self._keywords = AhoCorasick(
+            ((keyword, None) for major in majors for keyword in major.job_keywords)
+        )
+        self._keyword_majors = {}
+        for major in majors:
+            for keyword in major.job_keywords:
+                self._keyword_majors.setdefault(keyword.lower().strip(), []).append(major.id)
+
+        self._listed = {}    # major id -> job ids that list the major
+        self._inferred = {}  # major id -> job ids matched only through job_keywords
+        self._sectors = {}   # major id -> Counter of sector names
+        self._areas = {}     # major id -> Counter of opportunity-area paths
+
+    @classmethod
+    def from_files(cls, jobs_path='climate_jobs_v6.json', majors_path=MAJORS_PATH, taxonomy=None):
+        from job_ingest import iter_jobs
+        index = cls(load_majors(majors_path), taxonomy)
+        index.build(iter_jobs(jobs_path))
+        return index
+
+    def resolve(self, name):
+        """Major for any known spelling, or None.
+
+        Handles "Engineering: Mechanical Engineering" style prefixes used by
+        some scrapers.
+        """
+        if not name:
+            return None
+        major = self._aliases.get(normalize_name(name))
+        if major is None and ':' in name:
+            major = self._aliases.get(normalize_name(name.split(':', 1)[1]))
+        return major
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+
+    def build(self, jobs):
+        listed = {major.id: [] for major in self.majors}
+        inferred = {major.id: [] for major in self.majors}
+        for job in jobs:
+            job_id = len(self.jobs)
+            self.jobs.append(job)
+
+            explicit = set()
+            for name in job.get('applicable_majors') or ():
+                major = self.resolve(name)
+                if major is not None:
+                    explicit.add(major.id)
+            for major_id in explicit:
+                listed[major_id].append(job_id)
+
+            hits = Counter()
+            patterns = self._keywords.patterns
+            for keyword in {patterns[i][0] for _, _, i in self._keywords.iter_matches(job_text(job))}:
+                hits.update(self._keyword_majors.get(keyword, ()))
+            for major_id, count in hits.items():
+                if count >= MIN_INFERRED_HITS and major_id not in explicit:
+                    inferred[major_id].append(job_id)
+
+        for major in self.majors:
+            self._listed[major.id] = self._sorted(listed[major.id])
+            self._inferred[major.id] = self._sorted(inferred[major.id])
+            self._sectors[major.id], self._areas[major.id] = self._coverage(listed[major.id])
+        return self
+
+    def _sorted(self, job_ids):
+        jobs = self.jobs
+        return tuple(sorted(job_ids, key=lambda i: (
+            LEVEL_ORDER.get(jobs[i].get('experience_level'), 999),
+            (jobs[i].get('company') or '').lower(),
+            i,
+        )))
+
+    def _coverage(self, job_ids):
+        sectors, areas = Counter(), Counter()
+        for job_id in job_ids:
+            seen_sectors, seen_areas = set(), set()
+            for path in self.jobs[job_id].get('climate_categories') or ():
+                node = self.taxonomy.node(path)
+                if node is None:
+                    continue
+                seen_sectors.add(node.sector.name)
+                area = node.opportunity_area
+                if area is not None:
+                    seen_areas.add(area.path)
+            sectors.update(seen_sectors)
+            areas.update(seen_areas)
+        return sectors, areas
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    @timed('major.lookup')
+    def jobs_for(self, name, include_inferred=False):
+        """Job ids for a major, in /api/major-jobs order; () for unknown majors."""
+        major = self.resolve(name)
+        if major is None:
+            return ()
+        if include_inferred:
+            return self._sorted(self._listed[major.id] + self._inferred[major.id])
+        return self._listed[major.id]
+
+    def coverage(self, name):
+        """{'sectors': {name: jobs}, 'opportunity_areas': {path: jobs}} for a major."""
+        major = self.resolve(name)
+        if major is None:
+            return {'sectors': {}, 'opportunity_areas': {}}
+        return {
+            'sectors': dict(self._sectors[major.id].most_common()),
+            'opportunity_areas': dict(self._areas[major.id].most_common()),
+        }
+
+    def export(self):
+        """Ready-to-serve lists for every major, keyed by page slug."""
+        return {
+            major.slug: {
+                'display': major.display,
+                'code': major.code,
+                'category': major.category,
+                'job_count': len(self._listed[major.id]),
+                'job_ids': list(self._listed[major.id]),
+                'inferred_job_ids': list(self._inferred[major.id]),
+                **self.coverage(major.name),
+            }
+            for major in self.majors
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Precompute per-major job lists and taxonomy coverage.')
+    parser.add_argument('--jobs', default='climate_jobs_v6.json')
+    parser.add_argument('--majors', default=MAJORS_PATH)
+    parser.add_argument('-o', '--output', default='major_jobs.json')
+    args = parser.parse_args(argv)
+
+    index = MajorIndex.from_files(args.jobs, args.majors)
+    lists = index.export()
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'source': os.path.basename(args.jobs), 'separator': PATH_SEP, 'majors': lists},
+                  f, indent=2, ensure_ascii=False)
+    covered = sum(1 for entry in lists.values() if entry['job_count'])
+    print(f'✅ {len(lists)} majors ({covered} with jobs) over {len(index.jobs)} jobs -> {args.output}',
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,409 @@
+"""
+Low-overhead instrumentation for the taxonomy and search hot paths.
+
+Each instrumented stage (keyword matching, context retrieval, enrichment,
+category / major / BM25 search, ...) counts every call. Only one call in
+`1 / sample_rate` is timed, and timed calls go into an HDR-style log-linear
+histogram: 64 linear sub-buckets per power of two, so any recorded latency
+is within ~1.6% of its true value and memory stays bounded. Cache hit ratios
+are read live from registered `cache.CacheStats`.
+
+Export as Prometheus text (`to_prometheus()`, or `serve()` on /metrics) or
+as JSON (`snapshot()`, `dump_json()`, and `start_periodic_dump()` for a
+background dump every N seconds).
+
+Sampling: ECOMATCH_METRICS_SAMPLE_RATE (default 0.1); 0 disables timing.
+
+Usage:
+    from metrics import METRICS, timed
+
+    @timed('bm25.search')
+    def search(...): ...
+
+    with METRICS.timer('prompt.build'):
+        ...
+    print(METRICS.to_prometheus())
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+DEFAULT_SAMPLE_RATE = float(os.environ.get('ECOMATCH_METRICS_SAMPLE_RATE', '0.1'))
+PREFIX = 'ecomatch'
+
+# Cumulative `le` buckets (seconds) for the Prometheus histogram export.
+EXPORT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUANTILES = (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('p999', 0.999))
+
+
+# ============================================================================
+# HDR-style histogram
+# ============================================================================
+
+SUB_BUCKET_BITS = 7
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_HALF = SUB_BUCKET_BITS - 1
+
+
+def bucket_index(value):
+    """Log-linear bucket for a non-negative int: exact below 128, then 64 buckets per power of two."""
+    if value < _SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return (shift << _HALF) + (value >> shift)
+
+
+def bucket_bounds(index):
+    """(lowest, highest) value that lands in bucket `index`."""
+    if index < _SUB_BUCKETS:
+        return index, index
+    shift = (index >> _HALF) - 1
+    mantissa = index - (shift << _HALF)
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class Histogram:
+    """Latency histogram over integer nanoseconds."""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = {}  # bucket index -> count
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        index = bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, quantile):
+        """Value at `quantile` (0..1), reported as the bucket's upper bound (capped at max)."""
+        if not self.count:
+            return 0
+        rank = max(1, int(quantile * self.count + 0.5))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(bucket_bounds(index)[1], self.max)
+        return self.max
+
+    def cumulative(self, bounds):
+        """Counts at or below each bound, for Prometheus `le` buckets."""
+        items = sorted(self.counts.items())
+        result, seen, position = [], 0, 0
+        for bound in bounds:
+            while position < len(items) and bucket_bounds(items[position][0])[1] <= bound:
+                seen += items[position][1]
+                position += 1
+            result.append(seen)
+        return result
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+# ============================================================================
+# Stages and registry
+# ============================================================================
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+class _Timer:
+    __slots__ = ('stage', 'started')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.stage.observe(time.perf_counter_ns() - self.started, exc_type is not None)
+        return False
+
+
+class Stage:
+    """Call counter plus sampled latency histogram for one named stage.
+
+    Counters are plain ints: under heavy threading an increment can
+    occasionally be lost, which is acceptable for telemetry.
+    """
+
+    __slots__ = ('name', 'metrics', 'calls', 'errors', 'histogram')
+
+    def __init__(self, name, metrics):
+        self.name = name
+        self.metrics = metrics
+        self.calls = 0
+        self.errors = 0
+        self.histogram = Histogram()
+
+    def timer(self):
+        self.calls += 1
+        every = self.metrics.sample_every
+        if not every or self.calls % every:
+            return _NOOP
+        return _Timer(self)
+
+    def observe(self, nanoseconds, error=False):
+        with self.metrics.lock:
+            self.histogram.record(nanoseconds)
+            if error:
+                self.errors += 1
+
+    def as_dict(self):
+        h = self.histogram
+        return {
+            'calls': self.calls,
+            'sampled': h.count,
+            'errors': self.errors,
+            'mean_ms': round(h.mean / 1e6, 4),
+            'min_ms': round((h.min or 0) / 1e6, 4),
+            'max_ms': round((h.max or 0) / 1e6, 4),
+            **{f'{label}_ms': round(h.percentile(q) / 1e6, 4) for label, q in QUANTILES},
+        }
+
+
+class Metrics:
+    """Registry of stages, event counters and caches."""
+
+    def __init__(self, sample_rate=DEFAULT_SAMPLE_RATE):
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.caches = {}
+        self.sample_every = 0
+        self.set_sample_rate(sample_rate)
+        self.started_at = time.time()
+        self._dumper = None
+
+    def set_sample_rate(self, rate):
+        """Time one call in round(1 / rate); 0 disables timing (calls are still counted)."""
+        self.sample_rate = rate
+        self.sample_every = max(1, round(1 / rate)) if rate > 0 else 0
+
+    def stage(self, name):
+        stage = self.stages.get(name)
+        if stage is None:
+            with self.lock:
+                stage = self.stages.setdefault(name, Stage(name, self))
+        return stage
+
+    def timer(self, name):
+        """Context manager timing one (possibly unsampled) call of stage `name`."""
+        return self.stage(name).timer()
+
+    def timed(self, name):
+        """Decorator form of `timer`; the stage is resolved once, at decoration time.
+
+        The sampling check is inlined so unsampled calls cost one increment
+        and one modulo.
+        """
+        def decorate(fn):
+            stage = self.stage(name)
+            metrics = self
+            clock = time.perf_counter_ns
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                stage.calls += 1
+                every = metrics.sample_every
+                if not every or stage.calls % every:
+                    return fn(*args, **kwargs)
+                started = clock()
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException:
+                    stage.observe(clock() - started, error=True)
+                    raise
+                stage.observe(clock() - started)
+                return result
+            return wrapper
+        return decorate
+
+    def incr(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def register_cache(self, name, cache):
+        """Report hits/misses/evictions of an LRUCache (or anything with `.stats`)."""
+        self.caches[name] = cache
+
+    def reset(self):
+        """Zero every stage and counter (stages stay registered; decorators hold references)."""
+        with self.lock:
+            for stage in self.stages.values():
+                stage.calls = stage.errors = 0
+                stage.histogram = Histogram()
+            self.counters.clear()
+            self.started_at = time.time()
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def snapshot(self):
+        return {
+            'timestamp': time.time(),
+            'uptime_s': round(time.time() - self.started_at, 3),
+            'sample_rate': self.sample_rate,
+            'stages': {name: stage.as_dict() for name, stage in sorted(self.stages.items())},
+            'counters': dict(sorted(self.counters.items())),
+            'caches': {name: {**cache.stats.as_dict(), 'size': len(cache)}
+                       for name, cache in sorted(self.caches.items())},
+        }
+
+    def dump_json(self, path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def start_periodic_dump(self, path, interval=60.0):
+        """Dump JSON to `path` every `interval` seconds from a daemon thread; returns a stop() callable."""
+        self.stop_periodic_dump()
+        stop = threading.Event()
+
+        def loop():
+            while not stop.wait(interval):
+                self.dump_json(path)
+            self.dump_json(path)
+
+        thread = threading.Thread(target=loop, name='metrics-dump', daemon=True)
+        thread.start()
+        self._dumper = (stop, thread)
+        return self.stop_periodic_dump
+
+    def stop_periodic_dump(self):
+        if self._dumper is not None:
+            stop, thread = self._dumper
+            stop.set()
+            thread.join()
+            self._dumper = None
+
+    def to_prometheus(self):
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f'# HELP {PREFIX}_{name} {help_text}')
+            lines.append(f'# TYPE {PREFIX}_{name} {kind}')
+
+        stages = sorted(self.stages.items())
+        metric('stage_calls_total', 'counter', 'Calls per instrumented stage.')
+        for name, stage in stages:
+            lines.append(f'{PREFIX}_stage_calls_total{{stage="{name}"}} {stage.calls}')
+        metric('stage_errors_total', 'counter', 'Sampled calls that raised.')
+        for name, stage in stages:
+            lines.append(f'{PREFIX}_stage_errors_total{{stage="{name}"}} {stage.errors}')
+
+        metric('stage_seconds', 'histogram', 'Sampled stage latency.')
+        bounds_ns = [int(bound * 1e9) for bound in EXPORT_BUCKETS]
+        for name, stage in stages:
+            h = stage.histogram
+            for bound, count in zip(EXPORT_BUCKETS, h.cumulative(bounds_ns)):
+                lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {h.count}')
+            lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{name}"}} {h.total / 1e9:.9f}')
+            lines.append(f'{PREFIX}_stage_seconds_count{{stage="{name}"}} {h.count}')
+
+        if self.counters:
+            metric('events_total', 'counter', 'Named event counters.')
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'{PREFIX}_events_total{{event="{name}"}} {value}')
+
+        caches = sorted(self.caches.items())
+        if caches:
+            for field in ('hits', 'misses', 'evictions', 'expirations'):
+                metric(f'cache_{field}_total', 'counter', f'Cache {field}.')
+                for name, cache in caches:
+                    lines.append(f'{PREFIX}_cache_{field}_total{{cache="{name}"}} {getattr(cache.stats, field)}')
+            metric('cache_hit_ratio', 'gauge', 'Cache hits / lookups.')
+            for name, cache in caches:
+                lines.append(f'{PREFIX}_cache_hit_ratio{{cache="{name}"}} {cache.stats.hit_ratio:.6f}')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port=9464, host='127.0.0.1'):
+        """Serve Prometheus text on http://host:port/metrics from a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/metrics.json'):
+                    self.send_error(404)
+                    return
+                if self.path.startswith('/metrics.json'):
+                    body, kind = json.dumps(metrics.snapshot()).encode('utf-8'), 'application/json'
+                else:
+                    body, kind = metrics.to_prometheus().encode('utf-8'), 'text/plain; version=0.0.4'
+                self.send_response(200)
+                self.send_header('Content-Type', kind)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+        return server
+
+
+METRICS = Metrics()
+timer = METRICS.timer
+timed = METRICS.timed
+incr = METRICS.incr
+
+
+if __name__ == '__main__':
+    import sys
+
+    from context_retrieval import ContextRetriever
+    from metrics import METRICS  # the instance the instrumented modules imported, not __main__'s
+
+    METRICS.set_sample_rate(1.0)
+    retriever = ContextRetriever()
+    queries = sys.argv[1:] or ['heat pumps', 'direct air capture jobs', 'green hydrogen electrolyzers']
+    for _ in range(50):
+        for query in queries:
+            retriever.retrieve(query)
+    print(METRICS.to_prometheus())
+    print(json.dumps(METRICS.snapshot()['stages'], indent=2))
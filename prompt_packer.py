@@ -0,0 +1,298 @@
+"""
+Token-budgeted prompt context from pre-rendered snippets.
+
+`buildPrompt` / `formatCategoryContext` in server.js concatenate markdown
+for every request, hard-code the sector emissions table that
+CLIMATE_TAXONOMY already holds, and have no notion of prompt size.
+`PromptPacker` renders one compact snippet per taxonomy node (and per job,
+when given a corpus) once at build time and stores its token count.
+Per request, `pack` ranks the snippets a ContextBundle points at, plus any
+matched jobs. It greedily keeps the most relevant ones that fit the budget,
+then joins them in section order. Assembly is a sort and a join.
+
+Token counts are an offline estimate (word pieces of about four characters,
+one per punctuation mark). They track Gemini's tokenizer closely enough for
+budgeting without a network call.
+
+Usage:
+    packer = PromptPacker(jobs=list(iter_jobs('climate_jobs_v6.json')))
+    packed = packer.pack(retriever.retrieve(query), jobs=[(job_id, score), ...], budget=1200)
+    packed.text, packed.tokens
+    python3 prompt_packer.py "heat pump jobs" --budget 800
+    python3 prompt_packer.py --export prompt_snippets.json
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+
+from category_index import job_category_paths
+from metrics import timed
+from taxonomy import Imperative, Moonshot, OpportunityArea, Sector, TechCluster, load_taxonomy
+
+DEFAULT_BUDGET = 1500
+DESCRIPTION_CHARS = 160
+SNIPPET_KEYWORDS = 6
+
+# Section order in the packed prompt: (section, header). Headers are charged
+# against the budget only when their section gets at least one snippet.
+SECTIONS = (
+    ('sectors', '**Relevant Sectors:**'),
+    ('opportunity_areas', '**Detected Climate Categories:**'),
+    ('imperatives', '**Relevant Innovation Imperatives:**'),
+    ('moonshots', '**Relevant Moonshot Technologies:**'),
+    ('tech_categories', '**Relevant Technologies:**'),
+    ('related_areas', '**Related Areas:**'),
+    ('jobs', 'POSITION | COMPANY | LOCATION | CLIMATE CATEGORIES | LEVEL | APPLY\n--- | --- | --- | --- | --- | ---'),
+)
+
+# Relevance of the n-th (0-based) entry of a section is weight / (1 + n).
+SECTION_WEIGHTS = {
+    'opportunity_areas': 1.0,
+    'imperatives': 0.9,
+    'jobs': 0.85,
+    'tech_categories': 0.8,
+    'moonshots': 0.7,
+    'sectors': 0.6,
+    'related_areas': 0.4,
+}
+
+_KIND_SECTION = {
+    Sector: 'sectors',
+    OpportunityArea: 'opportunity_areas',
+    Imperative: 'imperatives',
+    Moonshot: 'moonshots',
+    TechCluster: 'tech_categories',
+}
+
+_PIECES = re.compile(r'\w+|[^\w\s]')
+_TABLE_UNSAFE = re.compile(r'[^\w\s,-]')
+
+
+def estimate_tokens(text):
+    """Approximate LLM token count: ~4 characters per word piece, 1 per punctuation mark."""
+    return sum(math.ceil(len(piece) / 4) for piece in _PIECES.findall(text))
+
+
+def _clip(text, limit=DESCRIPTION_CHARS):
+    text = ' '.join((text or '').split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(' ', 1)[0].rstrip(',;:') + '…'
+
+
+# ============================================================================
+# Snippets
+# ============================================================================
+
+class Snippet:
+    __slots__ = ('key', 'section', 'text', 'tokens')
+
+    def __init__(self, key, section, text):
+        self.key = key
+        self.section = section
+        self.text = text
+        self.tokens = estimate_tokens(text) + 1  # + the joining newline
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def render_emissions_table(taxonomy):
+    """The sector emissions table buildPrompt hard-codes, rendered from the taxonomy."""
+    lines = ['**EMISSIONS IMPACT BY SECTOR (2050 projections):**']
+    ranked = sorted(taxonomy.sectors, key=lambda sector: (-sector.emissions_gt, sector.id))
+    for rank, sector in enumerate(ranked, 1):
+        areas = ', '.join(area.name for area in sector.opportunity_areas[:3])
+        if sector.emissions_gt:
+            share = f'{sector.emissions_gt:g} Gt, {sector.impact_weight * 100:.1f}%'
+        else:
+            share = '0 Gt direct; removes rather than prevents emissions'
+        lines.append(f'{rank}. **{sector.name}** ({share}) - {areas}')
+    return '\n'.join(lines)
+
+
+def render_node(node):
+    if isinstance(node, Sector):
+        share = f'{node.emissions_gt:g} Gt by 2050, {node.impact_weight * 100:.1f}% of the total' \
+            if node.emissions_gt else 'carbon removal, applies across sectors'
+        return f'- **{node.name}** ({share}): {_clip(node.description)}'
+    if isinstance(node, OpportunityArea):
+        return f'- **{node.path}**: {_clip(node.description)}'
+    detail = _clip(node.description) if node.description else ''
+    if isinstance(node, TechCluster) and node.readiness:
+        detail = f'{node.readiness} readiness'
+    keywords = ', '.join(node.keywords[:SNIPPET_KEYWORDS])
+    parts = [f'- {node.name} ({node.opportunity_area.name})']
+    if detail:
+        parts.append(f': {detail}')
+    if keywords:
+        parts.append(f' [{keywords}]')
+    return ''.join(parts)
+
+
+def render_job(taxonomy, job):
+    """One row of formatJobsTable's category layout."""
+    def clean(value, fallback):
+        return ' '.join(_TABLE_UNSAFE.sub('', value or fallback).split())
+
+    categories = ', '.join(path.split(' > ')[-1] for path in job_category_paths(taxonomy, job)[:2]) or 'Various'
+    return ' | '.join((
+        clean(job.get('title'), 'Untitled'),
+        clean(job.get('company'), 'Unknown'),
+        clean(job.get('location'), 'Not specified'),
+        clean(categories, 'Various'),
+        clean(job.get('experience_level'), 'Various'),
+        job.get('url') or '',
+    ))
+
+
+# ============================================================================
+# Packing
+# ============================================================================
+
+class PackedContext:
+    __slots__ = ('text', 'tokens', 'budget', 'included', 'dropped')
+
+    def __init__(self, text, tokens, budget, included, dropped):
+        self.text = text
+        self.tokens = tokens
+        self.budget = budget
+        self.included = tuple(included)
+        self.dropped = dropped
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class PromptPacker:
+    """Pre-rendered taxonomy / job snippets and a greedy token-budget packer."""
+
+    def __init__(self, taxonomy=None, jobs=None):
+        self.taxonomy = taxonomy or load_taxonomy()
+        self.emissions_table = Snippet('emissions_table', 'preamble', render_emissions_table(self.taxonomy))
+        self.headers = {section: Snippet(f'header:{section}', section, header) for section, header in SECTIONS}
+        self.node_snippets = [
+            Snippet(f'node:{node.id}', _KIND_SECTION[type(node)], render_node(node)) for node in self.taxonomy.nodes
+        ]
+        self._by_path = {node.path: self.node_snippets[node.id] for node in self.taxonomy.nodes}
+        self.job_snippets = []
+        if jobs is not None:
+            self.add_jobs(jobs)
+
+    def add_jobs(self, jobs):
+        """Render job rows; job ids continue from the rows already added."""
+        for job in jobs:
+            job_id = len(self.job_snippets)
+            self.job_snippets.append(Snippet(f'job:{job_id}', 'jobs', render_job(self.taxonomy, job)))
+
+    def _candidates(self, bundle, jobs, weights):
+        """(relevance, order, section, snippet) for every snippet the request points at."""
+        found = {}
+        order = 0
+        if bundle is not None:
+            for section, _ in SECTIONS:
+                if section == 'jobs':
+                    continue
+                for rank, path in enumerate(getattr(bundle, section, ())):
+                    snippet = self._by_path.get(path)
+                    if snippet is None:
+                        node = self.taxonomy.node(path)
+                        if node is None:
+                            continue
+                        snippet = self.node_snippets[node.id]
+                    relevance = weights[section] / (1 + rank)
+                    if snippet.key not in found or found[snippet.key][0] < relevance:
+                        found[snippet.key] = (relevance, order, section, snippet)
+                    order += 1
+        for rank, item in enumerate(jobs or ()):
+            job_id = item[0] if isinstance(item, tuple) else item
+            if 0 <= job_id < len(self.job_snippets):
+                snippet = self.job_snippets[job_id]
+                found.setdefault(snippet.key, (weights['jobs'] / (1 + rank), order, 'jobs', snippet))
+                order += 1
+        return sorted(found.values(), key=lambda item: (-item[0], item[1]))
+
+    @timed('prompt.pack')
+    def pack(self, bundle=None, jobs=(), budget=DEFAULT_BUDGET, include_emissions_table=True, weights=None):
+        """Most relevant snippets for `bundle` (a ContextBundle) and `jobs` ([job_id] or [(job_id, score)])
+        that fit `budget` tokens, grouped by section.
+
+        `weights` overrides entries of SECTION_WEIGHTS, e.g. {'jobs': 2.0} when the user asked for listings.
+        """
+        chosen = {section: [] for section, _ in SECTIONS}
+        with_table = include_emissions_table and self.emissions_table.tokens <= budget
+        used = self.emissions_table.tokens if with_table else 0
+        candidates = self._candidates(bundle, jobs, {**SECTION_WEIGHTS, **(weights or {})})
+        dropped = 0
+        for _, order, section, snippet in candidates:
+            cost = snippet.tokens
+            if not chosen[section]:
+                cost += self.headers[section].tokens
+            if used + cost > budget:
+                dropped += 1
+                continue
+            used += cost
+            chosen[section].append((order, snippet))
+
+        blocks = [self.emissions_table.text] if with_table else []
+        included = []
+        for section, _ in SECTIONS:
+            entries = sorted(chosen[section], key=lambda item: item[0])
+            if not entries:
+                continue
+            lines = [self.headers[section].text]
+            for _, snippet in entries:
+                lines.append(snippet.text)
+                included.append(snippet.key)
+            blocks.append('\n'.join(lines))
+        return PackedContext('\n\n'.join(blocks), used, budget, included, dropped)
+
+    def export(self):
+        """Every snippet as JSON-ready dicts, for consumers outside Python."""
+        return {
+            'taxonomy_hash': self.taxonomy.content_hash,
+            'emissions_table': self.emissions_table.as_dict(),
+            'headers': {section: snippet.as_dict() for section, snippet in self.headers.items()},
+            'nodes': {node.path: self.node_snippets[node.id].as_dict() for node in self.taxonomy.nodes},
+            'jobs': [snippet.as_dict() for snippet in self.job_snippets],
+        }
+
+
+def main(argv=None):
+    from bm25_search import BM25Index
+    from context_retrieval import ContextRetriever
+    from job_ingest import iter_jobs
+
+    parser = argparse.ArgumentParser(description='Pack taxonomy and job context for a chat prompt.')
+    parser.add_argument('query', nargs='?', default='How do heat pumps cut building emissions?')
+    parser.add_argument('--input', default='climate_jobs_v6.json')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET, help='token budget for the context')
+    parser.add_argument('--jobs', type=int, default=10, help='BM25 job matches offered to the packer')
+    parser.add_argument('--job-weight', type=float, default=None, help='override the jobs section weight')
+    parser.add_argument('--export', default=None, help='write every pre-rendered snippet to this JSON file')
+    args = parser.parse_args(argv)
+
+    jobs = list(iter_jobs(args.input))
+    packer = PromptPacker(jobs=jobs)
+    if args.export:
+        with open(args.export, 'w', encoding='utf-8') as f:
+            json.dump(packer.export(), f, ensure_ascii=False)
+        total = sum(s.tokens for s in packer.node_snippets) + sum(s.tokens for s in packer.job_snippets)
+        print(f'✅ {len(packer.node_snippets)} node + {len(packer.job_snippets)} job snippets '
+              f'(~{total:,} tokens) -> {args.export}', file=sys.stderr)
+        return
+
+    bundle = ContextRetriever(packer.taxonomy).retrieve(args.query)
+    matches = BM25Index.from_jobs(jobs).search(args.query, k=args.jobs)
+    weights = {'jobs': args.job_weight} if args.job_weight is not None else None
+    packed = packer.pack(bundle, matches, args.budget, weights=weights)
+    print(packed.text)
+    print(f'\n🎯 {packed.tokens}/{packed.budget} tokens, {len(packed.included)} snippets, '
+          f'{packed.dropped} dropped', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
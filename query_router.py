@@ -0,0 +1,294 @@
+"""
+Single-pass query router: intent plus taxonomy and major entities.
+
+For each /api/chat message server.js does several separate scans:
+`detectJobQuery` runs `includes` over its advice and job phrase lists,
+`filterQuery` repeats it for climate / off-topic terms, `searchJobs`
+applies a "jobs in ..." regex, and keyword and category detection loop over
+the taxonomy again. `QueryRouter` compiles all of these into one
+Aho-Corasick automaton: the phrase lists, every CLIMATE_TAXONOMY node name
+and keyword, and every major name and alias. A message is normalized and
+scanned once. The route says what the user wants (off_topic / advice /
+job_search / major / category / general) and carries every entity found.
+
+Phrases keep the JS substring feel but must start on a word ("learn" fires
+in "learning", "why" does not fire in "anyhow"). Entities must match whole
+words, like KeywordMatcher. Major aliases shorter than four characters
+("ME", "EE", "CE") are left out: in lowercased chat text they collide with
+ordinary words.
+
+With a FuzzyLookup, unknown words are typo-corrected and the message is
+routed once more; the corrected reading wins when it finds entities the raw
+text did not ("perovskit jobs" -> "perovskite jobs").
+
+Usage:
+    router = QueryRouter(fuzzy=FuzzyLookup.from_sources())
+    route = router.route("Show me jobs in direct air capture")
+    route.intent, route.nodes, route.category_query
+    python3 query_router.py "I studied chemical engineering, what can I do?"
+"""
+
+import argparse
+import json
+import re
+import sys
+
+from keyword_matcher import AhoCorasick
+from metrics import timed
+from taxonomy import load_taxonomy, normalize_name
+
+# Same lists as detectJobQuery / filterQuery / searchJobs in server.js.
+ADVICE_PHRASES = (
+    'how do i', 'how can i', 'how to', 'what should i', 'what can i do',
+    'advice', 'help me', 'guide', 'tips', 'suggestions',
+    'transition', 'break into', 'get started', 'learn',
+    'what is', 'explain', 'tell me about', 'describe',
+    'why', 'when', 'where should', 'which skills',
+)
+JOB_PHRASES = (
+    'show me jobs', 'find jobs', 'list jobs', 'search jobs',
+    'show me positions', 'find positions', 'list positions',
+    'show me roles', 'find roles', 'list roles',
+    'job openings', 'job opportunities', 'job listings',
+    'available jobs', 'available positions', 'available roles',
+    'looking for a job', 'looking for jobs', 'looking for positions',
+    'searching for jobs', 'searching for positions',
+    'find me a job', 'find me jobs', 'show me a job',
+    'what jobs', 'which jobs', 'any jobs',
+    # Additional user-specified phrases
+    'find a job', 'look for a job', 'search for a job',
+    'open positions', 'who is hiring', 'companies hiring',
+    'hiring near me', 'apply for a job', 'any jobs for',
+    # List/table request phrases
+    'a list of jobs', 'list of jobs', 'a table of jobs', 'table of jobs',
+    'give me a list', 'show me a list', 'give me a table', 'show me a table',
+    # "Can you give me" phrases for jobs
+    'can you give me a job', 'can you give me jobs',
+    'can you give me an excel of jobs', 'give me a job', 'give me jobs',
+    'give me an excel of jobs',
+    # Internship-specific phrases
+    'show me internships', 'find internships', 'list internships', 'search internships',
+    'internship openings', 'internship opportunities', 'internship listings',
+    'available internships', 'looking for an internship', 'looking for internships',
+    'searching for internships', 'find me an internship', 'find me internships',
+    'show me an internship', 'what internships', 'which internships', 'any internships',
+    'can you give me an internship', 'can you give me internships',
+    'can you give me an excel of internships', 'give me an internship', 'give me internships',
+    'give me an excel of internships',
+    'a list of internships', 'list of internships', 'a table of internships', 'table of internships',
+    # Executive/senior level job searches
+    'executive jobs', 'executive-level jobs', 'executive level jobs', 'senior jobs', 'senior-level jobs',
+    'leadership jobs', 'leadership positions', 'c-suite jobs', 'director jobs', 'vp jobs',
+    'what executive jobs', 'what senior jobs', 'what leadership jobs',
+    'jobs can i look at', 'positions can i look at', 'roles can i look at',
+    'what jobs can i', 'what positions can i', 'what roles can i',
+    # Category-specific job searches
+    'jobs among these categories', 'jobs in these categories', 'positions in these categories',
+    'jobs among', 'positions among', 'roles among',
+    'give me some jobs', 'show me some jobs', 'find me some jobs',
+    'jobs in advanced materials', 'jobs in fusion', 'jobs in direct air capture',
+    'jobs in battery', 'jobs in novel battery', 'jobs in carbon capture',
+)
+CLIMATE_TERMS = (
+    'climate', 'carbon', 'emission', 'renewable', 'clean energy',
+    'sustainability', 'decarbonization', 'net zero', 'greenhouse gas',
+)
+OFF_TOPIC_TERMS = ('weather', 'recipe', 'movie', 'game', 'sports')
+# searchJobs' /(?:show me jobs in|jobs in|find jobs in|list jobs in)\s+(.+)/
+CATEGORY_PREFIXES = ('show me jobs in', 'jobs in', 'find jobs in', 'list jobs in')
+# filterQuery only calls a message off-topic when it is longer than this.
+OFF_TOPIC_MIN_LENGTH = 10
+MIN_ALIAS_LENGTH = 4
+
+PHRASE_ROLES = {
+    'advice': ADVICE_PHRASES,
+    'job': JOB_PHRASES,
+    'climate': CLIMATE_TERMS,
+    'off_topic': OFF_TOPIC_TERMS,
+    'category_prefix': CATEGORY_PREFIXES,
+}
+ENTITY_ROLES = frozenset(('name', 'keyword', 'major'))
+
+# Node relevance per hit, as in ContextRetriever: a name counts double a keyword.
+NAME_WEIGHT = 2
+KEYWORD_WEIGHT = 1
+
+INTENTS = ('off_topic', 'advice', 'job_search', 'major', 'category', 'general')
+
+
+class Route:
+    """What one message asks for and every entity it mentions."""
+
+    __slots__ = ('query', 'intent', 'phrases', 'nodes', 'keywords', 'majors', 'category_query', 'corrections')
+
+    def __init__(self, query, intent, phrases, nodes, keywords, majors, category_query, corrections=None):
+        self.query = query
+        self.intent = intent
+        self.phrases = phrases            # role -> tuple of matched phrases
+        self.nodes = tuple(nodes)         # taxonomy nodes, most relevant first
+        self.keywords = keywords          # matched keyword -> tuple of leaves
+        self.majors = tuple(majors)
+        self.category_query = category_query
+        self.corrections = corrections or {}  # typo -> vocabulary word, when the fuzzy fallback ran
+
+    @property
+    def is_job_search(self):
+        return self.intent == 'job_search'
+
+    def as_dict(self):
+        return {
+            'query': self.query,
+            'intent': self.intent,
+            'phrases': {role: list(found) for role, found in self.phrases.items()},
+            'nodes': [node.path for node in self.nodes],
+            'keywords': sorted(self.keywords),
+            'majors': [major.display for major in self.majors],
+            'category_query': self.category_query,
+            'corrections': self.corrections,
+        }
+
+
+def _word_char(ch):
+    return ch.isalnum()
+
+
+_RAW_WORD = re.compile(r'[a-z0-9]+', re.IGNORECASE)
+
+
+def _raw_end(query, words):
+    """Offset in the raw query just past its first `words` normalize_name words."""
+    end = 0
+    for _, match in zip(range(words), _RAW_WORD.finditer(query)):
+        end = match.end()
+    return end
+
+
+class QueryRouter:
+    """`fuzzy` (a fuzzy_lookup.FuzzyLookup) enables the typo-correction retry."""
+
+    def __init__(self, taxonomy=None, majors=None, fuzzy=None):
+        self.taxonomy = taxonomy or load_taxonomy()
+        self.fuzzy = fuzzy
+        if majors is None:
+            from major_index import load_majors
+            majors = load_majors()
+        self.majors = majors
+
+        entries = {}  # normalized pattern -> [(role, value)]
+
+        def add(pattern, role, value):
+            key = normalize_name(pattern)
+            if key:
+                entries.setdefault(key, []).append((role, value))
+
+        for role, phrases in PHRASE_ROLES.items():
+            for phrase in phrases:
+                add(phrase, role, phrase)
+        # Words of the intent phrases are never "corrected" into taxonomy jargon.
+        self.phrase_words = frozenset(word for phrases in PHRASE_ROLES.values()
+                                      for phrase in phrases for word in normalize_name(phrase).split())
+        for node in self.taxonomy.nodes:
+            add(node.name, 'name', node)
+        for keyword, leaves in self.taxonomy.keyword_index.items():
+            add(keyword, 'keyword', (keyword, leaves))
+        for major in majors:
+            for spelling in dict.fromkeys((major.name, major.display) + major.aliases):
+                if spelling in (major.name, major.display) or len(spelling) >= MIN_ALIAS_LENGTH:
+                    add(spelling, 'major', major)
+
+        # Boundaries are checked per role below, so the automaton itself matches raw substrings.
+        self.automaton = AhoCorasick(((key, tuple(values)) for key, values in entries.items()),
+                                     word_boundary=False)
+
+    def __len__(self):
+        return len(self.automaton)
+
+    @timed('router.route')
+    def route(self, query):
+        route = self._route(query, normalize_name(query))
+        if self.fuzzy is None:
+            return route
+        corrected, corrections = self.fuzzy.correct(query, self.phrase_words)
+        if corrections:
+            retry = self._route(query, corrected)
+            # Keep the corrected reading only when it finds entities the raw text did not.
+            if not {node.id for node in retry.nodes} <= {node.id for node in route.nodes} \
+                    or len(retry.majors) > len(route.majors):
+                retry.corrections = corrections
+                return retry
+        return route
+
+    def _route(self, query, text):
+        length = len(text)
+        patterns = self.automaton.patterns
+
+        phrases = {role: {} for role in PHRASE_ROLES}
+        scores, keywords, majors = {}, {}, {}
+        category_end = None
+        for start, end, index in self.automaton.iter_matches(text):
+            key, values = patterns[index]
+            starts_word = start == 0 or not _word_char(text[start - 1])
+            if not starts_word:
+                continue
+            whole_word = end == length or not _word_char(text[end])
+            for role, value in values:
+                if role in ENTITY_ROLES and not whole_word:
+                    continue
+                if role == 'name':
+                    scores[value.id] = scores.get(value.id, 0) + NAME_WEIGHT
+                elif role == 'keyword':
+                    keyword, leaves = value
+                    keywords[keyword] = leaves
+                    for leaf in leaves:
+                        scores[leaf.id] = scores.get(leaf.id, 0) + KEYWORD_WEIGHT
+                elif role == 'major':
+                    majors[value.id] = value
+                else:
+                    phrases[role][value] = None
+                    if role == 'category_prefix' and whole_word:
+                        category_end = end if category_end is None else min(category_end, end)
+
+        nodes = [self.taxonomy.nodes[node_id] for node_id in sorted(scores, key=lambda i: (-scores[i], i))]
+        category_query = None
+        if category_end is not None:
+            # Slice the raw query: CategoryIndex.search needs the ">" and "&" of a category path.
+            category_query = query[_raw_end(query, len(text[:category_end].split())):].strip()
+        phrases = {role: tuple(found) for role, found in phrases.items() if found}
+        intent = self._intent(query, phrases, nodes, majors)
+        return Route(query, intent, phrases, nodes, keywords, majors.values(), category_query or None)
+
+    @staticmethod
+    def _intent(query, phrases, nodes, majors):
+        climate = 'climate' in phrases or bool(nodes)
+        if not climate and len(query) > OFF_TOPIC_MIN_LENGTH and 'off_topic' in phrases:
+            return 'off_topic'
+        if 'advice' in phrases:
+            return 'advice'  # detectJobQuery: advice wording wins over job wording
+        if 'job' in phrases:
+            return 'job_search'
+        if majors:
+            return 'major'
+        if nodes:
+            return 'category'
+        return 'general'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Route a chat message: intent plus entities.')
+    parser.add_argument('query', nargs='+')
+    parser.add_argument('--no-fuzzy', action='store_true', help='skip the typo-correction fallback')
+    args = parser.parse_args(argv)
+
+    fuzzy = None
+    if not args.no_fuzzy:
+        from fuzzy_lookup import FuzzyLookup
+        from job_ingest import iter_jobs
+        fuzzy = FuzzyLookup.from_sources(jobs=iter_jobs('climate_jobs_v6.json'))
+    router = QueryRouter(fuzzy=fuzzy)
+    route = router.route(' '.join(args.query))
+    print(json.dumps(route.as_dict(), indent=2, ensure_ascii=False))
+    print(f'🔍 {route.intent} ({len(router)} patterns compiled)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
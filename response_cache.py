@@ -0,0 +1,296 @@
+"""
+Local response cache in front of the Gemini generateContent call.
+
+Every /api/chat message costs a full round trip to
+gemini-2.5-flash:generateContent, and many messages are paraphrases of the
+same question. `ResponseCache` keys an answer on four things: the
+normalized query, the router intent, the set of taxonomy nodes it matched,
+and a hash of the packed prompt context. Lookups come in two kinds:
+
+    exact   same normalized query, intent, nodes and context hash
+    near    same intent, nodes and context hash, and the query's hashed
+            character trigram vector within `threshold` cosine of a cached one
+
+Requiring the same nodes and context means a near hit only reuses an answer
+written for the same taxonomy facts and job table. Paraphrase detection
+therefore cannot leak an answer about batteries into a question about
+cement. Requiring the same intent keeps "What is Energy Storage?" from
+being answered with a cached "Show me jobs in Energy Storage" listing.
+Entries live in an LRUCache (size bound plus per-entry TTL), so eviction
+and counters match the other query-time caches; the near-hit index is swept
+of evicted entries whenever it outgrows twice the cache size.
+
+`GeminiClient` is a minimal urllib client for the same endpoint server.js
+calls; point `url` at benchmarks/stub_llm.py to measure hit rate and latency
+saved without an API key.
+
+Usage:
+    cache = ResponseCache()
+    client = GeminiClient()
+    text, how = cache.get_or_call(query, bundle_nodes(bundle), packed.text,
+                                  lambda: client.generate(prompt), route.intent)
+    python3 -m benchmarks.stub_llm --latency 0.8
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+
+from cache import LRUCache
+from context_retrieval import normalize_query
+from metrics import METRICS, incr, timed
+
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_TTL = 6 * 60 * 60
+DEFAULT_THRESHOLD = 0.82
+NGRAM_SIZE = 3
+NGRAM_DIMS = 1 << 12
+
+GEMINI_API_URL = os.environ.get(
+    'GEMINI_API_URL',
+    'https://generativelanguage.googleapis.com/v1/models/gemini-2.5-flash:generateContent',
+)
+GEMINI_TIMEOUT = 60
+
+# Function words carry no meaning for paraphrase matching ("what are the jobs in solar" ~ "solar jobs").
+STOPWORDS = frozenset(
+    'a an and are about any can could do does for from give how i in is it me my of on or show '
+    'tell that the there to what which with would you your'.split()
+)
+
+_WORDS = re.compile(r'[a-z0-9]+')
+
+
+# ============================================================================
+# Query vectors
+# ============================================================================
+
+def ngram_vector(text, n=NGRAM_SIZE, dims=NGRAM_DIMS):
+    """L2-normalized {bucket: weight} of hashed character n-grams per content word.
+
+    Words are padded ("␣solar␣") and n-grams are taken per word, so word
+    order does not matter and a plural still shares most n-grams with its
+    singular.
+    """
+    counts = {}
+    for word in _WORDS.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        padded = f' {word} '
+        for i in range(max(1, len(padded) - n + 1)):
+            bucket = zlib.crc32(padded[i:i + n].encode()) % dims
+            counts[bucket] = counts.get(bucket, 0) + 1
+    norm = math.sqrt(sum(v * v for v in counts.values()))
+    return {bucket: v / norm for bucket, v in counts.items()} if norm else {}
+
+
+def cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(bucket, 0.0) for bucket, weight in a.items())
+
+
+def context_hash(text):
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()[:16]
+
+
+def node_set(nodes):
+    """Canonical key part for matched taxonomy nodes (paths, ids or Node objects)."""
+    return tuple(sorted({getattr(node, 'path', node) for node in nodes or ()}, key=str))
+
+
+def bundle_nodes(bundle):
+    """Matched node paths of a ContextBundle."""
+    return bundle.sectors + bundle.opportunity_areas + bundle.imperatives + bundle.moonshots + bundle.tech_categories
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class ResponseStats:
+    __slots__ = ('exact_hits', 'near_hits', 'misses', 'calls', 'saved_seconds')
+
+    def __init__(self):
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.calls = 0
+        self.saved_seconds = 0.0
+
+    @property
+    def hit_ratio(self):
+        lookups = self.exact_hits + self.near_hits + self.misses
+        return (self.exact_hits + self.near_hits) / lookups if lookups else 0.0
+
+    def as_dict(self):
+        return {
+            'exact_hits': self.exact_hits,
+            'near_hits': self.near_hits,
+            'misses': self.misses,
+            'calls': self.calls,
+            'hit_ratio': round(self.hit_ratio, 4),
+            'saved_seconds': round(self.saved_seconds, 3),
+        }
+
+
+class CachedResponse:
+    __slots__ = ('text', 'query', 'vector', 'latency')
+
+    def __init__(self, text, query, vector, latency):
+        self.text = text
+        self.query = query
+        self.vector = vector
+        self.latency = latency
+
+
+class ResponseCache:
+    """Exact + near-duplicate LLM response cache over an LRUCache."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, ttl=DEFAULT_TTL, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.entries = LRUCache(maxsize, ttl)
+        self.stats = ResponseStats()
+        METRICS.register_cache('response', self.entries)
+        self._groups = {}  # (intent, nodes, context hash) -> {normalized query: None}, insertion ordered
+        self._grouped = 0  # queries across all groups, live or not
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def key(query, nodes=(), context='', intent=None):
+        """(normalized query, intent, node set, context hash)."""
+        return normalize_query(query), intent, node_set(nodes), context_hash(context)
+
+    @timed('response_cache.lookup')
+    def lookup(self, query, nodes=(), context='', intent=None):
+        """(text, 'exact' | 'near') for a cached answer, or None."""
+        normalized, intent, nodes, ctx = key = self.key(query, nodes, context, intent)
+        entry = self.entries.get(key, count=False)
+        if entry is not None:
+            self._hit('exact', entry)
+            return entry.text, 'exact'
+
+        vector = ngram_vector(normalized)
+        best, best_score = None, self.threshold
+        with self._lock:
+            group = self._groups.get((intent, nodes, ctx), {})
+            stale = []
+            for other in group:
+                candidate = self.entries.get((other, intent, nodes, ctx), count=False)
+                if candidate is None:
+                    stale.append(other)  # evicted or expired
+                    continue
+                score = cosine(vector, candidate.vector)
+                if score >= best_score:
+                    best, best_score = candidate, score
+            for other in stale:
+                del group[other]
+            self._grouped -= len(stale)
+            if stale and not group:
+                del self._groups[(intent, nodes, ctx)]
+        if best is not None:
+            self._hit('near', best)
+            return best.text, 'near'
+        self.stats.misses += 1
+        self.entries.stats.misses += 1
+        incr('response_cache.miss')
+        return None
+
+    def _hit(self, kind, entry):
+        if kind == 'exact':
+            self.stats.exact_hits += 1
+        else:
+            self.stats.near_hits += 1
+        self.stats.saved_seconds += entry.latency
+        self.entries.stats.hits += 1
+        incr(f'response_cache.{kind}_hit')
+
+    def store(self, query, text, nodes=(), context='', latency=0.0, ttl=None, intent=None):
+        """Cache `text` for the key; `latency` is what a later hit saves (seconds)."""
+        normalized, intent, nodes, ctx = key = self.key(query, nodes, context, intent)
+        entry = CachedResponse(text, normalized, ngram_vector(normalized), latency)
+        if ttl is None:
+            self.entries.put(key, entry)
+        else:
+            self.entries.put(key, entry, ttl)
+        with self._lock:
+            group = self._groups.setdefault((intent, nodes, ctx), {})
+            if normalized not in group:
+                group[normalized] = None
+                self._grouped += 1
+                if self._grouped > 2 * self.entries.maxsize:
+                    self._sweep_groups()
+
+    def _sweep_groups(self):
+        """Drop evicted or expired queries, and emptied groups, from the near-hit index."""
+        for group_key in list(self._groups):
+            intent, nodes, ctx = group_key
+            group = self._groups[group_key]
+            for other in [q for q in group if (q, intent, nodes, ctx) not in self.entries]:
+                del group[other]
+            if not group:
+                del self._groups[group_key]
+        self._grouped = sum(len(group) for group in self._groups.values())
+
+    def get_or_call(self, query, nodes, context, call, intent=None):
+        """Cached answer or `call()`'s; returns (text, 'exact' | 'near' | 'miss').
+
+        `intent` is the QueryRouter intent; answers are only reused within one intent.
+        """
+        found = self.lookup(query, nodes, context, intent)
+        if found is not None:
+            return found
+        started = time.perf_counter()
+        text = call()
+        latency = time.perf_counter() - started
+        self.stats.calls += 1
+        self.store(query, text, nodes, context, latency, intent=intent)
+        return text, 'miss'
+
+    def clear(self):
+        self.entries.clear()
+        with self._lock:
+            self._groups.clear()
+            self._grouped = 0
+
+
+# ============================================================================
+# Gemini client
+# ============================================================================
+
+class GeminiError(RuntimeError):
+    pass
+
+
+class GeminiClient:
+    """POSTs a prompt to generateContent and returns the first candidate's text."""
+
+    def __init__(self, url=GEMINI_API_URL, api_key=None, timeout=GEMINI_TIMEOUT):
+        self.url = url
+        self.api_key = api_key if api_key is not None else os.environ.get('GEMINI_API_KEY', '')
+        self.timeout = timeout
+
+    @timed('llm.generate')
+    def generate(self, prompt):
+        body = json.dumps({'contents': [{'parts': [{'text': prompt}]}]}).encode('utf-8')
+        url = f'{self.url}?key={self.api_key}' if self.api_key else self.url
+        request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = json.loads(response.read())
+        except urllib.error.HTTPError as error:
+            raise GeminiError(f'Gemini API error {error.code}: {error.read()[:500]!r}') from error
+        try:
+            return data['candidates'][0]['content']['parts'][0]['text']
+        except (KeyError, IndexError, TypeError) as error:
+            raise GeminiError(f'unexpected Gemini response: {str(data)[:500]}') from error
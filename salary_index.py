@@ -0,0 +1,237 @@
+"""
+Annualized salary normalization and interval queries over pay ranges.
+
+Jobs store `salary_min` / `salary_max` in the unit given by `salary_type`
+("hourly" or "yearly"), often with only one bound. `normalize_salary`
+turns every posting into an annual (low, high) pair. Some "yearly" figures
+are really monthly (Omnidian's Costa Rica roles list 1400-3000); those are
+annualized x12. `IntervalIndex` keeps
+paired arrays (intervals sorted by low and by high), so "ranges overlapping
+$X-$Y" is two bisects:
+
+    overlapping = #(low <= Y) - #(high < X)
+
+(an interval cannot lie entirely below X and entirely above Y at once).
+`SalaryIndex` keeps one IntervalIndex per taxonomy node as well as a global
+one. "Overlapping $X-$Y in sector S" is therefore logarithmic too, and
+`filter_postings` combines a pay range with CategoryIndex posting lists
+without touching the rest of the corpus.
+
+Usage:
+    salaries = SalaryIndex.from_jobs(iter_jobs('climate_jobs_v6.json'))
+    salaries.count(80000, 120000, path='Electricity')
+    salaries.job_ids(80000, 120000, path='Transportation > Vehicle Electrification', order='pay')
+"""
+
+import argparse
+import math
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+from category_index import intersect, job_category_paths
+from metrics import timed
+from taxonomy import load_taxonomy
+
+HOURS_PER_YEAR = 2080
+MONTHS_PER_YEAR = 12
+# "yearly" figures below this are in thousands ("120" = $120k); "hourly" at or above it are already annual.
+THOUSANDS_CUTOFF = 1000
+# "yearly" figures from THOUSANDS_CUTOFF up to this are monthly pay, not an annual salary.
+MONTHLY_CUTOFF = 20000
+
+
+# ============================================================================
+# Normalization
+# ============================================================================
+
+def normalize_salary(job):
+    """Annual (low, high) for a job, or None when it lists no pay."""
+    values = [v for v in (job.get('salary_min'), job.get('salary_max'))
+              if isinstance(v, (int, float)) and not isinstance(v, bool) and v > 0]
+    if not values:
+        return None
+    low, high = min(values), max(values)
+    if job.get('salary_type') == 'hourly':
+        if high < THOUSANDS_CUTOFF:
+            low, high = low * HOURS_PER_YEAR, high * HOURS_PER_YEAR
+    elif high < THOUSANDS_CUTOFF:
+        low, high = low * 1000, high * 1000
+    elif high < MONTHLY_CUTOFF:
+        low, high = low * MONTHS_PER_YEAR, high * MONTHS_PER_YEAR
+    return round(low), round(high)
+
+
+def salary_midpoint(job):
+    salary = normalize_salary(job)
+    return None if salary is None else (salary[0] + salary[1]) / 2
+
+
+def with_annual_salary(job):
+    """Copy of `job` with `salary_annual_min` / `salary_annual_max` (None when unknown)."""
+    salary = normalize_salary(job)
+    return {
+        **job,
+        'salary_annual_min': salary[0] if salary else None,
+        'salary_annual_max': salary[1] if salary else None,
+    }
+
+
+# ============================================================================
+# Interval index
+# ============================================================================
+
+class IntervalIndex:
+    """Closed intervals [low, high] keyed by job id, as two sorted arrays."""
+
+    __slots__ = ('ids_by_low', 'lows', 'ids_by_high', 'highs', 'low_of', 'high_of')
+
+    def __init__(self, intervals):
+        """`intervals`: iterable of (job_id, low, high)."""
+        intervals = list(intervals)
+        by_low = sorted(intervals, key=lambda item: (item[1], item[0]))
+        by_high = sorted(intervals, key=lambda item: (item[2], item[0]))
+        self.ids_by_low = array('I', (item[0] for item in by_low))
+        self.lows = array('d', (item[1] for item in by_low))
+        self.ids_by_high = array('I', (item[0] for item in by_high))
+        self.highs = array('d', (item[2] for item in by_high))
+        self.low_of = {item[0]: item[1] for item in intervals}
+        self.high_of = {item[0]: item[2] for item in intervals}
+
+    def __len__(self):
+        return len(self.lows)
+
+    def _bounds(self, low, high):
+        low = -math.inf if low is None else low
+        high = math.inf if high is None else high
+        return low, high, bisect_right(self.lows, high), bisect_left(self.highs, low)
+
+    def count(self, low=None, high=None):
+        """Intervals overlapping [low, high] (None = unbounded), in O(log n)."""
+        _, _, starts_before, ends_before = self._bounds(low, high)
+        return max(0, starts_before - ends_before)
+
+    def ids(self, low=None, high=None, order='id'):
+        """Job ids overlapping [low, high].
+
+        order='id' returns them ascending (ready for posting-list
+        intersection); order='pay' returns them by range top, highest first.
+        Cost is O(log n + min(#starting <= high, #ending >= low)).
+        """
+        low, high, starts_before, ends_before = self._bounds(low, high)
+        if order == 'pay':
+            return [job_id for job_id in reversed(self.ids_by_high[ends_before:])
+                    if self.low_of[job_id] <= high]
+        if starts_before <= len(self.highs) - ends_before:
+            found = [job_id for job_id in self.ids_by_low[:starts_before] if self.high_of[job_id] >= low]
+        else:
+            found = [job_id for job_id in self.ids_by_high[ends_before:] if self.low_of[job_id] <= high]
+        found.sort()
+        return found
+
+    def contains(self, job_id, low=None, high=None):
+        start = self.low_of.get(job_id)
+        if start is None:
+            return False
+        return (high is None or start <= high) and (low is None or self.high_of[job_id] >= low)
+
+
+# ============================================================================
+# Per-node salary index
+# ============================================================================
+
+class SalaryIndex:
+    """Global and per-taxonomy-node IntervalIndexes over annualized pay."""
+
+    def __init__(self, taxonomy=None):
+        self.taxonomy = taxonomy or load_taxonomy()
+        self.size = 0
+        self.all = IntervalIndex(())
+        self.by_node = {}   # node id -> IntervalIndex
+        self.unknown = 0
+
+    @classmethod
+    def from_jobs(cls, jobs, taxonomy=None):
+        index = cls(taxonomy)
+        index.build(jobs)
+        return index
+
+    def build(self, jobs):
+        taxonomy = self.taxonomy
+        everything, per_node = [], {}
+        for job in jobs:
+            job_id = self.size
+            self.size += 1
+            salary = normalize_salary(job)
+            if salary is None:
+                self.unknown += 1
+                continue
+            interval = (job_id, salary[0], salary[1])
+            everything.append(interval)
+            node_ids = set()
+            for path in job_category_paths(taxonomy, job):
+                node = taxonomy.node(path)
+                if node is not None:
+                    node_ids.add(node.id)
+                    node_ids.update(ancestor.id for ancestor in node.ancestors())
+            for node_id in node_ids:
+                per_node.setdefault(node_id, []).append(interval)
+        self.all = IntervalIndex(everything)
+        self.by_node = {node_id: IntervalIndex(items) for node_id, items in per_node.items()}
+        return self
+
+    def _index(self, path):
+        if path is None:
+            return self.all
+        node = self.taxonomy.node(path)
+        return self.by_node.get(node.id) if node is not None else None
+
+    @timed('salary.count')
+    def count(self, low=None, high=None, path=None):
+        index = self._index(path)
+        return index.count(low, high) if index is not None else 0
+
+    @timed('salary.query')
+    def job_ids(self, low=None, high=None, path=None, order='id', limit=None):
+        index = self._index(path)
+        if index is None:
+            return []
+        ids = index.ids(low, high, order)
+        return ids[:limit] if limit is not None else ids
+
+    def filter_postings(self, postings, low=None, high=None):
+        """Ascending job ids from `postings` (e.g. CategoryIndex.query) whose pay overlaps [low, high].
+
+        Walks whichever side is smaller: the posting list, or the salary
+        matches (counted first in O(log n)).
+        """
+        if self.all.count(low, high) < len(postings):
+            return intersect(self.all.ids(low, high), postings)
+        return [job_id for job_id in postings if self.all.contains(job_id, low, high)]
+
+
+def main(argv=None):
+    from job_ingest import iter_jobs
+
+    parser = argparse.ArgumentParser(description='Query jobs by annualized salary range.')
+    parser.add_argument('input', nargs='?', default='climate_jobs_v6.json')
+    parser.add_argument('--min', type=float, default=None, help='range start (annual USD)')
+    parser.add_argument('--max', type=float, default=None, help='range end (annual USD)')
+    parser.add_argument('--path', default=None, help='taxonomy path, e.g. "Electricity"')
+    parser.add_argument('-n', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    jobs = list(iter_jobs(args.input))
+    salaries = SalaryIndex.from_jobs(jobs)
+    ids = salaries.job_ids(args.min, args.max, args.path, order='pay')
+    print(f'💰 {len(ids)} jobs overlap {args.min or 0:,.0f}-{args.max or math.inf:,.0f}'
+          f"{' in ' + args.path if args.path else ''} "
+          f'({salaries.unknown} of {salaries.size} list no pay)', file=sys.stderr)
+    for job_id in ids[:args.n]:
+        job = jobs[job_id]
+        low, high = normalize_salary(job)
+        print(f"   ${low:>9,} - ${high:>9,}  {job['title']} @ {job['company']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,387 @@
+"""
+Compiled, indexed object model for FULL_TAXONOMY.CLIMATE_TAXONOMY.
+
+CLIMATE_TAXONOMY is a nested list of dicts (sector -> opportunity_areas ->
+innovation_imperatives / moonshots / tech_categories). Walking it by hand for
+every keyword or job means a full-tree scan per query. `Taxonomy` walks it
+once at load time and builds O(1) lookup indexes by path, name, keyword and
+readiness so callers never have to.
+
+Usage:
+    from taxonomy import load_taxonomy
+    tax = load_taxonomy()
+    tax.node("Electricity > Energy Storage & Demand Flexibility")
+    tax.nodes_for_keyword("fast charging")
+    tax.clusters_by_readiness("Pilot")
+"""
+
+import hashlib
+import json
+import re
+from functools import lru_cache
+
+PATH_SEP = ' > '
+
+# Job impact-score multipliers (see Taxonomy.impact_score).
+IMPERATIVE_BOOST = 1.2
+TECH_CATEGORY_BOOST = 1.1
+
+# Bump whenever node or index layout changes; stale snapshots are then rebuilt.
+SCHEMA_VERSION = 2
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_name(name):
+    """Case- and punctuation-insensitive key for names and paths.
+
+    Job data spells sectors differently from the taxonomy ("GHG Removal" vs
+    "GHG REMOVAL", "Food, Agriculture & Nature" vs "Food, Agriculture, &
+    Nature"); both collapse to the same key here.
+    """
+    return _NON_ALNUM.sub(' ', (name or '').lower()).strip()
+
+
+def taxonomy_hash(raw):
+    """Content hash of a CLIMATE_TAXONOMY-shaped list, independent of formatting."""
+    canonical = json.dumps(raw, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def parse_emissions(value):
+    """'9.4 Gt' -> 9.4; blank or malformed -> 0.0."""
+    try:
+        return float(str(value or '').replace('Gt', '').strip() or 0)
+    except ValueError:
+        return 0.0
+
+
+def normalize_path(path):
+    """Normalize every segment of a "Sector > Area > Leaf" path."""
+    return PATH_SEP.join(normalize_name(part) for part in path.split(PATH_SEP))
+
+
+# ============================================================================
+# Node types
+# ============================================================================
+
+class Node:
+    """Base taxonomy node. `id` is the node's position in depth-first order.
+
+    `emissions_gt` is the node's share of its sector's 2050 emissions (split
+    evenly across siblings) and `impact_weight` is that share of the
+    taxonomy-wide total, so weights on any one level sum to 1.
+    """
+
+    __slots__ = ('id', 'kind', 'name', 'description', 'keywords', 'parent', 'path', 'depth',
+                 'emissions_gt', 'impact_weight')
+
+    kind_name = 'node'
+
+    def __init__(self, name, description='', keywords=(), parent=None):
+        self.id = -1
+        self.kind = self.kind_name
+        self.name = name
+        self.description = description or ''
+        self.keywords = tuple(keywords or ())
+        self.parent = parent
+        self.path = name if parent is None else parent.path + PATH_SEP + name
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.emissions_gt = 0.0
+        self.impact_weight = 0.0
+
+    @property
+    def sector(self):
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+
+    @property
+    def opportunity_area(self):
+        node = self
+        while node is not None and not isinstance(node, OpportunityArea):
+            node = node.parent
+        return node
+
+    def ancestors(self):
+        """Parents from the immediate one up to the sector."""
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self.path!r}>'
+
+
+class Sector(Node):
+    __slots__ = ('emissions_at_stake_2050', 'opportunity_areas')
+
+    kind_name = 'sector'
+
+    def __init__(self, name, description='', emissions_at_stake_2050=''):
+        super().__init__(name, description)
+        self.emissions_at_stake_2050 = emissions_at_stake_2050 or ''
+        self.opportunity_areas = []
+        self.emissions_gt = parse_emissions(emissions_at_stake_2050)
+
+
+class OpportunityArea(Node):
+    __slots__ = ('innovation_imperatives', 'moonshots', 'tech_categories', 'viable_solutions')
+
+    kind_name = 'opportunity_area'
+
+    def __init__(self, name, description='', parent=None, viable_solutions=()):
+        super().__init__(name, description, parent=parent)
+        self.innovation_imperatives = []
+        self.moonshots = []
+        self.tech_categories = []
+        self.viable_solutions = tuple(viable_solutions or ())
+
+    @property
+    def leaves(self):
+        return self.innovation_imperatives + self.moonshots + self.tech_categories
+
+
+class Imperative(Node):
+    __slots__ = ('related_resources',)
+
+    kind_name = 'innovation_imperative'
+
+    def __init__(self, name, description='', keywords=(), parent=None, related_resources=()):
+        super().__init__(name, description, keywords, parent)
+        self.related_resources = tuple(related_resources or ())
+
+
+class Moonshot(Node):
+    __slots__ = ()
+
+    kind_name = 'moonshot'
+
+
+class TechCluster(Node):
+    __slots__ = ('readiness',)
+
+    kind_name = 'tech_category'
+
+    def __init__(self, name, keywords=(), parent=None, readiness=''):
+        super().__init__(name, '', keywords, parent)
+        self.readiness = readiness or ''
+
+
+LEAF_TYPES = (Imperative, Moonshot, TechCluster)
+
+
+# ============================================================================
+# Taxonomy
+# ============================================================================
+
+class Taxonomy:
+    """Immutable, fully indexed view over a CLIMATE_TAXONOMY-shaped list."""
+
+    def __init__(self, raw, content_hash=None):
+        self.raw = raw
+        self._content_hash = content_hash
+        self.sectors = []
+        self.nodes = []        # every node in depth-first order, nodes[i].id == i
+        self.leaves = []       # imperatives, moonshots and tech clusters
+
+        self._by_path = {}     # normalized path -> node
+        self._by_name = {}     # normalized name -> tuple of nodes
+        self._by_keyword = {}  # lowercased keyword -> tuple of leaf nodes
+        self._by_readiness = {}
+        self._children = {}    # node id -> tuple of child nodes
+
+        for sector_data in raw:
+            self._add_sector(sector_data)
+        self._freeze()
+        self._compute_impact()
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+
+    def _register(self, node):
+        node.id = len(self.nodes)
+        self.nodes.append(node)
+        self._by_path[normalize_path(node.path)] = node
+        self._by_name.setdefault(normalize_name(node.name), []).append(node)
+        if node.parent is not None:
+            self._children.setdefault(node.parent.id, []).append(node)
+        if isinstance(node, LEAF_TYPES):
+            self.leaves.append(node)
+            for keyword in node.keywords:
+                bucket = self._by_keyword.setdefault(keyword.lower(), [])
+                if node not in bucket:
+                    bucket.append(node)
+        return node
+
+    def _add_sector(self, data):
+        sector = self._register(Sector(
+            data['sector_name'],
+            data.get('area_description', ''),
+            data.get('emissions_at_stake_2050', ''),
+        ))
+        self.sectors.append(sector)
+
+        for area_data in data.get('opportunity_areas') or []:
+            area = self._register(OpportunityArea(
+                area_data['area_name'],
+                area_data.get('area_description', ''),
+                parent=sector,
+                viable_solutions=area_data.get('viable_solutions'),
+            ))
+            sector.opportunity_areas.append(area)
+
+            for imp in area_data.get('innovation_imperatives') or []:
+                area.innovation_imperatives.append(self._register(Imperative(
+                    imp['subject_name'],
+                    imp.get('description', ''),
+                    imp.get('keywords'),
+                    parent=area,
+                    related_resources=imp.get('related_resources'),
+                )))
+
+            for ms in area_data.get('moonshots') or []:
+                area.moonshots.append(self._register(Moonshot(
+                    ms['name'],
+                    ms.get('description', ''),
+                    ms.get('keywords'),
+                    parent=area,
+                )))
+
+            for tc in area_data.get('tech_categories') or []:
+                cluster = self._register(TechCluster(
+                    tc['cluster_name'],
+                    tc.get('keywords'),
+                    parent=area,
+                    readiness=tc.get('readiness'),
+                ))
+                area.tech_categories.append(cluster)
+                self._by_readiness.setdefault(normalize_name(cluster.readiness), []).append(cluster)
+
+    def _freeze(self):
+        for index in (self._by_name, self._by_keyword, self._by_readiness, self._children):
+            for key, value in index.items():
+                index[key] = tuple(value)
+        self.sectors = tuple(self.sectors)
+        self.nodes = tuple(self.nodes)
+        self.leaves = tuple(self.leaves)
+
+    def _compute_impact(self):
+        """Precompute numeric emissions, weights and the flat arrays job scoring reads."""
+        total = sum(sector.emissions_gt for sector in self.sectors)
+        self.total_emissions_gt = total
+
+        for node in self.nodes:
+            if node.parent is not None:
+                siblings = self._children[node.parent.id]
+                node.emissions_gt = node.parent.emissions_gt / len(siblings)
+            node.impact_weight = node.emissions_gt / total if total > 0 else 0.0
+
+        # Indexed by node id: owning sector id, that sector's % of total emissions,
+        # and the kind multiplier applied when any node of that kind matches.
+        self.sector_of = tuple(node.sector.id for node in self.nodes)
+        self.sector_impact_percent = tuple(node.sector.impact_weight * 100 for node in self.nodes)
+        self.imperative_mask = tuple(isinstance(node, Imperative) for node in self.nodes)
+        self.tech_category_mask = tuple(isinstance(node, TechCluster) for node in self.nodes)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def node(self, path):
+        """Node for a "Sector > Area > Leaf" path, or None."""
+        return self._by_path.get(normalize_path(path))
+
+    def __getitem__(self, node_id):
+        return self.nodes[node_id]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def find(self, name):
+        """All nodes (any level) with this name."""
+        return self._by_name.get(normalize_name(name), ())
+
+    def nodes_for_keyword(self, keyword):
+        """Leaf nodes that list this keyword."""
+        return self._by_keyword.get(keyword.lower(), ())
+
+    def clusters_by_readiness(self, readiness):
+        """Tech clusters at a readiness level ("Lab", "Pilot", "Commercial")."""
+        return self._by_readiness.get(normalize_name(readiness), ())
+
+    def children(self, node_or_path):
+        node = self._resolve(node_or_path)
+        return self._children.get(node.id, ()) if node is not None else ()
+
+    def impact_score(self, node_ids):
+        """Job impact score for a set of matched node ids.
+
+        Mean emissions share (in %) of the distinct matched sectors, boosted
+        1.2x when an innovation imperative matched and 1.1x when a tech
+        category matched, as in integrate-taxonomy.js.
+        """
+        sectors = {self.sector_of[i] for i in node_ids}
+        if not sectors:
+            return 0.0
+        percent = self.sector_impact_percent
+        score = sum(percent[s] for s in sectors) / len(sectors)
+        if any(self.imperative_mask[i] for i in node_ids):
+            score *= IMPERATIVE_BOOST
+        if any(self.tech_category_mask[i] for i in node_ids):
+            score *= TECH_CATEGORY_BOOST
+        return score
+
+    def keywords(self):
+        """Every distinct lowercased keyword, in first-seen order."""
+        return tuple(self._by_keyword)
+
+    @property
+    def content_hash(self):
+        """sha256 of the canonical JSON form of the raw taxonomy."""
+        if self._content_hash is None:
+            self._content_hash = taxonomy_hash(self.raw)
+        return self._content_hash
+
+    @property
+    def keyword_index(self):
+        return self._by_keyword
+
+    @property
+    def readiness_levels(self):
+        return tuple(clusters[0].readiness for clusters in self._by_readiness.values())
+
+    def _resolve(self, node_or_path):
+        if isinstance(node_or_path, Node):
+            return node_or_path
+        return self.node(node_or_path)
+
+
+@lru_cache(maxsize=1)
+def load_taxonomy():
+    """Process-wide Taxonomy.
+
+    Opens the precompiled snapshot (see taxonomy_snapshot.py) when one exists
+    and matches FULL_TAXONOMY.py; otherwise imports the Python source.
+    """
+    from taxonomy_snapshot import load_fresh_snapshot
+    snapshot = load_fresh_snapshot()
+    if snapshot is not None:
+        return snapshot.taxonomy
+
+    from FULL_TAXONOMY import CLIMATE_TAXONOMY
+    return Taxonomy(CLIMATE_TAXONOMY)
+
+
+if __name__ == '__main__':
+    tax = load_taxonomy()
+    print(f'✅ Loaded {len(tax.sectors)} sectors, {len(tax.nodes)} nodes, '
+          f'{len(tax.leaves)} leaves, {len(tax.keywords())} keywords')
+    for readiness in tax.readiness_levels:
+        print(f'  {readiness}: {len(tax.clusters_by_readiness(readiness))} tech clusters')
@@ -0,0 +1,296 @@
+"""
+Taxonomy diff engine and incremental job re-enrichment.
+
+Any edit to FULL_TAXONOMY.py used to mean rebuilding every job's taxonomy
+block. This module diffs two CLIMATE_TAXONOMY versions node by node (added,
+removed, changed keywords and fields). Only jobs that are new, whose content
+hash changed, or whose text hits an affected keyword are re-enriched; every
+other job keeps its previous block.
+
+State between runs lives in a JSON file: the taxonomy it was built with plus
+{job key: content hash, taxonomy block} for each job.
+
+Usage:
+    python3 taxonomy_diff.py climate_jobs_v6.json --state enrichment_state.json -o climate_jobs_enriched.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from enrich_jobs import Enricher, iter_enriched, job_text
+from job_ingest import job_key
+from keyword_matcher import AhoCorasick
+from taxonomy import Sector, TechCluster, Taxonomy, load_taxonomy, normalize_path
+
+STATE_VERSION = 1
+
+
+# ============================================================================
+# Taxonomy diff
+# ============================================================================
+
+class NodeChange:
+    """One node-level difference between two taxonomy versions."""
+
+    __slots__ = ('path', 'status', 'kind', 'added_keywords', 'removed_keywords', 'changed_fields',
+                 'renamed_keywords')
+
+    def __init__(self, path, status, kind, added_keywords=(), removed_keywords=(), changed_fields=(),
+                 renamed_keywords=()):
+        self.path = path
+        self.status = status  # 'added' | 'removed' | 'changed'
+        self.kind = kind
+        self.added_keywords = tuple(sorted(added_keywords))
+        self.removed_keywords = tuple(sorted(removed_keywords))
+        self.changed_fields = tuple(changed_fields)
+        # Every keyword under a renamed node: jobs tagged through it carry the old name.
+        self.renamed_keywords = tuple(sorted(renamed_keywords))
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f'<NodeChange {self.status} {self.path!r}>'
+
+
+class TaxonomyDiff:
+    def __init__(self, changes, old_hash, new_hash, old_total_gt=None, new_total_gt=None):
+        self.changes = changes
+        self.old_hash = old_hash
+        self.new_hash = new_hash
+        self.old_total_gt = old_total_gt
+        self.new_total_gt = new_total_gt
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    @property
+    def affected_keywords(self):
+        """Keywords whose node membership changed: any job containing one needs re-tagging."""
+        keywords = set()
+        for change in self.changes:
+            keywords.update(change.added_keywords)
+            keywords.update(change.removed_keywords)
+            keywords.update(change.renamed_keywords)
+        return keywords
+
+    @property
+    def rescore_all(self):
+        """Sector emissions or the sector set changed, so every impact score moves.
+
+        impact_score divides by the total emissions, so adding or removing a
+        sector rescales every job, not just the ones tagged with it.
+        """
+        if self.old_total_gt != self.new_total_gt:
+            return True
+        return any(change.kind == Sector.kind_name
+                   and (change.status != 'changed' or 'emissions_at_stake_2050' in change.changed_fields)
+                   for change in self.changes)
+
+    def summary(self):
+        counts = {'added': 0, 'removed': 0, 'changed': 0}
+        for change in self.changes:
+            counts[change.status] += 1
+        return {**counts, 'affected_keywords': len(self.affected_keywords), 'rescore_all': self.rescore_all}
+
+
+def _fields(node):
+    fields = {'description': node.description}
+    if isinstance(node, Sector):
+        fields['emissions_at_stake_2050'] = node.emissions_at_stake_2050
+    if isinstance(node, TechCluster):
+        fields['readiness'] = node.readiness
+    related = getattr(node, 'related_resources', None)
+    if related is not None:
+        fields['related_resources'] = related
+    return fields
+
+
+def _subtree_keywords(taxonomy, node):
+    """Lowercased keywords of `node` and every leaf below it."""
+    keywords = {k.lower() for k in node.keywords}
+    for leaf in taxonomy.leaves:
+        if node in leaf.ancestors():
+            keywords.update(k.lower() for k in leaf.keywords)
+    return keywords
+
+
+def diff_taxonomies(old, new):
+    """Node-by-node diff of two Taxonomy objects (matched on normalized path).
+
+    Paths are matched case- and punctuation-insensitively, so a rename like
+    "Transportation" -> "TRANSPORTATION" is a 'changed' node whose whole
+    subtree needs re-tagging.
+    """
+    old_nodes = {normalize_path(node.path): node for node in old.nodes}
+    new_nodes = {normalize_path(node.path): node for node in new.nodes}
+    changes = []
+
+    for key, node in new_nodes.items():
+        before = old_nodes.get(key)
+        keywords = {k.lower() for k in node.keywords}
+        if before is None:
+            changes.append(NodeChange(node.path, 'added', node.kind, added_keywords=keywords))
+            continue
+        previous = {k.lower() for k in before.keywords}
+        old_fields, new_fields = _fields(before), _fields(node)
+        changed_fields = [name for name in new_fields if old_fields.get(name) != new_fields[name]]
+        renamed = ()
+        if node.name != before.name:
+            changed_fields.insert(0, 'name')
+            renamed = _subtree_keywords(new, node)
+        if keywords != previous or changed_fields:
+            changes.append(NodeChange(node.path, 'changed', node.kind,
+                                      keywords - previous, previous - keywords, changed_fields, renamed))
+
+    for key, node in old_nodes.items():
+        if key not in new_nodes:
+            changes.append(NodeChange(node.path, 'removed', node.kind,
+                                      removed_keywords={k.lower() for k in node.keywords}))
+
+    return TaxonomyDiff(changes, old.content_hash, new.content_hash,
+                        old.total_emissions_gt, new.total_emissions_gt)
+
+
+# ============================================================================
+# Incremental enrichment
+# ============================================================================
+
+def job_hash(job):
+    """Hash of exactly the text enrichment reads, so unrelated field edits don't force a re-tag."""
+    return hashlib.sha1(job_text(job).encode('utf-8')).hexdigest()
+
+
+def load_state(path):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        state = json.load(f)
+    return state if state.get('version') == STATE_VERSION else None
+
+
+def save_state(path, taxonomy, records, word_boundary=True):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': STATE_VERSION,
+            'word_boundary': word_boundary,
+            'taxonomy_hash': taxonomy.content_hash,
+            'taxonomy': taxonomy.raw,
+            'jobs': records,
+        }, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class IncrementalStats:
+    __slots__ = ('reused', 'reenriched', 'new', 'dropped', 'seconds')
+
+    def __init__(self):
+        self.reused = self.reenriched = self.new = self.dropped = 0
+        self.seconds = 0.0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def incremental_enrich(jobs, state=None, taxonomy=None, workers=1, word_boundary=True):
+    """Enrich `jobs` reusing blocks from `state` where still valid.
+
+    Returns (enriched_jobs, records, diff, stats); `records` is the new
+    per-job state to persist with save_state.
+    """
+    started = time.perf_counter()
+    taxonomy = taxonomy or load_taxonomy()
+    stats = IncrementalStats()
+    previous = (state or {}).get('jobs', {})
+    # Blocks built in the other matching mode (--substring vs word boundary) are never reused.
+    same_mode = state is not None and state.get('word_boundary', True) == word_boundary
+
+    diff = None
+    if state is not None:
+        if state.get('taxonomy_hash') == taxonomy.content_hash:
+            diff = TaxonomyDiff([], taxonomy.content_hash, taxonomy.content_hash)
+        else:
+            diff = diff_taxonomies(Taxonomy(state['taxonomy']), taxonomy)
+
+    affected = None
+    if diff is not None and diff.affected_keywords and not diff.rescore_all:
+        affected = AhoCorasick(((k, None) for k in diff.affected_keywords), word_boundary=word_boundary)
+
+    output = []        # enriched job, or None while waiting for re-enrichment
+    pending = []       # (position, job) to re-enrich
+    records = {}
+    for job in jobs:
+        key, digest = job_key(job), job_hash(job)
+        record = previous.get(key)
+        reusable = (
+            diff is not None and same_mode and not diff.rescore_all
+            and record is not None and record['hash'] == digest
+            and (affected is None or next(affected.iter_matches(job_text(job)), None) is None)
+        )
+        if reusable:
+            stats.reused += 1
+            output.append({**job, 'taxonomy': record['taxonomy']})
+            records[key] = record
+        else:
+            if record is None:
+                stats.new += 1
+            else:
+                stats.reenriched += 1
+            pending.append((len(output), job))
+            output.append(None)
+
+    if pending:
+        positions = [position for position, _ in pending]
+        enricher_jobs = (job for _, job in pending)
+        if workers == 1:
+            enricher = Enricher(taxonomy, word_boundary=word_boundary)
+            fresh = (enricher.enrich(job) for job in enricher_jobs)
+        else:
+            fresh = iter_enriched(enricher_jobs, workers=workers, word_boundary=word_boundary)
+        for position, enriched in zip(positions, fresh):
+            output[position] = enriched
+            records[job_key(enriched)] = {'hash': job_hash(enriched), 'taxonomy': enriched['taxonomy']}
+
+    stats.dropped = sum(1 for key in previous if key not in records)
+    stats.seconds = round(time.perf_counter() - started, 4)
+    return output, records, diff, stats
+
+
+def main(argv=None):
+    from job_ingest import iter_jobs
+
+    parser = argparse.ArgumentParser(description='Re-enrich only jobs affected by taxonomy or content changes.')
+    parser.add_argument('input', nargs='?', default='climate_jobs_v6.json')
+    parser.add_argument('-o', '--output', default='climate_jobs_enriched.json')
+    parser.add_argument('--state', default='enrichment_state.json')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--substring', action='store_true')
+    args = parser.parse_args(argv)
+
+    taxonomy = load_taxonomy()
+    state = load_state(args.state)
+    enriched, records, diff, stats = incremental_enrich(
+        iter_jobs(args.input), state, taxonomy, args.workers, word_boundary=not args.substring)
+
+    if diff is None:
+        print('📦 No previous state: full enrichment', file=sys.stderr)
+    else:
+        print(f'🔁 Taxonomy diff: {diff.summary()}', file=sys.stderr)
+        for change in diff.changes[:20]:
+            print(f'   {change.status:8} {change.path} '
+                  f'+{len(change.added_keywords)}/-{len(change.removed_keywords)} {list(change.changed_fields)}',
+                  file=sys.stderr)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'jobs': enriched, 'metadata': {'incremental': stats.as_dict()}}, f, indent=2, ensure_ascii=False)
+    save_state(args.state, taxonomy, records, word_boundary=not args.substring)
+    print(f'✅ {stats.as_dict()}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+"""
+Precomputed similarity graph over taxonomy nodes.
+
+`getRelatedCategories` in server.js calls every category that shares a
+sector prefix "related", rescanning the whole category map on each chat
+turn. The `related_resources` lists on imperatives are never resolved. This
+builds the graph once. Each node pair is scored from three signals:
+
+    keyword overlap     MinHash Jaccard of the keyword sets (areas and sectors
+                        use the union of their leaves' keywords)
+    related_resources   imperative links resolved to nodes (symmetric)
+    job co-occurrence   cosine of category co-assignment across the job corpus
+
+Ancestor/descendant pairs are skipped (they are trivially related). Every
+node keeps its top-k neighbours, so a related-area lookup is one list read.
+
+Usage:
+    python3 taxonomy_graph.py --jobs climate_jobs_v6.json -o taxonomy_graph.json
+    graph = TaxonomyGraph.load('taxonomy_graph.json')
+    graph.related('Electricity > Energy Storage & Demand Flexibility', kind='opportunity_area')
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import zlib
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+
+from job_dedup import MinHasher
+from keyword_matcher import KeywordMatcher
+from taxonomy import OpportunityArea, load_taxonomy
+
+DEFAULT_K = 10
+GRAPH_FORMAT = 1
+
+# Edge weight = sum of signal * weight.
+SIGNAL_WEIGHTS = {
+    'keywords': 1.0,
+    'related_resources': 1.0,
+    'cooccurrence': 0.5,
+}
+
+
+# ============================================================================
+# Signals
+# ============================================================================
+
+def keyword_sets(taxonomy):
+    """Per node id: its keywords, or the union of its leaves' keywords for areas and sectors."""
+    sets = [set() for _ in taxonomy.nodes]
+    for leaf in taxonomy.leaves:
+        keywords = {k.lower() for k in leaf.keywords}
+        sets[leaf.id].update(keywords)
+        for ancestor in leaf.ancestors():
+            sets[ancestor.id].update(keywords)
+    return sets
+
+
+def keyword_similarity(taxonomy, hasher=None):
+    """(nodes x nodes) MinHash-estimated Jaccard matrix of keyword sets."""
+    hasher = hasher or MinHasher()
+    sets = keyword_sets(taxonomy)
+    signatures = np.stack([hasher.signature({zlib.crc32(k.encode('utf-8')) for k in keywords})
+                           for keywords in sets])
+    similarity = np.zeros((len(sets), len(sets)), dtype=np.float32)
+    for i in range(len(sets)):
+        similarity[i] = (signatures == signatures[i]).mean(axis=1)
+    empty = np.array([not keywords for keywords in sets])
+    similarity[empty, :] = 0
+    similarity[:, empty] = 0
+    return similarity
+
+
+def resolve_resource(taxonomy, node, name, matcher=None):
+    """Best node for a `related_resources` entry, or None.
+
+    Tries an exact node name, then leaves that list it as a keyword, then
+    leaves whose keywords occur in it. Same-sector candidates win; the node
+    itself and its ancestors are never returned.
+    """
+    excluded = {node.id, *(a.id for a in node.ancestors())}
+
+    def pick(candidates):
+        candidates = [c for c in candidates if c.id not in excluded]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda c: (c.sector is not node.sector, c.id))
+
+    found = pick(taxonomy.find(name)) or pick(taxonomy.nodes_for_keyword(name))
+    if found is None and matcher is not None:
+        found = pick(list(matcher.matched_nodes(name)))
+    return found
+
+
+def resource_links(taxonomy):
+    """Returns ({(a, b): 1.0} symmetric resolved links, [unresolved (path, name)])."""
+    matcher = KeywordMatcher(taxonomy)
+    links, unresolved = {}, []
+    for node in taxonomy.nodes:
+        for name in getattr(node, 'related_resources', None) or ():
+            target = resolve_resource(taxonomy, node, name, matcher)
+            if target is None:
+                unresolved.append((node.path, name))
+                continue
+            links[(node.id, target.id)] = links[(target.id, node.id)] = 1.0
+    return links, unresolved
+
+
+def cooccurrence(taxonomy, jobs):
+    """{(a, b): cosine} of nodes assigned to the same jobs (categories plus imperatives)."""
+    from category_index import job_category_paths
+
+    counts, pairs = Counter(), Counter()
+    for job in jobs:
+        ids = set()
+        for path in job_category_paths(taxonomy, job):
+            node = taxonomy.node(path)
+            if node is not None:
+                ids.add(node.id)
+        counts.update(ids)
+        pairs.update(combinations(sorted(ids), 2))
+    scores = {}
+    for (a, b), together in pairs.items():
+        score = together / math.sqrt(counts[a] * counts[b])
+        scores[(a, b)] = scores[(b, a)] = score
+    return scores
+
+
+# ============================================================================
+# Graph
+# ============================================================================
+
+class TaxonomyGraph:
+    """Top-k weighted neighbours per node id."""
+
+    def __init__(self, taxonomy, neighbours, k=DEFAULT_K, unresolved=()):
+        self.taxonomy = taxonomy
+        self.neighbours = neighbours  # node id -> tuple of (node id, weight), best first
+        self.k = k
+        self.unresolved = tuple(unresolved)
+
+    @classmethod
+    def build(cls, taxonomy=None, jobs=(), k=DEFAULT_K):
+        taxonomy = taxonomy or load_taxonomy()
+        n = len(taxonomy.nodes)
+        weights = SIGNAL_WEIGHTS['keywords'] * keyword_similarity(taxonomy)
+        links, unresolved = resource_links(taxonomy)
+        for (a, b), value in links.items():
+            weights[a, b] += SIGNAL_WEIGHTS['related_resources'] * value
+        for (a, b), value in cooccurrence(taxonomy, jobs).items():
+            weights[a, b] += SIGNAL_WEIGHTS['cooccurrence'] * value
+
+        for node in taxonomy.nodes:
+            weights[node.id, node.id] = 0
+            for ancestor in node.ancestors():
+                weights[node.id, ancestor.id] = weights[ancestor.id, node.id] = 0
+
+        neighbours = []
+        for i in range(n):
+            row = weights[i]
+            if n > k:
+                # Every node tied with the k-th weight, so the cut below keeps the lowest ids.
+                top = np.flatnonzero(row >= -np.partition(-row, k - 1)[k - 1])
+            else:
+                top = np.arange(n)
+            top = sorted((j for j in top if row[j] > 0), key=lambda j: (-row[j], j))[:k]
+            neighbours.append(tuple((int(j), round(float(row[j]), 4)) for j in top))
+        return cls(taxonomy, neighbours, k, unresolved)
+
+    def _resolve(self, node_or_path):
+        return self.taxonomy.node(node_or_path) if isinstance(node_or_path, str) else node_or_path
+
+    def related(self, node_or_path, k=None, kind=None):
+        """Neighbour nodes, best first; `kind` filters by Node.kind_name (e.g. 'opportunity_area')."""
+        node = self._resolve(node_or_path)
+        if node is None:
+            return []
+        nodes = self.taxonomy.nodes
+        related = [nodes[j] for j, _ in self.neighbours[node.id] if kind is None or nodes[j].kind == kind]
+        return related[:k] if k is not None else related
+
+    def related_areas(self, node_or_path, k=3):
+        """Opportunity areas related to a node, excluding its own area."""
+        node = self._resolve(node_or_path)
+        if node is None:
+            return []
+        own = node.opportunity_area
+        return [area for area in self.related(own or node, kind=OpportunityArea.kind_name)
+                if area is not own][:k]
+
+    # ------------------------------------------------------------------
+    # Persistence (keyed on the taxonomy content hash)
+    # ------------------------------------------------------------------
+
+    def as_dict(self):
+        nodes = self.taxonomy.nodes
+        return {
+            'format': GRAPH_FORMAT,
+            'taxonomy_hash': self.taxonomy.content_hash,
+            'k': self.k,
+            'unresolved_resources': [list(item) for item in self.unresolved],
+            'nodes': {nodes[i].path: [[nodes[j].path, w] for j, w in edges]
+                      for i, edges in enumerate(self.neighbours)},
+        }
+
+    def save(self, path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, taxonomy=None):
+        """Graph from `path`, or None if missing or built for another taxonomy."""
+        taxonomy = taxonomy or load_taxonomy()
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') != GRAPH_FORMAT or data.get('taxonomy_hash') != taxonomy.content_hash:
+            return None
+        neighbours = [()] * len(taxonomy.nodes)
+        for node_path, edges in data['nodes'].items():
+            node = taxonomy.node(node_path)
+            neighbours[node.id] = tuple((taxonomy.node(p).id, w) for p, w in edges)
+        return cls(taxonomy, neighbours, data['k'], map(tuple, data.get('unresolved_resources', ())))
+
+
+def main(argv=None):
+    from job_ingest import iter_jobs
+
+    parser = argparse.ArgumentParser(description='Build the taxonomy node similarity graph.')
+    parser.add_argument('--jobs', default='climate_jobs_v6.json')
+    parser.add_argument('-k', type=int, default=DEFAULT_K)
+    parser.add_argument('-o', '--output', default='taxonomy_graph.json')
+    args = parser.parse_args(argv)
+
+    taxonomy = load_taxonomy()
+    jobs = iter_jobs(args.jobs) if args.jobs and os.path.exists(args.jobs) else ()
+    graph = TaxonomyGraph.build(taxonomy, jobs, args.k)
+    graph.save(args.output)
+
+    edges = sum(len(edges) for edges in graph.neighbours)
+    print(f'✅ {len(taxonomy.nodes)} nodes, {edges} edges (top {args.k}) -> {args.output}', file=sys.stderr)
+    if graph.unresolved:
+        print(f'⚠️  {len(graph.unresolved)} related_resources entries did not resolve to a node:', file=sys.stderr)
+        for node_path, name in graph.unresolved:
+            print(f'   {node_path}: {name!r}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""
+Precompiled binary snapshot of the taxonomy for fast worker start-up.
+
+Importing FULL_TAXONOMY means parsing and evaluating a 150 KB Python literal
+and then building every index in taxonomy.py. The build step here does that
+once and writes the finished `Taxonomy` (nodes, keyword/name/path/readiness
+indexes) to a versioned, content-hashed file. Loading reads the header,
+checks it against the FULL_TAXONOMY.py hash and only then unpickles the
+payload; the .py source is never evaluated. On one host that is ~1.2 ms
+against ~4.6 ms for importing FULL_TAXONOMY (from cached bytecode) and
+building the Taxonomy.
+
+File layout:
+    8 bytes   magic  b'ECOTAX\\x00\\x01'
+    4 bytes   header length (little-endian uint32)
+    N bytes   header JSON (format, schema, hashes, payload offset/length)
+    ...       pickled Taxonomy payload
+
+Usage:
+    python3 taxonomy_snapshot.py            # build taxonomy.snapshot
+    python3 taxonomy_snapshot.py --json     # print taxonomy JSON from the snapshot
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import struct
+import sys
+from datetime import datetime, timezone
+
+from taxonomy import SCHEMA_VERSION, Taxonomy
+
+SNAPSHOT_FORMAT = 1
+MAGIC = b'ECOTAX\x00\x01'
+_HEADER_LEN = struct.Struct('<I')
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_PATH = os.path.join(BASE_DIR, 'FULL_TAXONOMY.py')
+DEFAULT_PATH = os.environ.get('TAXONOMY_SNAPSHOT', os.path.join(BASE_DIR, 'taxonomy.snapshot'))
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or from another version."""
+
+
+def source_hash(source_path=SOURCE_PATH):
+    """sha256 of the FULL_TAXONOMY.py bytes (cheap; no evaluation)."""
+    with open(source_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class TaxonomySnapshot:
+    """A loaded snapshot: header metadata plus the compiled Taxonomy."""
+
+    def __init__(self, header, taxonomy):
+        self.header = header
+        self.taxonomy = taxonomy
+
+    @property
+    def content_hash(self):
+        return self.header['content_sha256']
+
+    @property
+    def source_hash(self):
+        return self.header['source_sha256']
+
+    def is_fresh(self, source_path=SOURCE_PATH):
+        return header_is_fresh(self.header, source_path)
+
+
+def header_is_fresh(header, source_path=SOURCE_PATH):
+    """True when a snapshot header was built from the current FULL_TAXONOMY.py."""
+    try:
+        return header['source_sha256'] == source_hash(source_path)
+    except OSError:
+        # No source next to the snapshot (e.g. a slim deploy): trust it.
+        return True
+
+
+# ============================================================================
+# Build
+# ============================================================================
+
+def build_snapshot(path=DEFAULT_PATH, source_path=SOURCE_PATH):
+    """Evaluate FULL_TAXONOMY once and write the compiled snapshot to `path`."""
+    from FULL_TAXONOMY import CLIMATE_TAXONOMY
+
+    taxonomy = Taxonomy(CLIMATE_TAXONOMY)
+    payload = pickle.dumps(taxonomy, protocol=pickle.HIGHEST_PROTOCOL)
+
+    header = {
+        'format': SNAPSHOT_FORMAT,
+        'schema': SCHEMA_VERSION,
+        'pickle_protocol': pickle.HIGHEST_PROTOCOL,
+        'content_sha256': taxonomy.content_hash,
+        'payload_sha256': hashlib.sha256(payload).hexdigest(),
+        'source_sha256': source_hash(source_path),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'counts': {
+            'sectors': len(taxonomy.sectors),
+            'nodes': len(taxonomy.nodes),
+            'leaves': len(taxonomy.leaves),
+            'keywords': len(taxonomy.keyword_index),
+        },
+    }
+    # Payload offset depends on the header length, which depends on the offset.
+    # Encode twice so the offset is self-consistent.
+    header['payload_offset'] = 0
+    header['payload_length'] = len(payload)
+    for _ in range(2):
+        header_bytes = json.dumps(header, sort_keys=True).encode('utf-8')
+        header['payload_offset'] = len(MAGIC) + _HEADER_LEN.size + len(header_bytes)
+    header_bytes = json.dumps(header, sort_keys=True).encode('utf-8')
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LEN.pack(len(header_bytes)))
+        f.write(header_bytes)
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return TaxonomySnapshot(header, taxonomy)
+
+
+# ============================================================================
+# Load
+# ============================================================================
+
+def read_header(data):
+    if data[:len(MAGIC)] != MAGIC:
+        raise SnapshotError('not a taxonomy snapshot (bad magic)')
+    start = len(MAGIC) + _HEADER_LEN.size
+    (length,) = _HEADER_LEN.unpack(data[len(MAGIC):start])
+    header = json.loads(bytes(data[start:start + length]))
+    if header.get('format') != SNAPSHOT_FORMAT or header.get('schema') != SCHEMA_VERSION:
+        raise SnapshotError(
+            f"snapshot format {header.get('format')}/schema {header.get('schema')} "
+            f'does not match {SNAPSHOT_FORMAT}/{SCHEMA_VERSION}; rebuild it'
+        )
+    return header
+
+
+def peek_header(path=DEFAULT_PATH):
+    """Read only the header of a snapshot (no payload, no unpickling)."""
+    try:
+        with open(path, 'rb') as f:
+            prefix = f.read(len(MAGIC) + _HEADER_LEN.size)
+            if len(prefix) < len(MAGIC) + _HEADER_LEN.size:
+                raise SnapshotError('snapshot header is truncated')
+            (length,) = _HEADER_LEN.unpack(prefix[len(MAGIC):])
+            return read_header(prefix + f.read(length))
+    except (OSError, ValueError) as error:
+        raise SnapshotError(f'cannot read snapshot {path}: {error}') from error
+
+
+def load_snapshot(path=DEFAULT_PATH, verify=False):
+    """Read and unpickle a snapshot. `verify` re-hashes the payload bytes.
+
+    pickle.loads materializes every object, so the file is read in one go;
+    memory-mapping it saves nothing.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        header = read_header(data)
+        offset, length = header['payload_offset'], header['payload_length']
+        with memoryview(data)[offset:offset + length] as payload:
+            if len(payload) != length:
+                raise SnapshotError('snapshot payload is truncated')
+            if verify and hashlib.sha256(payload).hexdigest() != header['payload_sha256']:
+                raise SnapshotError('snapshot payload hash mismatch')
+            taxonomy = pickle.loads(payload)
+    except (OSError, ValueError) as error:
+        raise SnapshotError(f'cannot read snapshot {path}: {error}') from error
+    return TaxonomySnapshot(header, taxonomy)
+
+
+def load_fresh_snapshot(path=DEFAULT_PATH, source_path=SOURCE_PATH):
+    """Snapshot at `path` if it exists and matches FULL_TAXONOMY.py, else None.
+
+    Freshness is checked on the header alone; a stale payload is never unpickled.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        header = peek_header(path)
+        if not header_is_fresh(header, source_path):
+            return None
+        snapshot = load_snapshot(path)
+    except (SnapshotError, pickle.UnpicklingError, AttributeError, EOFError):
+        return None
+    # Rebuilt between the two reads: only trust the payload the header vouched for.
+    return snapshot if snapshot.source_hash == header['source_sha256'] else None
+
+
+if __name__ == '__main__':
+    if '--json' in sys.argv[1:]:
+        snapshot = load_fresh_snapshot() or build_snapshot()
+        print(json.dumps(snapshot.taxonomy.raw, indent=2, ensure_ascii=False))
+        sys.exit(0)
+
+    snapshot = build_snapshot()
+    counts = snapshot.header['counts']
+    print(f'✅ Wrote {DEFAULT_PATH}')
+    print(f"   {counts['sectors']} sectors, {counts['nodes']} nodes, {counts['keywords']} keywords")
+    print(f'   content sha256: {snapshot.content_hash}')
@@ -0,0 +1,54 @@
+import math
+
+import pytest
+
+from bm25_search import BM25Index, tokenize
+
+
+def index_of(documents, field_weights):
+    return BM25Index(field_weights).build(documents)
+
+
+def test_single_field_score_by_hand():
+    index = index_of([{'title': 'solar solar panel'}, {'title': 'wind turbine'}], {'title': (1.0, 0.75)})
+    # idf = ln(1 + (N - df + 0.5) / (df + 0.5)); norm = 1 - b + b * len / avg_len = 0.25 + 0.75 * 3 / 2.5
+    idf = math.log(1 + (2 - 1 + 0.5) / (1 + 0.5))
+    tf = 2 / (0.25 + 0.75 * 3 / 2.5)
+    expected = idf * tf / (1.2 + tf) * (1.2 + 1)
+    [(job_id, score)] = index.search('solar')
+    assert job_id == 0
+    assert score == pytest.approx(expected, rel=1e-6)
+
+
+def test_fields_add_weighted_term_frequencies():
+    weights = {'title': (3.0, 0.0), 'company': (1.0, 0.0)}
+    index = index_of([{'title': 'solar', 'company': 'solar co'}, {'title': 'wind', 'company': 'wind co'},
+                      {'title': 'hydro', 'company': 'hydro co'}], weights)
+    idf = math.log(1 + (3 - 1 + 0.5) / (1 + 0.5))
+    pseudo = 3.0 * 1 + 1.0 * 1
+    assert index.scores('solar') == {0: pytest.approx(idf * pseudo / (1.2 + pseudo) * 2.2, rel=1e-6)}
+
+
+def test_search_orders_by_score_then_corpus_order():
+    index = index_of([{'title': 'battery'}, {'title': 'battery storage'}, {'title': 'battery'},
+                      {'title': 'wind'}], {'title': (1.0, 0.0)})
+    assert [job_id for job_id, _ in index.search('battery storage', k=3)] == [1, 0, 2]
+    assert index.search('battery storage', k=3) == sorted(
+        index.scores('battery storage').items(), key=lambda item: (-item[1], item[0]))[:3]
+
+
+def test_precomputed_weights_reused_until_rebuild():
+    weights = {'title': (1.0, 0.75)}
+    index = index_of([{'title': 'solar panel'}, {'title': 'wind turbine'}], weights)
+    first = index.search('solar')
+    assert index.search('solar') == first
+
+    index.build([{'title': 'geothermal drilling'}, {'title': 'solar'}, {'title': 'solar roof'}])
+    assert 'panel' not in index.postings
+    assert index.n_docs == 3
+    assert [job_id for job_id, _ in index.search('solar')] == [1, 2]
+    assert index.search('solar') != first
+
+
+def test_tokenize_drops_stopwords_keeps_symbols():
+    assert tokenize('Find C++ and C# jobs in the Solar industry') == ['c++', 'c#', 'solar', 'industry']
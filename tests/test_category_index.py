@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from category_index import CategoryIndex, intersect, iter_difference, union
+from job_ingest import iter_jobs
+from taxonomy import PATH_SEP, normalize_path
+
+
+def random_postings(rng, count):
+    return [sorted(rng.sample(range(200), rng.randint(0, 60))) for _ in range(count)]
+
+
+def test_set_operations_match_python_sets():
+    rng = random.Random(3)
+    for _ in range(200):
+        lists = random_postings(rng, rng.randint(1, 4))
+        sets = [set(p) for p in lists]
+        assert intersect(*lists) == sorted(set.intersection(*sets))
+        assert union(*lists) == sorted(set.union(*sets))
+        assert list(iter_difference(lists[0], union(*lists[1:]))) == sorted(sets[0].difference(*sets[1:]))
+    assert intersect() == []
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    jobs = list(iter_jobs('climate_jobs_v6.json'))
+    return jobs, CategoryIndex.from_jobs(jobs)
+
+
+def under(index, job, path):
+    key = normalize_path(path)
+    return any(normalize_path(p) == key or normalize_path(p).startswith(key + PATH_SEP)
+               for p in index.job_paths(job))
+
+
+def test_prefix_postings_match_scan(corpus):
+    jobs, index = corpus
+    path = 'Electricity > Energy Storage & Demand Flexibility'
+    assert list(index.prefix(path)) == [i for i, job in enumerate(jobs) if under(index, job, path)]
+    assert list(index.sector(path)) == [i for i, job in enumerate(jobs) if under(index, job, 'Electricity')]
+
+
+def test_query_matches_scan(corpus):
+    jobs, index = corpus
+    found = index.query(all_of=['Electricity'], any_of=['Transportation', 'Buildings'], none_of=['Manufacturing'])
+    assert found == [i for i, job in enumerate(jobs)
+                     if under(index, job, 'Electricity')
+                     and (under(index, job, 'Transportation') or under(index, job, 'Buildings'))
+                     and not under(index, job, 'Manufacturing')]
+
+
+def test_search_tiers(corpus):
+    _, index = corpus
+    path = 'Electricity > Energy Storage & Demand Flexibility'
+    hits = index.search(path, limit=None)
+    scores = [score for _, score in hits]
+    assert scores == sorted(scores, reverse=True)
+    assert {job_id for job_id, score in hits if score >= 5} == set(index.prefix(path))
+    assert {job_id for job_id, _ in hits} == set(index.sector(path))
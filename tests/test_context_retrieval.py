@@ -0,0 +1,45 @@
+import copy
+
+from context_retrieval import ContextRetriever, normalize_query
+from taxonomy import Taxonomy, load_taxonomy
+from taxonomy_snapshot import build_snapshot
+
+
+def edited_taxonomy():
+    raw = copy.deepcopy(load_taxonomy().raw)
+    raw.append({'sector_name': 'Oceans', 'emissions_at_stake_2050': '20 Gt',
+                'area_description': '', 'opportunity_areas': []})
+    return Taxonomy(raw)
+
+
+def test_normalize_query():
+    assert normalize_query('  What is  Solar?? ') == 'what is solar'
+
+
+def test_stale_snapshot_is_not_swapped_in(tmp_path):
+    source = tmp_path / 'FULL_TAXONOMY.py'
+    source.write_text('# an older FULL_TAXONOMY.py\n')
+    path = str(tmp_path / 'taxonomy.snapshot')
+    build_snapshot(path, source_path=str(source))
+
+    taxonomy = edited_taxonomy()
+    retriever = ContextRetriever(taxonomy, snapshot_path=path, check_interval=0)
+    assert not retriever.check_snapshot()
+    assert retriever.taxonomy is taxonomy
+
+
+def test_fresh_snapshot_is_swapped_in(tmp_path):
+    path = str(tmp_path / 'taxonomy.snapshot')
+    snapshot = build_snapshot(path)
+
+    retriever = ContextRetriever(edited_taxonomy(), snapshot_path=path, check_interval=0)
+    assert retriever.check_snapshot()
+    assert retriever.taxonomy.content_hash == snapshot.content_hash
+
+
+def test_retrieve_is_cached_per_normalized_query():
+    retriever = ContextRetriever(check_interval=float('inf'))
+    first = retriever.retrieve('How do heat pumps help decarbonize buildings?')
+    assert first.sectors
+    assert retriever.retrieve('how do heat pumps help decarbonize buildings') is first
+    assert retriever.stats()['hits'] == 1
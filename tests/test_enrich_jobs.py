@@ -0,0 +1,32 @@
+import pytest
+
+from enrich_jobs import EnrichStats, Enricher, chunked, enrich_jobs, iter_enriched
+from job_ingest import iter_jobs
+
+
+@pytest.fixture(scope='module')
+def jobs():
+    return list(iter_jobs('climate_jobs_v6.json'))[:200]
+
+
+def test_chunked():
+    assert list(chunked(iter(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+
+
+def test_parallel_matches_sequential_in_input_order(jobs):
+    sequential, _ = enrich_jobs(jobs, workers=1)
+    stats = EnrichStats(2)
+    parallel = list(iter_enriched(iter(jobs), workers=2, chunk_size=16, stats=stats))
+    assert parallel == sequential
+    assert [job['url'] for job in parallel] == [job['url'] for job in jobs]
+    assert (stats.jobs, stats.chunks) == (len(jobs), 13)
+
+
+def test_enrich_block(jobs):
+    enricher = Enricher()
+    block = enricher.taxonomy_block('Battery engineer: solid-state design and fast charging')
+    assert 'Transportation' in block['sectors']
+    assert block['emissions_category'] == block['sectors'][0]
+    assert block['impact_score'] > 0
+    assert enricher.taxonomy_block('Receptionist')['sectors'] == []
@@ -0,0 +1,26 @@
+from benchmarks.evaluate import LEVELS, score
+
+
+def levels(sector=(), area=(), leaf=()):
+    return {'sector': set(sector), 'area': set(area), 'leaf': set(leaf)}
+
+
+def test_score_micro_and_per_label_at_every_level():
+    examples = [
+        ('a', levels({'S1'}, {'S1 > A1'}, {'S1 > A1 > L1'})),
+        ('b', levels({'S2'}, {'S2 > A2'}, {'S2 > A2 > L2'})),
+    ]
+    predictions = [
+        levels({'S1'}, {'S1 > A1'}, {'S1 > A1 > L1', 'S1 > A1 > L3'}),
+        levels({'S1'}, set(), set()),
+    ]
+    report = score(predictions, examples)
+
+    assert (report['sector']['tp'], report['sector']['fp'], report['sector']['fn']) == (1, 1, 1)
+    assert report['leaf']['precision'] == 0.5
+    assert report['leaf']['recall'] == 0.5
+    for level in LEVELS:
+        assert 'labels' in report[level]
+    assert report['leaf']['labels']['S1 > A1 > L3'] == {
+        'precision': 0.0, 'recall': 0.0, 'f1': 0.0, 'tp': 0, 'fp': 1, 'fn': 0}
+    assert report['sector']['labels']['S1']['recall'] == 1.0
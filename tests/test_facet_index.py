@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from facet_index import CHUNK_SIZE, Bitmap, FacetIndex, intersect_count
+from job_ingest import iter_jobs
+
+
+def random_ids(rng):
+    return sorted(rng.sample(range(3 * CHUNK_SIZE + 17), rng.randint(0, 300)))
+
+
+def test_bitmap_matches_python_sets():
+    rng = random.Random(11)
+    for _ in range(100):
+        a_ids, b_ids = random_ids(rng), random_ids(rng)
+        a, b = Bitmap.from_sorted(a_ids), Bitmap.from_sorted(b_ids)
+        assert list(a) == a_ids
+        assert len(a) == len(a_ids)
+        assert list(a & b) == sorted(set(a_ids) & set(b_ids))
+        assert list(a | b) == sorted(set(a_ids) | set(b_ids))
+        assert intersect_count(a, b) == len(set(a_ids) & set(b_ids))
+        for i in a_ids[:10]:
+            assert i in a
+
+
+def test_bitmap_full_and_empty():
+    n = 2 * CHUNK_SIZE + 5
+    assert list(Bitmap.full(n)) == list(range(n))
+    assert not Bitmap.from_sorted([])
+    assert list(Bitmap.full(0)) == []
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    jobs = list(iter_jobs('climate_jobs_v6.json'))
+    return jobs, FacetIndex.from_jobs(jobs)
+
+
+def scan(index, jobs, filters):
+    values = [index.job_values(job) for job in jobs]
+    return [i for i, job_values in enumerate(values)
+            if all(any(index._key(dimension, v) in job_values[dimension] for v in wanted)
+                   for dimension, wanted in filters.items())]
+
+
+def test_select_matches_scan(corpus):
+    jobs, index = corpus
+    filters = {'node': ['Electricity'], 'experience_level': ['Entry-Level', 'Senior']}
+    assert index.job_ids(filters) == scan(index, jobs, filters)
+
+
+def test_counts_ignore_their_own_dimension(corpus):
+    jobs, index = corpus
+    filters = {'node': ['Electricity'], 'experience_level': ['Entry-Level']}
+    counts = index.counts(filters, dimensions=('experience_level',))['experience_level']
+    for level, count in counts.items():
+        assert count == len(scan(index, jobs, {'node': ['Electricity'], 'experience_level': [level]}))
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from fuzzy_lookup import FuzzyLookup, deletes, edit_distance
+
+
+def osa(a, b):
+    """Reference optimal-string-alignment distance (full DP)."""
+    d = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i][0] = i
+    for j in range(len(b) + 1):
+        d[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[len(a)][len(b)]
+
+
+def mutate(rng, word, edits):
+    for _ in range(edits):
+        i = rng.randrange(len(word) + 1)
+        op = rng.choice('idst')
+        if op == 'i' or not word:
+            word = word[:i] + rng.choice('abcde') + word[i:]
+        elif op == 'd' and i < len(word):
+            word = word[:i] + word[i + 1:]
+        elif op == 's' and i < len(word):
+            word = word[:i] + rng.choice('abcde') + word[i + 1:]
+        elif op == 't' and i + 1 < len(word):
+            word = word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word
+
+
+def test_edit_distance_matches_reference():
+    rng = random.Random(1)
+    for _ in range(2000):
+        a = ''.join(rng.choice('abcde') for _ in range(rng.randint(0, 12)))
+        b = mutate(rng, a, rng.randint(0, 4))
+        limit = rng.randint(0, 3)
+        expected = osa(a, b)
+        assert edit_distance(a, b, limit) == (expected if expected <= limit else limit + 1)
+
+
+def test_deletes():
+    assert deletes('abc', 1) == {'abc', 'bc', 'ac', 'ab'}
+    assert all(len(item) >= 5 for item in deletes('abcdefghij', 2, prefix_length=7))
+
+
+@pytest.fixture(scope='module')
+def fuzzy():
+    return FuzzyLookup.from_sources()
+
+
+def test_lookup_matches_brute_force(fuzzy):
+    rng = random.Random(2)
+    words = sorted(fuzzy.words)
+    for word in rng.sample(words, 40):
+        typo = mutate(rng, word, rng.randint(1, 2))
+        if len(typo) < 4:
+            continue
+        expected = {w for w in words if osa(typo, w) <= fuzzy.max_distance}
+        found = {s.term for s in fuzzy.lookup(typo, limit=len(words))}
+        if typo in fuzzy.words:
+            expected = {typo}
+        assert found == expected, typo
+
+
+@pytest.mark.parametrize('typo, word', [
+    ('perovskit', 'perovskite'),
+    ('geotermal', 'geothermal'),
+    ('hydorgen', 'hydrogen'),
+])
+def test_known_typos(fuzzy, typo, word):
+    assert fuzzy.lookup(typo)[0].term == word
+
+
+def test_correct_leaves_short_and_known_words(fuzzy):
+    text, corrections = fuzzy.correct('good geotermal jobs', known={'jobs'})
+    assert text == 'good geothermal jobs'
+    assert corrections == {'geotermal': 'geothermal'}
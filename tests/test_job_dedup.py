@@ -0,0 +1,44 @@
+import random
+
+import numpy as np
+import pytest
+
+from job_dedup import Deduplicator, MinHasher, mulmod_mersenne, similarity
+
+MERSENNE = (1 << 61) - 1
+
+
+def test_mulmod_is_exact_for_64_bit_inputs():
+    rng = random.Random(4)
+    a = MinHasher().a[:16]
+    xs = [rng.getrandbits(64) for _ in range(200)] + [0, 1, (1 << 64) - 1, MERSENNE, 1 << 32]
+    got = mulmod_mersenne(a, np.array(xs, dtype=np.uint64))
+    assert all(int(got[i, j]) == int(ai) * x % MERSENNE for i, ai in enumerate(a) for j, x in enumerate(xs))
+
+
+def test_signature_estimates_jaccard():
+    hasher = MinHasher(num_perm=256)
+    a = set(range(0, 1000))
+    b = set(range(300, 1300))
+    true = len(a & b) / len(a | b)
+    assert similarity(hasher.signature(a), hasher.signature(b)) == pytest.approx(true, abs=0.1)
+    assert similarity(hasher.signature(a), hasher.signature(a)) == 1.0
+
+
+def job(url, title, company='Acme', requirements=''):
+    return {'url': url, 'title': title, 'company': company,
+            'requirements_and_qualifications': requirements, 'skills_keywords': ''}
+
+
+def test_deduplicator_keeps_first_and_maps_duplicates():
+    text = ('Design and commission grid scale battery storage systems, run performance models, '
+            'work with utilities on interconnection studies and lead field testing of inverters')
+    jobs = [
+        job('u1', 'Battery Storage Engineer', requirements=text),
+        job('u2', 'Battery Storage Engineer', requirements=text + ' in Denver'),
+        job('u3', 'Battery Storage Engineer', company='Other Co', requirements=text),
+        job('u4', 'Soil Carbon Scientist', requirements='Measure soil organic carbon across farms'),
+    ]
+    dedup = Deduplicator()
+    assert [j['url'] for j in dedup.iter_unique(jobs)] == ['u1', 'u3', 'u4']
+    assert dedup.clusters() == {'u1': ['u2']}
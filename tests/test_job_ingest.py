@@ -0,0 +1,32 @@
+import os
+
+from job_ingest import iter_jobs, normalize_row, write_shards
+
+JOBS = [{'title': f'Job {i}'} for i in range(5)]
+
+
+def test_shards_round_trip(tmp_path):
+    manifest = write_shards(JOBS, str(tmp_path), shard_size=2)
+    assert [shard['jobs'] for shard in manifest['shards']] == [2, 2, 1]
+    assert list(iter_jobs(str(tmp_path))) == JOBS
+
+
+def test_smaller_rewrite_drops_stale_shards(tmp_path):
+    write_shards(JOBS, str(tmp_path), shard_size=2)
+    write_shards(JOBS[:1], str(tmp_path), shard_size=2)
+    assert sorted(name for name in os.listdir(tmp_path) if name.endswith('.jsonl')) == ['jobs-00000.jsonl']
+    assert list(iter_jobs(str(tmp_path))) == JOBS[:1]
+
+
+def test_manifest_lists_the_shards_to_read(tmp_path):
+    write_shards(JOBS[:1], str(tmp_path), shard_size=2)
+    with open(tmp_path / 'jobs-00099.jsonl', 'w', encoding='utf-8') as f:
+        f.write('{"title": "stale"}\n')
+    assert list(iter_jobs(str(tmp_path))) == JOBS[:1]
+
+
+def test_normalize_row_keeps_comma_sector_whole():
+    job = normalize_row({'climate_sectors': 'Food, Agriculture, & Nature, Transportation',
+                         'climate_opportunity_areas': '', 'salary_min': '50000', 'salary_max': 'null'})
+    assert job['climate_sectors'] == ['Food, Agriculture, & Nature', 'Transportation']
+    assert (job['salary_min'], job['salary_max']) == (50000.0, None)
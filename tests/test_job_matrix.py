@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from job_ingest import iter_jobs
+from job_matrix import FeatureSpace, JobMatrix, QueryEncoder
+
+
+@pytest.fixture(scope='module')
+def matrix():
+    return JobMatrix.build(list(iter_jobs('climate_jobs_v6.json'))[:300], FeatureSpace())
+
+
+def dense(matrix):
+    out = np.zeros(matrix.shape)
+    for job_id in range(matrix.shape[0]):
+        out[job_id, matrix.row(job_id)] = 1.0
+    return out
+
+
+def test_rows_are_sorted_and_unique(matrix):
+    for job_id in range(matrix.shape[0]):
+        row = matrix.row(job_id)
+        assert np.all(np.diff(row) > 0)
+
+
+def test_column_wise_and_row_wise_matvec_agree_with_dense(matrix):
+    full = dense(matrix)
+    rng = np.random.default_rng(5)
+
+    sparse = np.zeros(matrix.shape[1])
+    sparse[rng.choice(matrix.shape[1], 3, replace=False)] = rng.random(3)
+    sparse[matrix.row(0)[:2]] = 2.0
+    colptr, _ = matrix.csc()
+    touched = int(sum(colptr[c + 1] - colptr[c] for c in np.flatnonzero(sparse)))
+    assert touched * 4 < matrix.nnz  # column-wise path
+    np.testing.assert_allclose(matrix.matvec(sparse), full @ sparse)
+
+    dense_vector = rng.random(matrix.shape[1])  # row-wise path
+    np.testing.assert_allclose(matrix.matvec(dense_vector), full @ dense_vector)
+    np.testing.assert_allclose(matrix.matvec(np.zeros(matrix.shape[1])), 0.0)
+
+
+def test_top_k_orders_by_score_then_corpus_order(matrix):
+    vector = QueryEncoder(matrix.space).encode('battery storage and fast charging')
+    match = matrix.matvec(vector)
+    ranked = match + 0.1 * matrix.impact
+    top = matrix.top_k(vector, k=10)
+    expected = sorted(np.flatnonzero(match > 0), key=lambda j: (-ranked[j], j))[:10]
+    assert [job_id for job_id, _ in top] == [int(j) for j in expected]
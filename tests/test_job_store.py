@@ -0,0 +1,87 @@
+import copy
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from job_ingest import iter_jobs
+from job_store import JobStore, StaleStoreError, write_store
+from taxonomy import Taxonomy, load_taxonomy
+
+
+@pytest.fixture(scope='module')
+def jobs():
+    return list(iter_jobs('climate_jobs_v6.json'))
+
+
+@pytest.fixture(scope='module')
+def store(jobs, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('store'))
+    write_store(jobs, path)
+    return JobStore.open(path)
+
+
+def test_corpus_round_trip(jobs, store):
+    assert len(store) == len(jobs)
+    assert all(store[i] == job for i, job in enumerate(jobs))
+
+
+def test_numbers_keep_type_and_precision(tmp_path):
+    rows = [
+        {'big': 2 ** 60, 'mixed': 1, 'price': 1.5, 'count': 3},
+        {'big': -2 ** 62, 'mixed': 2.5, 'price': None, 'count': None},
+        {'big': None, 'mixed': None, 'price': 0.1, 'count': 0, 'extra': 'only here'},
+    ]
+    write_store(rows, str(tmp_path))
+    store = JobStore.open(str(tmp_path))
+    assert [store[i] for i in range(len(rows))] == rows
+    assert type(store.value('mixed', 0)) is int
+    assert store.columns['big']['kind'] == 'int'
+
+
+def test_where_matches_scan(jobs, store):
+    level = jobs[0]['experience_level']
+    assert store.where('experience_level', level).tolist() == \
+        [i for i, job in enumerate(jobs) if job['experience_level'] == level]
+    assert store.where('company', 'No Such Company').tolist() == []
+
+
+def test_where_any_matches_scan(jobs, store):
+    major = jobs[0]['applicable_majors'][0]
+    assert store.where_any('applicable_majors', major).tolist() == \
+        [i for i, job in enumerate(jobs) if major in (job['applicable_majors'] or ())]
+
+
+def test_with_node_matches_node_ids(store):
+    node_id = int(store.node_ids(0)[0])
+    assert store.with_node(node_id).tolist() == \
+        [i for i in range(len(store)) if node_id in store.node_ids(i).tolist()]
+
+
+def test_stale_taxonomy_refuses_node_ids(store):
+    raw = copy.deepcopy(load_taxonomy().raw)
+    raw.append({'sector_name': 'Oceans', 'emissions_at_stake_2050': '20 Gt',
+                'area_description': '', 'opportunity_areas': []})
+    stale = JobStore.open(store.path, taxonomy=Taxonomy(raw))
+    assert store.is_fresh()
+    assert not stale.is_fresh()
+    with pytest.raises(StaleStoreError):
+        stale.node_ids(0)
+    with pytest.raises(StaleStoreError):
+        stale.with_node(0)
+    assert stale[0] == store[0]
+
+
+def test_rewrite_drops_previous_arrays(tmp_path):
+    path = str(tmp_path)
+    write_store([{'m': ['a']}, {'m': None}], path)
+    write_store([{'m': ['a']}, {'m': ['b']}], path)
+    store = JobStore.open(path)
+    assert [store[0], store[1]] == [{'m': ['a']}, {'m': ['b']}]
+
+
+def test_open_ignores_arrays_outside_the_manifest(tmp_path):
+    path = str(tmp_path)
+    write_store([{'m': ['a']}, {'m': ['b']}], path)
+    np.save(str(tmp_path / 'm.nulls.npy'), np.array([1], dtype=np.int64))
+    assert JobStore.open(path)[1] == {'m': ['b']}
@@ -0,0 +1,59 @@
+import random
+import re
+
+import pytest
+
+from keyword_matcher import AhoCorasick, KeywordMatcher
+from taxonomy import load_taxonomy
+
+
+def brute_force(patterns, text, word_boundary):
+    """Every (start, end, index) occurrence found with str.find."""
+    lowered = text.lower()
+    found = set()
+    for index, (pattern, _) in enumerate(patterns):
+        start = lowered.find(pattern)
+        while start != -1:
+            end = start + len(pattern)
+            before = lowered[start - 1] if start else ''
+            after = lowered[end] if end < len(lowered) else ''
+            glued = (re.match(r'\w', pattern[0]) and re.match(r'\w', before)) or \
+                    (re.match(r'\w', pattern[-1]) and re.match(r'\w', after))
+            if not (word_boundary and glued):
+                found.add((start, end, index))
+            start = lowered.find(pattern, start + 1)
+    return found
+
+
+@pytest.mark.parametrize('word_boundary', [True, False])
+def test_matches_brute_force_on_random_text(word_boundary):
+    rng = random.Random(7)
+    words = ['he', 'she', 'his', 'hers', 'ush', 'a', 'aa', 'aaa', 'ab', 'bab', 'c-d', 'x y']
+    automaton = AhoCorasick(((w, w) for w in words), word_boundary=word_boundary)
+    alphabet = 'abcdehirsuxy -'
+    for _ in range(300):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert set(automaton.iter_matches(text)) == brute_force(automaton.patterns, text, word_boundary)
+
+
+def test_matches_are_case_insensitive_and_deduplicated():
+    automaton = AhoCorasick([('Heat Pump', 1), ('heat pump', 2), ('pump', 3)])
+    assert len(automaton) == 2
+    hits = [(start, end, automaton.patterns[index][1]) for start, end, index in
+            automaton.iter_matches('HEAT PUMPs and a heat pump')]
+    assert hits == [(17, 26, 1), (22, 26, 3)]
+
+
+def test_word_boundary_rejects_inner_hits():
+    automaton = AhoCorasick([('ev', 'ev')])
+    assert list(automaton.iter_matches('developer')) == []
+    assert list(AhoCorasick([('ev', 'ev')], word_boundary=False).iter_matches('developer')) == [(1, 3, 0)]
+
+
+def test_matcher_agrees_with_keyword_scan():
+    taxonomy = load_taxonomy()
+    matcher = KeywordMatcher(taxonomy)
+    text = 'Battery engineer working on fast charging, V2G and direct air capture.'
+    expected = {keyword for keyword in taxonomy.keyword_index
+                if re.search(r'(?<!\w)' + re.escape(keyword.lower()) + r'(?!\w)', text.lower())}
+    assert set(matcher.matched_keywords(text)) == expected
@@ -0,0 +1,58 @@
+import pytest
+
+from job_ingest import iter_jobs
+from location_index import LocationIndex, haversine_km, parse_location
+
+
+@pytest.mark.parametrize('raw, city, region', [
+    ('Bend, OR', 'Bend', 'OR'),
+    ('Salem, OR', 'Salem', 'OR'),
+    ('Portland, OR', 'Portland', 'OR'),
+    ('Boise, ID', 'Boise', 'ID'),
+    ("St. John's, Newfoundland and Labrador", "St. John's", 'NL'),
+])
+def test_city_and_region_code(raw, city, region):
+    location = parse_location(raw)
+    assert [(place.city, place.region) for place in location.places] == [(city, region)]
+    assert location.unresolved == ()
+
+
+def test_lowercase_or_and_separate_places():
+    assert parse_location('Albuquerque, NM and Oak Ridge, TN').regions == ['NM', 'TN']
+    assert parse_location('Alameda, CA, Albuquerque, NM, or Oak Ridge, TN').regions == ['CA', 'NM', 'TN']
+    location = parse_location('Santa Clara, CA or remote')
+    assert location.regions == ['CA'] and location.remote
+
+
+def test_pending_city_flushed_before_next_place():
+    location = parse_location('Washington DC; New York, NY')
+    assert [(place.city, place.region) for place in location.places] == [('Washington DC', 'DC'), ('New York', 'NY')]
+
+
+def test_multi_word_gazetteer_name_keeps_noise_words():
+    assert parse_location('San Francisco Bay Area').metros == ['San Francisco Bay Area']
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    jobs = list(iter_jobs('climate_jobs_v6.json'))
+    return jobs, LocationIndex.from_jobs(jobs)
+
+
+def test_region_postings_match_scan(corpus):
+    jobs, index = corpus
+    expected = [i for i, job in enumerate(jobs) if 'CA' in parse_location(job.get('location') or '').regions]
+    assert list(index.region('California')) == expected
+
+
+def test_near_matches_brute_force(corpus):
+    jobs, index = corpus
+    lat, lon, radius = 37.77, -122.42, 80
+    expected = set()
+    for i, job in enumerate(jobs):
+        for place in parse_location(job.get('location') or '').places:
+            if place.has_coordinates and haversine_km(lat, lon, place.lat, place.lon) <= radius:
+                expected.add(i)
+    found = index.near(lat, lon, radius)
+    assert {job_id for job_id, _ in found} == expected
+    assert [km for _, km in found] == sorted(km for _, km in found)
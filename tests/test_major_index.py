@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from major_index import BASE_DIR, MajorIndex, load_majors
+
+
+@pytest.fixture(scope='module')
+def index():
+    return MajorIndex(load_majors())
+
+
+def major_pages():
+    return sorted(name for name in os.listdir(BASE_DIR) if name.startswith('major-') and name.endswith('.html'))
+
+
+def test_every_major_page_slug_resolves(index):
+    pages = major_pages()
+    assert pages
+    for page in pages:
+        major = index.resolve(page[:-len('.html')])
+        assert major is not None, page
+        assert f'major-{major.slug}.html' == page
+
+
+def test_shared_alias_goes_to_the_first_major(index):
+    materials = index.resolve('Materials Science & Engineering')
+    management = index.resolve('Management Science & Engineering')
+    assert materials.id < management.id
+    assert 'MSE' in materials.aliases and management.code == 'MSE'
+    assert index.resolve('MSE') is materials
+    assert index.resolve('mse') is materials
+    assert index.resolve('MS&E') is management
+
+
+def test_scraper_prefix_and_unknown(index):
+    assert index.resolve('Engineering: Chemical Engineering') is index.resolve('Chemical Engineering')
+    assert index.resolve('Underwater Basket Weaving') is None
+    assert index.resolve('') is None
+
+
+def test_jobs_in_major_jobs_order(index):
+    jobs = [
+        {'title': 'a', 'company': 'Zeta', 'experience_level': 'Senior', 'applicable_majors': ['Chemistry']},
+        {'title': 'b', 'company': 'beta', 'experience_level': 'Entry-Level', 'applicable_majors': ['chemistry']},
+        {'title': 'c', 'company': 'Alpha', 'experience_level': 'Entry-Level', 'applicable_majors': ['Chemistry']},
+        {'title': 'd', 'company': 'Alpha', 'experience_level': None, 'applicable_majors': ['Chemistry']},
+        {'title': 'e', 'company': 'Alpha', 'experience_level': 'Internship', 'applicable_majors': ['Architecture']},
+    ]
+    built = MajorIndex(load_majors(), index.taxonomy).build(jobs)
+    assert built.jobs_for('Chemistry') == (2, 1, 0, 3)
+    assert built.jobs_for('No Such Major') == ()
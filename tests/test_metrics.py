@@ -0,0 +1,109 @@
+import random
+import re
+
+from cache import LRUCache
+from metrics import EXPORT_BUCKETS, PREFIX, Histogram, Metrics, bucket_bounds, bucket_index
+
+RELATIVE_ERROR = 1 / 64
+
+SAMPLE = re.compile(r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)\{(?P<labels>[^}]*)\} (?P<value>\S+)$')
+LABEL = re.compile(r'(\w+)="([^"]*)"')
+
+
+def exact_percentile(values, quantile):
+    ordered = sorted(values)
+    return ordered[max(1, int(quantile * len(ordered) + 0.5)) - 1]
+
+
+def test_bucket_bounds_contain_their_values():
+    for value in list(range(300)) + [random.Random(value).getrandbits(40) for value in range(2000)]:
+        low, high = bucket_bounds(bucket_index(value))
+        assert low <= value <= high
+        assert high - low <= low * RELATIVE_ERROR
+
+
+def test_buckets_are_contiguous():
+    for index in range(1, 2000):
+        assert bucket_bounds(index)[0] == bucket_bounds(index - 1)[1] + 1
+
+
+def test_percentiles_within_relative_error():
+    rng = random.Random(7)
+    values = [int(rng.lognormvariate(13, 1.5)) for _ in range(20000)]
+    histogram = Histogram()
+    for value in values:
+        histogram.record(value)
+    for quantile in (0.0, 0.1, 0.5, 0.9, 0.99, 0.999, 1.0):
+        exact = exact_percentile(values, quantile)
+        assert exact <= histogram.percentile(quantile) <= exact * (1 + RELATIVE_ERROR)
+    assert (histogram.min, histogram.max, histogram.total) == (min(values), max(values), sum(values))
+
+
+def test_merge_matches_single_histogram():
+    values = list(range(0, 10 ** 6, 997))
+    whole, left, right = Histogram(), Histogram(), Histogram()
+    for i, value in enumerate(values):
+        whole.record(value)
+        (left if i % 2 else right).record(value)
+    left.merge(right)
+    assert left.counts == whole.counts
+    assert (left.count, left.total, left.min, left.max) == (whole.count, whole.total, whole.min, whole.max)
+
+
+def parse_exposition(text):
+    """{(name, frozenset(labels)): float} plus {metric family: type}, checking HELP/TYPE precede samples."""
+    samples, types, helped = {}, {}, set()
+    for line in text.splitlines():
+        if line.startswith('# HELP '):
+            helped.add(line.split()[2])
+        elif line.startswith('# TYPE '):
+            _, _, family, kind = line.split()
+            assert family in helped
+            types[family] = kind
+        else:
+            match = SAMPLE.match(line)
+            assert match, line
+            name = match['name']
+            family = re.sub(r'_(bucket|sum|count)$', '', name) if name not in types else name
+            assert family in types, line
+            samples[name, frozenset(LABEL.findall(match['labels']))] = float(match['value'])
+    return samples, types
+
+
+def test_prometheus_exposition_parses():
+    metrics = Metrics(sample_rate=1.0)
+    for nanoseconds in (5_000, 40_000, 2_000_000, 2_000_000, 3_000_000_000):
+        metrics.stage('search').observe(nanoseconds)
+    metrics.stage('search').calls = 5
+    metrics.incr('cache.miss', 2)
+    cache = LRUCache(4)
+    cache.get('missing')
+    metrics.register_cache('context', cache)
+
+    samples, types = parse_exposition(metrics.to_prometheus())
+    assert types[f'{PREFIX}_stage_seconds'] == 'histogram'
+    stage = ('stage', 'search')
+    buckets = [samples[f'{PREFIX}_stage_seconds_bucket', frozenset({stage, ('le', str(bound))})]
+               for bound in EXPORT_BUCKETS]
+    assert buckets == sorted(buckets)
+    assert buckets[EXPORT_BUCKETS.index(0.00001)] == 1
+    assert buckets[EXPORT_BUCKETS.index(0.0025)] == 4
+    assert samples[f'{PREFIX}_stage_seconds_bucket', frozenset({stage, ('le', '+Inf')})] == 5
+    assert samples[f'{PREFIX}_stage_seconds_count', frozenset({stage})] == 5
+    assert abs(samples[f'{PREFIX}_stage_seconds_sum', frozenset({stage})] - 3.004045) < 1e-9
+    assert samples[f'{PREFIX}_stage_calls_total', frozenset({stage})] == 5
+    assert samples[f'{PREFIX}_events_total', frozenset({('event', 'cache.miss')})] == 2
+    assert samples[f'{PREFIX}_cache_misses_total', frozenset({('cache', 'context')})] == 1
+
+
+def test_sampling_counts_every_call():
+    metrics = Metrics(sample_rate=0.25)
+
+    @metrics.timed('work')
+    def work():
+        return 1
+
+    for _ in range(100):
+        work()
+    assert metrics.stages['work'].calls == 100
+    assert metrics.stages['work'].histogram.count == 25
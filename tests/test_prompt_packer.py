@@ -0,0 +1,74 @@
+import pytest
+
+from context_retrieval import ContextRetriever
+from job_ingest import iter_jobs
+from prompt_packer import SECTION_WEIGHTS, SECTIONS, PromptPacker, estimate_tokens
+
+QUERY = 'How do heat pumps and battery storage cut building emissions?'
+JOBS = [(3, 2.0), (7, 1.5), (11, 1.0)]
+
+
+@pytest.fixture(scope='module')
+def packer():
+    return PromptPacker(jobs=list(iter_jobs('climate_jobs_v6.json'))[:50])
+
+
+@pytest.fixture(scope='module')
+def bundle(packer):
+    return ContextRetriever(packer.taxonomy).retrieve(QUERY)
+
+
+@pytest.mark.parametrize('budget', [0, 1, 40, 120, 300, 600, 1500, 10 ** 6])
+def test_never_exceeds_budget(packer, bundle, budget):
+    packed = packer.pack(bundle, JOBS, budget)
+    assert packed.tokens <= budget
+    assert estimate_tokens(packed.text) <= packed.tokens
+
+
+def test_zero_budget_is_empty(packer, bundle):
+    packed = packer.pack(bundle, JOBS, budget=0)
+    assert (packed.text, packed.tokens, packed.included) == ('', 0, ())
+    assert packed.dropped == len(packer._candidates(bundle, JOBS, SECTION_WEIGHTS))
+
+
+def test_empty_request_has_only_the_emissions_table(packer):
+    packed = packer.pack(None, ())
+    assert packed.text == packer.emissions_table.text
+    assert (packed.included, packed.dropped) == ((), 0)
+    assert packer.pack(None, (), include_emissions_table=False).text == ''
+
+
+def test_keeps_highest_priority_snippets_first(packer, bundle):
+    candidates = packer._candidates(bundle, JOBS, SECTION_WEIGHTS)
+    assert len(candidates) > 3
+    for keep in range(1, len(candidates)):
+        sections = {section for _, _, section, _ in candidates[:keep]}
+        budget = (sum(snippet.tokens for *_, snippet in candidates[:keep])
+                  + sum(packer.headers[section].tokens for section in sections))
+        packed = packer.pack(bundle, JOBS, budget, include_emissions_table=False)
+        assert set(packed.included) == {snippet.key for *_, snippet in candidates[:keep]}
+        assert packed.dropped == len(candidates) - keep
+
+
+def test_snippets_are_whole_and_in_section_order(packer, bundle):
+    packed = packer.pack(bundle, JOBS, budget=300)
+    assert packed.dropped
+    texts = {snippet.key: snippet.text for snippet in packer.node_snippets + packer.job_snippets}
+    lines = packed.text.split('\n')
+    for key in packed.included:
+        assert texts[key] in lines
+    headers = [header for _, header in SECTIONS]
+    present = [header for header in headers if header.split('\n')[0] in lines]
+    assert present == sorted(present, key=headers.index)
+
+
+def test_job_weight_promotes_jobs(packer, bundle):
+    budget = 400
+    default = packer.pack(bundle, JOBS, budget, include_emissions_table=False)
+    jobs_first = packer.pack(bundle, JOBS, budget, include_emissions_table=False, weights={'jobs': 10.0})
+    assert job_keys(jobs_first) == [f'job:{job_id}' for job_id, _ in JOBS]
+    assert len(job_keys(jobs_first)) > len(job_keys(default))
+
+
+def job_keys(packed):
+    return [key for key in packed.included if key.startswith('job:')]
@@ -0,0 +1,26 @@
+import pytest
+
+from query_router import QueryRouter
+
+
+@pytest.fixture(scope='module')
+def router():
+    return QueryRouter()
+
+
+def test_category_query_keeps_path_punctuation(router):
+    route = router.route('show me jobs in Electricity > Energy Storage & Demand Flexibility')
+    assert route.category_query == 'Electricity > Energy Storage & Demand Flexibility'
+
+
+def test_category_query_absent_without_prefix(router):
+    assert router.route('What is direct air capture?').category_query is None
+
+
+@pytest.mark.parametrize('query, intent', [
+    ('Show me jobs in Buildings', 'job_search'),
+    ('How can I move into climate work?', 'advice'),
+    ('direct air capture startups', 'category'),
+])
+def test_intent(router, query, intent):
+    assert router.route(query).intent == intent
@@ -0,0 +1,41 @@
+from response_cache import ResponseCache, cosine, ngram_vector
+
+NODES = ('Electricity > Energy Storage & Demand Flexibility',)
+
+
+def answer(text):
+    return lambda: text
+
+
+def test_exact_then_near_hit():
+    cache = ResponseCache()
+    assert cache.get_or_call('What jobs are there in solar?', NODES, 'ctx', answer('a'), 'job_search') == ('a', 'miss')
+    assert cache.get_or_call('what jobs are there in solar', NODES, 'ctx', answer('b'), 'job_search') == ('a', 'exact')
+    assert cache.get_or_call('Which solar jobs are there?', NODES, 'ctx', answer('c'), 'job_search') == ('a', 'near')
+    assert cache.stats.calls == 1
+
+
+def test_near_hit_requires_same_intent():
+    cache = ResponseCache()
+    listing = 'Show me jobs in Energy Storage & Demand Flexibility'
+    definition = 'What is Energy Storage & Demand Flexibility?'
+    assert cosine(ngram_vector(listing.lower()), ngram_vector(definition.lower())) >= cache.threshold
+    cache.get_or_call(listing, NODES, '', answer('jobs'), 'job_search')
+    assert cache.get_or_call(definition, NODES, '', answer('definition'), 'category') == ('definition', 'miss')
+
+
+def test_near_hit_requires_same_nodes_and_context():
+    cache = ResponseCache()
+    cache.store('What jobs are there in batteries?', 'batteries', nodes=('A',), context='x')
+    assert cache.lookup('Which batteries jobs are there?', nodes=('B',), context='x') is None
+    assert cache.lookup('Which batteries jobs are there?', nodes=('A',), context='y') is None
+    assert cache.lookup('Which batteries jobs are there?', nodes=('A',), context='x') == ('batteries', 'near')
+
+
+def test_near_hit_index_stays_bounded():
+    cache = ResponseCache(maxsize=4)
+    for i in range(100):
+        cache.store(f'question {i}', 'answer', context=f'context {i}')
+    assert len(cache) == 4
+    assert sum(len(group) for group in cache._groups.values()) <= 2 * 4
+    assert cache.lookup('question 99', context='context 99') == ('answer', 'exact')
@@ -0,0 +1,35 @@
+from benchmarks.run import compare, selected
+
+
+def result(median, size=None):
+    return {'median': median, 'size': size}
+
+
+def statuses(rows):
+    return {name: status for name, _, _, _, status in rows}
+
+
+def test_relative_and_absolute_change_both_required():
+    baseline = {'micro': result(0.000137), 'macro': result(1.0), 'fast': result(1.0)}
+    results = {'micro': result(0.000250), 'macro': result(1.6), 'fast': result(0.4)}
+    assert statuses(compare(results, baseline)) == {'micro': 'ok', 'macro': 'slower', 'fast': 'faster'}
+    assert statuses(compare(results, baseline, min_delta=0))['micro'] == 'slower'
+
+
+def test_new_and_missing_benchmarks():
+    rows = compare({'added': result(0.1)}, {'removed': result(0.1)})
+    assert statuses(rows) == {'added': 'new', 'removed': 'missing'}
+    assert [row for row in rows if row[4] == 'missing'] == [('removed', 0.1, None, None, 'missing')]
+
+
+def test_selected_follows_sizes_and_filter():
+    baseline = {'bm25.build[10000]': result(1.0, 10000), 'bm25.build[100000]': result(9.0, 100000),
+                'router.route': result(0.001)}
+    assert list(selected(baseline, (10000,))) == ['bm25.build[10000]', 'router.route']
+    assert list(selected(baseline, (10000,), 'bm25')) == ['bm25.build[10000]']
+
+
+def test_per_benchmark_tolerance():
+    baseline = {'bm25.search[10000]': result(0.008, 10000), 'other': result(0.008)}
+    results = {'bm25.search[10000]': result(0.013, 10000), 'other': result(0.013)}
+    assert statuses(compare(results, baseline)) == {'bm25.search[10000]': 'ok', 'other': 'slower'}
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from job_ingest import iter_jobs
+from salary_index import IntervalIndex, SalaryIndex, normalize_salary
+
+
+@pytest.mark.parametrize('job, expected', [
+    ({'salary_min': 120000, 'salary_max': 150000, 'salary_type': 'yearly'}, (120000, 150000)),
+    ({'salary_min': 120, 'salary_max': 150, 'salary_type': 'yearly'}, (120000, 150000)),
+    ({'salary_min': 1400, 'salary_max': 2000, 'salary_type': 'yearly'}, (16800, 24000)),
+    ({'salary_min': 25, 'salary_max': 35, 'salary_type': 'hourly'}, (52000, 72800)),
+    ({'salary_min': None, 'salary_max': 90000, 'salary_type': 'yearly'}, (90000, 90000)),
+    ({'salary_min': None, 'salary_max': None, 'salary_type': 'yearly'}, None),
+])
+def test_normalize_salary(job, expected):
+    assert normalize_salary(job) == expected
+
+
+def test_corpus_has_no_sub_10k_annual_salaries():
+    salaries = [normalize_salary(job) for job in iter_jobs('climate_jobs_v6.json')]
+    assert min(low for low, _ in filter(None, salaries)) >= 10000
+
+
+def random_intervals(rng, n):
+    intervals = []
+    for job_id in range(n):
+        low = rng.randrange(0, 200)
+        intervals.append((job_id, low, low + rng.randrange(0, 50)))
+    return intervals
+
+
+def test_interval_counts_and_ids_match_brute_force():
+    rng = random.Random(9)
+    for _ in range(50):
+        intervals = random_intervals(rng, rng.randint(0, 80))
+        index = IntervalIndex(intervals)
+        for _ in range(20):
+            low = rng.choice([None, rng.randrange(-10, 260)])
+            high = rng.choice([None, rng.randrange(-10, 260)])
+            if low is not None and high is not None and low > high:
+                low, high = high, low
+            expected = [job_id for job_id, a, b in intervals
+                        if (high is None or a <= high) and (low is None or b >= low)]
+            assert index.count(low, high) == len(expected)
+            assert index.ids(low, high) == expected
+            by_pay = index.ids(low, high, order='pay')
+            assert sorted(by_pay) == expected
+            assert [index.high_of[j] for j in by_pay] == sorted((index.high_of[j] for j in by_pay), reverse=True)
+
+
+def test_node_index_matches_scan():
+    jobs = list(iter_jobs('climate_jobs_v6.json'))
+    salaries = SalaryIndex.from_jobs(jobs)
+    postings = list(range(0, len(jobs), 3))
+    expected = [job_id for job_id in postings
+                if normalize_salary(jobs[job_id]) and normalize_salary(jobs[job_id])[1] >= 80000
+                and normalize_salary(jobs[job_id])[0] <= 120000]
+    assert salaries.filter_postings(postings, 80000, 120000) == expected
+    assert salaries.count(80000, 120000) == len(salaries.job_ids(80000, 120000))
@@ -0,0 +1,92 @@
+import copy
+import json
+
+import pytest
+
+import taxonomy_snapshot
+from FULL_TAXONOMY import CLIMATE_TAXONOMY
+from taxonomy import (PATH_SEP, OpportunityArea, Sector, Taxonomy, load_taxonomy, normalize_name,
+                      taxonomy_hash)
+
+
+@pytest.fixture(scope='module')
+def taxonomy():
+    return Taxonomy(CLIMATE_TAXONOMY)
+
+
+def raw_leaves(raw):
+    """(path, keywords) for every leaf, straight from the nested dicts."""
+    for sector in raw:
+        for area in sector.get('opportunity_areas') or ():
+            prefix = sector['sector_name'] + PATH_SEP + area['area_name'] + PATH_SEP
+            for key, name in (('innovation_imperatives', 'subject_name'), ('moonshots', 'name'),
+                              ('tech_categories', 'cluster_name')):
+                for leaf in area.get(key) or ():
+                    yield prefix + leaf[name], leaf.get('keywords') or ()
+
+
+def test_ids_paths_and_ancestors(taxonomy):
+    for i, node in enumerate(taxonomy.nodes):
+        assert node.id == i and taxonomy[i] is node
+        assert taxonomy.node(node.path) is node
+        ancestors = list(node.ancestors())
+        assert node.path == PATH_SEP.join([a.name for a in reversed(ancestors)] + [node.name])
+        assert node.depth == len(ancestors)
+        assert (ancestors[-1] if ancestors else node) is node.sector
+        assert all(a.id < node.id for a in ancestors)
+        if node.depth:
+            assert node in taxonomy.children(node.parent)
+    assert all(isinstance(n.opportunity_area, OpportunityArea) for n in taxonomy.leaves)
+
+
+def test_node_lookup_ignores_case_and_punctuation(taxonomy):
+    leaf = taxonomy.leaves[0]
+    assert taxonomy.node(leaf.path.upper().replace(' ', '  ')) is leaf
+    assert taxonomy.node('No Such Sector > Nothing') is None
+    sector = taxonomy.sectors[0]
+    assert sector in taxonomy.find(sector.name.lower())
+    assert all(normalize_name(n.name) == normalize_name(sector.name) for n in taxonomy.find(sector.name))
+
+
+def test_keyword_index_matches_raw_scan(taxonomy):
+    expected = {}
+    for path, keywords in raw_leaves(CLIMATE_TAXONOMY):
+        for keyword in keywords:
+            paths = expected.setdefault(keyword.lower(), [])
+            if path not in paths:
+                paths.append(path)
+    actual = {keyword: [node.path for node in nodes] for keyword, nodes in taxonomy.keyword_index.items()}
+    assert actual == expected
+    assert set(taxonomy.keywords()) == set(expected)
+    keyword = next(iter(expected))
+    assert taxonomy.nodes_for_keyword(keyword.upper()) == taxonomy.keyword_index[keyword]
+
+
+def test_impact_weights_sum_to_one_per_level(taxonomy):
+    assert all(isinstance(s, Sector) for s in taxonomy.sectors)
+    assert sum(s.impact_weight for s in taxonomy.sectors) == pytest.approx(1.0)
+    areas = [n for n in taxonomy.nodes if isinstance(n, OpportunityArea)]
+    assert sum(area.impact_weight for area in areas) == pytest.approx(1.0)
+
+
+def test_content_hash_is_stable_and_content_sensitive(taxonomy):
+    reordered = json.loads(json.dumps(CLIMATE_TAXONOMY, sort_keys=True))
+    assert Taxonomy(reordered).content_hash == taxonomy.content_hash == taxonomy_hash(CLIMATE_TAXONOMY)
+    assert Taxonomy(copy.deepcopy(CLIMATE_TAXONOMY)).content_hash == taxonomy.content_hash
+    edited = copy.deepcopy(CLIMATE_TAXONOMY)
+    edited[0]['area_description'] += ' '
+    assert Taxonomy(edited).content_hash != taxonomy.content_hash
+
+
+def test_load_taxonomy_prefers_fresh_snapshot(monkeypatch, taxonomy):
+    snapshot = taxonomy_snapshot.TaxonomySnapshot({}, taxonomy)
+    monkeypatch.setattr(taxonomy_snapshot, 'load_fresh_snapshot', lambda: snapshot)
+    assert load_taxonomy.__wrapped__() is taxonomy
+
+
+def test_load_taxonomy_falls_back_to_source(monkeypatch, taxonomy):
+    monkeypatch.setattr(taxonomy_snapshot, 'load_fresh_snapshot', lambda: None)
+    loaded = load_taxonomy.__wrapped__()
+    assert loaded is not taxonomy
+    assert loaded.content_hash == taxonomy.content_hash
+    assert [n.path for n in loaded.nodes] == [n.path for n in taxonomy.nodes]
@@ -0,0 +1,96 @@
+import copy
+
+import pytest
+
+from taxonomy import Taxonomy, load_taxonomy
+from taxonomy_diff import diff_taxonomies, incremental_enrich
+
+JOBS = [
+    {'url': 'https://example.com/1', 'title': 'Battery Engineer',
+     'skills_keywords': 'solid-state design, fast charging'},
+    {'url': 'https://example.com/2', 'title': 'Hydrogen Process Engineer',
+     'skills_keywords': 'water electrolysis, e-fuels'},
+]
+
+
+@pytest.fixture(scope='module')
+def taxonomy():
+    return load_taxonomy()
+
+
+def with_sector(taxonomy, name='Oceans', emissions='20 Gt'):
+    raw = copy.deepcopy(taxonomy.raw)
+    raw.append({'sector_name': name, 'emissions_at_stake_2050': emissions,
+                'area_description': '', 'opportunity_areas': []})
+    return Taxonomy(raw)
+
+
+def state_for(taxonomy, records, word_boundary=True):
+    return {'taxonomy_hash': taxonomy.content_hash, 'taxonomy': taxonomy.raw,
+            'jobs': records, 'word_boundary': word_boundary}
+
+
+def test_identical_taxonomies_have_no_changes(taxonomy):
+    diff = diff_taxonomies(taxonomy, Taxonomy(copy.deepcopy(taxonomy.raw)))
+    assert not diff
+    assert not diff.rescore_all
+
+
+def test_added_sector_rescores_all(taxonomy):
+    diff = diff_taxonomies(taxonomy, with_sector(taxonomy))
+    assert [(c.status, c.path) for c in diff.changes] == [('added', 'Oceans')]
+    assert diff.rescore_all
+
+
+def test_removed_sector_rescores_all(taxonomy):
+    diff = diff_taxonomies(with_sector(taxonomy), taxonomy)
+    assert diff.rescore_all
+
+
+def test_changed_sector_emissions_rescore_all(taxonomy):
+    raw = copy.deepcopy(taxonomy.raw)
+    raw[0]['emissions_at_stake_2050'] = '12 Gt'
+    assert diff_taxonomies(taxonomy, Taxonomy(raw)).rescore_all
+
+
+def test_keyword_edit_reenriches_only_matching_jobs(taxonomy):
+    _, records, _, _ = incremental_enrich(JOBS, None, taxonomy)
+    raw = copy.deepcopy(taxonomy.raw)
+    imperative = raw[0]['opportunity_areas'][0]['innovation_imperatives'][1]
+    imperative['keywords'] = [k for k in imperative['keywords'] if k != 'solid-state design']
+    changed = Taxonomy(raw)
+
+    _, _, diff, stats = incremental_enrich(JOBS, state_for(taxonomy, records), changed)
+    assert not diff.rescore_all
+    assert (stats.reused, stats.reenriched) == (1, 1)
+
+
+def test_added_sector_reenriches_every_job(taxonomy):
+    _, records, _, _ = incremental_enrich(JOBS, None, taxonomy)
+    _, _, _, stats = incremental_enrich(JOBS, state_for(taxonomy, records), with_sector(taxonomy))
+    assert (stats.reused, stats.reenriched) == (0, len(JOBS))
+
+
+def test_matching_mode_change_is_not_reused(taxonomy):
+    _, records, _, _ = incremental_enrich(JOBS, None, taxonomy, word_boundary=True)
+    state = state_for(taxonomy, records, word_boundary=True)
+
+    _, _, _, same = incremental_enrich(JOBS, state, taxonomy, word_boundary=True)
+    _, _, _, other = incremental_enrich(JOBS, state, taxonomy, word_boundary=False)
+    assert same.reused == len(JOBS)
+    assert other.reused == 0
+
+
+def test_case_only_rename_matches_full_rebuild(taxonomy):
+    _, records, _, _ = incremental_enrich(JOBS, None, taxonomy)
+    raw = copy.deepcopy(taxonomy.raw)
+    raw[0]['sector_name'] = raw[0]['sector_name'].upper()
+    imperative = raw[0]['opportunity_areas'][0]['innovation_imperatives'][0]
+    imperative['subject_name'] = imperative['subject_name'].upper()
+    renamed = Taxonomy(raw)
+
+    incremental, _, diff, stats = incremental_enrich(JOBS, state_for(taxonomy, records), renamed)
+    full, _, _, _ = incremental_enrich(JOBS, None, renamed)
+    assert 'name' in diff.changes[0].changed_fields
+    assert stats.reused == 0
+    assert [job['taxonomy'] for job in incremental] == [job['taxonomy'] for job in full]
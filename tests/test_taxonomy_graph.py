@@ -0,0 +1,29 @@
+import pytest
+
+from job_ingest import iter_jobs
+from taxonomy import load_taxonomy
+from taxonomy_graph import TaxonomyGraph
+
+
+@pytest.fixture(scope='module')
+def built():
+    taxonomy = load_taxonomy()
+    jobs = list(iter_jobs('climate_jobs_v6.json'))
+    return taxonomy, jobs, TaxonomyGraph.build(taxonomy, jobs, k=len(taxonomy.nodes))
+
+
+def test_top_k_is_prefix_of_full_ranking_with_ties_by_id(built):
+    taxonomy, jobs, full = built
+    graph = TaxonomyGraph.build(taxonomy, jobs, k=5)
+    for node in taxonomy.nodes:
+        assert graph.neighbours[node.id] == full.neighbours[node.id][:5]
+
+
+def test_neighbours_exclude_self_and_ancestors(built):
+    taxonomy, _, full = built
+    for node in taxonomy.nodes:
+        excluded = {node.id} | {ancestor.id for ancestor in node.ancestors()}
+        ranked = full.neighbours[node.id]
+        assert not excluded & {j for j, _ in ranked}
+        weights = [weight for _, weight in ranked]
+        assert weights == sorted(weights, reverse=True)
@@ -0,0 +1,60 @@
+import shutil
+
+import pytest
+
+import taxonomy_snapshot
+from taxonomy_snapshot import (SOURCE_PATH, SnapshotError, build_snapshot, load_fresh_snapshot,
+                               load_snapshot, peek_header)
+
+
+def paths_by_keyword(taxonomy):
+    return {keyword: [node.path for node in nodes] for keyword, nodes in taxonomy.keyword_index.items()}
+
+
+@pytest.fixture
+def snapshot_paths(tmp_path):
+    source = str(tmp_path / 'FULL_TAXONOMY.py')
+    shutil.copyfile(SOURCE_PATH, source)
+    path = str(tmp_path / 'taxonomy.snapshot')
+    build_snapshot(path, source)
+    return path, source
+
+
+def test_round_trip(snapshot_paths):
+    path, source = snapshot_paths
+    built = build_snapshot(path, source)
+    loaded = load_snapshot(path, verify=True)
+    assert loaded.header == built.header == peek_header(path)
+    assert loaded.taxonomy.content_hash == built.taxonomy.content_hash
+    assert [node.path for node in loaded.taxonomy.nodes] == [node.path for node in built.taxonomy.nodes]
+    assert paths_by_keyword(loaded.taxonomy) == paths_by_keyword(built.taxonomy)
+    assert load_fresh_snapshot(path, source) is not None
+
+
+def test_stale_snapshot_is_not_unpickled(snapshot_paths, monkeypatch):
+    path, source = snapshot_paths
+    with open(source, 'a', encoding='utf-8') as f:
+        f.write('\n# edited\n')
+
+    def fail(*args, **kwargs):
+        raise AssertionError('stale payload was unpickled')
+    monkeypatch.setattr(taxonomy_snapshot.pickle, 'loads', fail)
+    assert load_fresh_snapshot(path, source) is None
+
+
+def test_corrupt_snapshot(snapshot_paths):
+    path, source = snapshot_paths
+    with open(path, 'r+b') as f:
+        f.write(b'NOTATAX!')
+    with pytest.raises(SnapshotError):
+        load_snapshot(path)
+    assert load_fresh_snapshot(path, source) is None
+
+
+def test_truncated_payload(snapshot_paths):
+    path, source = snapshot_paths
+    with open(path, 'r+b') as f:
+        f.truncate(peek_header(path)['payload_offset'] + 10)
+    with pytest.raises(SnapshotError):
+        load_snapshot(path)
+    assert load_fresh_snapshot(path, source) is None